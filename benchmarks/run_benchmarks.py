@@ -0,0 +1,423 @@
+"""Benchmark suite for cg-calc.
+
+    python benchmarks/run_benchmarks.py                      # all suites, JSON to stdout
+    python benchmarks/run_benchmarks.py -o current.json --suite engine batch
+    python benchmarks/run_benchmarks.py --baseline baseline.json --tolerance 0.25
+
+Suites:
+
+    engine   grade totals and future-CGPA calculation over growing plans
+    gui      window operations (add/delete semesters, courses, Clear All),
+             driven headlessly; needs a display or an Xvfb binary, else skipped
+    batch    vectorized cohort computation, cohort sketches, raw mark
+             grading and the CSV and .cgts batch commands (one worker and
+             one per core, with the speedup) on synthetic students
+
+Every benchmark reports the median and minimum wall time of several runs.
+With --baseline, medians are compared to an earlier result file and the
+exit status is 1 when any benchmark slowed down by more than --tolerance.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cgpa_cache  # noqa: E402
+import cgpa_engine  # noqa: E402
+import cgpa_model  # noqa: E402
+
+SEED = 2315
+
+
+def measure(func, repeat=5, setup=None):
+    """Median/min wall time of func() over repeat runs; setup() runs untimed before each"""
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        func() if state is None else func(state)
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "repeat": repeat}
+
+
+def random_counts(rng):
+    return {letter: rng.randint(0, 4) for letter in cgpa_engine.GRADES}
+
+
+def random_plan(rng, semesters, courses=5):
+    plan = cgpa_model.Plan()
+    for _ in range(semesters):
+        semester = plan.add_semester()
+        for _ in range(courses):
+            semester.courses.append(cgpa_model.Course(rng.randrange(len(cgpa_model.GRADE_LETTERS)), rng.choice((3, 3, 4))))
+    return plan
+
+
+# ENGINE
+def bench_engine(quick):
+    rng = random.Random(SEED)
+    results = {}
+
+    histograms = [random_counts(rng) for _ in range(1000)]
+    results["engine.grade_totals[1000 students]"] = measure(
+        lambda: [cgpa_engine.grade_totals(h, "A") for h in histograms]
+    )
+
+    # A term recompute and an advising session: mostly repeated histograms and plans, from a cold cache
+    repeated = [histograms[rng.randrange(100)] for _ in range(1000)]
+    standing = cgpa_engine.standing("3.21", 60)
+    plans = [random_plan(rng, 4) for _ in range(20)]
+    sessions = [plans[rng.randrange(20)] for _ in range(1000)]
+    for name, stats, run in (
+        ("cache.grade_totals[1000 students, 100 distinct]", "histograms",
+         lambda: [cgpa_cache.grade_totals(h, "A") for h in repeated]),
+        ("cache.future_totals[1000 plans, 20 distinct]", "plans",
+         lambda: [cgpa_cache.future_totals_for_key(standing, plan.key()) for plan in sessions]),
+    ):
+        timing = measure(run, setup=cgpa_cache.cache_clear)
+        timing.update({key: cgpa_cache.cache_stats()[stats][key] for key in ("hits", "misses")})
+        results[name] = timing
+
+    grades = cgpa_model.GradeTotals()
+    letters = list(cgpa_engine.GRADES)
+    edits = [(rng.choice(letters), rng.randint(0, 20)) for _ in range(10000)]
+
+    def incremental():
+        for letter, count in edits:
+            grades.set_count(letter, count)
+            grades.totals("A")
+    results["model.grade_count_edit[10000 edits]"] = measure(incremental)
+
+    transcript = cgpa_model.Transcript("best")
+    attempts = [
+        (rng.randrange(40), rng.randrange(8), rng.randrange(len(letters)), rng.choice((3, 3, 4)))
+        for _ in range(10000)
+    ]
+
+    def record_attempts():
+        for course, term, grade, credits in attempts:
+            transcript.record(course, term, grade, credits)
+    results["model.transcript_record[10000 attempts]"] = measure(record_attempts)
+
+    current = cgpa_engine.standing("3.21", 60)
+    for semesters in (10, 100) if quick else (10, 100, 1000):
+        plan = random_plan(rng, semesters)
+        pairs = [[(course.letter, course.credits) for course in semester.courses] for semester in plan]
+        results[f"engine.future_totals[{semesters} semesters]"] = measure(
+            lambda: cgpa_engine.future_totals(current, pairs)
+        )
+        results[f"model.plan_future_totals[{semesters} semesters]"] = measure(
+            lambda: plan.future_totals(current)
+        )
+
+        # One course edit halfway down the plan, then the totals and the running CGPA of a late semester
+        middle = plan[semesters // 2]
+
+        def edit_and_recompute():
+            middle.courses[0].grade = (middle.courses[0].grade + 1) % len(cgpa_model.GRADE_LETTERS)
+            plan.changed(middle)
+            plan.future_totals(current)
+            return plan.totals_after(current, semesters - 1)
+        results[f"model.plan_edit_recompute[{semesters} semesters]"] = measure(edit_and_recompute)
+    return results
+
+
+# GUI
+def _start_display():
+    """Make sure a display is available; returns an Xvfb process to stop, True, or None"""
+    if os.environ.get("DISPLAY"):
+        return True
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        return None
+    display = ":97"
+    process = subprocess.Popen([xvfb, display, "-screen", "0", "1280x1024x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)
+    if process.poll() is not None:
+        return None
+    return process
+
+
+class _AlwaysYes:
+    """Stand-in for tkinter.messagebox so Clear All and warnings never wait for a click"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: True
+
+
+def _open_window():
+    import cgpa_gui
+
+    cgpa_gui.messagebox = _AlwaysYes()
+    calculator = cgpa_gui.CGPACalculator()
+    calculator.app.withdraw()
+    calculator.prediction_ready = True
+    calculator.SETUP_right_frame(calculator.prediction_frame)
+    calculator.app.update_idletasks()
+    return calculator
+
+
+def _fill_plan(calculator, semesters, courses):
+    for _ in range(semesters):
+        calculator.add_semester_box()
+        semester = calculator.plan[-1]
+        for _ in range(courses):
+            calculator.add_course_to_semester(semester)
+        for course in semester.courses:
+            course.grade = 0
+        calculator.plan.changed(semester)
+    calculator.model.touch("semesters")
+    calculator.app.update_idletasks()
+
+
+def bench_gui(quick):
+    display = _start_display()
+    if display is None:
+        return {"gui": {"skipped": "no DISPLAY and no Xvfb binary"}}
+
+    results = {}
+    calculator = _open_window()
+    try:
+        rng = random.Random(SEED)
+        for letter, count in random_counts(rng).items():
+            calculator.grade_counts[letter].set(str(count))
+        calculator.app.update_idletasks()
+        results["gui._calculate_grade_totals"] = measure(calculator._calculate_grade_totals, repeat=50)
+
+        def empty_window():
+            calculator.clear_all()
+            calculator.app.update_idletasks()
+            return calculator
+
+        for semesters in (10, 50) if quick else (10, 100, 500):
+            label = f"[{semesters} semesters x 5 courses]"
+
+            def add_semesters(calc, semesters=semesters):
+                for _ in range(semesters):
+                    calc.add_semester_box()
+                calc.app.update_idletasks()
+            results[f"gui.add_semester_box{label}"] = measure(add_semesters, repeat=3, setup=empty_window)
+
+            def add_courses(calc, semesters=semesters):
+                for semester in calc.plan:
+                    for _ in range(5):
+                        calc.add_course_to_semester(semester)
+                calc.app.update_idletasks()
+
+            def with_semesters(semesters=semesters):
+                empty_window()
+                _fill_plan(calculator, semesters, 0)
+                return calculator
+            results[f"gui.add_course_to_semester{label}"] = measure(add_courses, repeat=3, setup=with_semesters)
+
+            def full_plan(semesters=semesters):
+                empty_window()
+                _fill_plan(calculator, semesters, 5)
+                calculator.calculate_cgpa()
+                return calculator
+
+            def recalculate(calc):
+                calc.model.touch("semesters")
+                calc.calculate_all_semesters()
+            results[f"gui.calculate_all_semesters{label}"] = measure(recalculate, repeat=3, setup=full_plan)
+
+            def delete_all(calc):
+                while len(calc.plan):
+                    calc.delete_semester(calc.plan[0])  # Front first: every delete renumbers the rest
+                calc.app.update_idletasks()
+            results[f"gui.delete_semester{label}"] = measure(delete_all, repeat=3, setup=full_plan)
+            results[f"gui.clear_all{label}"] = measure(
+                lambda calc: (calc.clear_all(), calc.app.update_idletasks()), repeat=3, setup=full_plan
+            )
+    finally:
+        calculator.app.destroy()
+        if display is not True:
+            display.terminate()
+    return results
+
+
+# BATCH
+def bench_batch(quick):
+    try:
+        import numpy as np
+    except ImportError:
+        return {"batch": {"skipped": "numpy is not installed"}}
+    import cgpa_batch
+    import cgpa_cli
+    import cgpa_cohort
+
+    rng = np.random.default_rng(SEED)
+    results = {}
+    for students in (1000, 100000) if quick else (1000, 100000, 1000000):
+        counts = rng.integers(0, 5, size=(students, len(cgpa_engine.GRADES)), dtype=np.uint16)
+        thesis = rng.integers(cgpa_batch.NO_THESIS, len(cgpa_engine.GRADES), size=students).astype(np.int16)
+        label = f"[{students} students]"
+
+        timing = measure(lambda: cgpa_batch.batch_totals(counts, thesis))
+        timing["rows_per_second"] = students / timing["median"]
+        results[f"batch.batch_totals{label}"] = timing
+
+        # Most rows of a term repeat one of a few hundred histograms
+        picks = rng.integers(0, min(students, 500), size=students)
+        repeated_counts, repeated_thesis = counts[picks], thesis[picks]
+        timing = measure(lambda: cgpa_batch.deduplicated_totals(repeated_counts, repeated_thesis))
+        timing["rows_per_second"] = students / timing["median"]
+        distinct = len(cgpa_batch.unique_histograms(repeated_counts, repeated_thesis)[0])
+        timing["hits"], timing["misses"] = students - distinct, distinct
+        results[f"batch.deduplicated_totals{label}"] = timing
+
+        totals = cgpa_batch.batch_totals(counts, thesis)
+        timing = measure(lambda: cgpa_batch.format_cgpas(totals["tenths"], totals["credits"]))
+        timing["rows_per_second"] = students / timing["median"]
+        results[f"batch.format_cgpas{label}"] = timing
+
+        def sketch():
+            cohort = cgpa_cohort.CohortSketch()
+            return cohort.add(totals["tenths"], totals["credits"], groups)
+        groups = rng.integers(0, len(cgpa_engine.PROGRAMS) + 1, size=students)
+        timing = measure(sketch)
+        timing["rows_per_second"] = students / timing["median"]
+        results[f"cohort.sketch_add{label}"] = timing
+        cohort = sketch()
+        cohort.percentile_rank(3.0, "CSE")
+        results[f"cohort.percentile_rank[1000 queries, {students} students]"] = measure(
+            lambda: [cohort.percentile_rank(3.0 + i / 1000, "CSE") for i in range(1000)]
+        )
+
+        required = rng.choice(cgpa_engine.SCALE.program_credits, size=students)
+        thresholds = (cgpa_engine.SCALE.probation_cgpa, cgpa_engine.SCALE.honors_cgpa)
+        timing = measure(lambda: cgpa_batch.degree_frontier(totals["tenths"], totals["credits"], required, thresholds))
+        timing["rows_per_second"] = students / timing["median"]
+        results[f"batch.degree_frontier{label}"] = timing
+
+        pairs = rng.integers(0, students * 5, size=students * 10)
+        codes = rng.integers(0, len(cgpa_engine.GRADES), size=pairs.size)
+        terms = rng.integers(0, 12, size=pairs.size)
+        timing = measure(lambda: cgpa_batch.counted_attempts(pairs, codes, terms, "best"))
+        timing["attempts_per_second"] = pairs.size / timing["median"]
+        results[f"batch.counted_attempts[{pairs.size} attempts]"] = timing
+
+        marks = rng.uniform(0, 100, size=students * 10)
+        timing = measure(lambda: cgpa_batch.marks_to_codes(marks))
+        timing["marks_per_second"] = marks.size / timing["median"]
+        results[f"batch.marks_to_codes[{marks.size} marks]"] = timing
+
+        if students <= 100000:
+            header = "student_id," + ",".join(cgpa_engine.GRADES) + ",thesis,program\n"
+            lines = [
+                f"s{i}," + ",".join(map(str, row)) + ",,\n" for i, row in enumerate(counts.tolist())
+            ]
+            text = header + "".join(lines)
+
+            def run_csv():
+                cgpa_cli.run_batch(io.StringIO(text), io.StringIO(), "csv", "csv")
+            timing = measure(run_csv, repeat=3)
+            timing["rows_per_second"] = students / timing["median"]
+            results[f"batch.cli_csv{label}"] = timing
+            csv_text, csv_label = text, label
+
+    # --workers: the same CSV and .cgts runs on one process and on one per core (at least two)
+    workers = max(cgpa_batch.default_workers(), 2)
+    with tempfile.TemporaryDirectory() as directory:
+        store = os.path.join(directory, "students.cgts")
+        cgpa_cli.pack_rows(io.StringIO(csv_text), store)
+        runs = {
+            "csv": lambda n: cgpa_cli.run_batch(io.StringIO(csv_text), io.StringIO(), chunk_size=10000, workers=n),
+            "store": lambda n: cgpa_cli.run_store_batch(store, io.StringIO(), chunk_size=10000, workers=n),
+        }
+        for name, run_with in runs.items():
+            single = measure(lambda: run_with(1), repeat=3)
+            timing = measure(lambda: run_with(workers), repeat=3)
+            timing.update(workers=workers, speedup=single["median"] / timing["median"])
+            results[f"batch.cli_{name}_workers{csv_label}"] = timing
+    return results
+
+
+SUITES = {"engine": bench_engine, "gui": bench_gui, "batch": bench_batch}
+
+
+def run(suites, quick=False):
+    results = {}
+    for name in suites:
+        results.update(SUITES[name](quick))
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy_version,
+        "quick": quick,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(current, baseline, tolerance):
+    """Print median ratios against a baseline; returns the names that regressed"""
+    regressions = []
+    print(f"{'benchmark':<58} {'baseline':>10} {'current':>10} {'ratio':>7}", file=sys.stderr)
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before or "median" not in result or "median" not in before:
+            continue
+        ratio = result["median"] / before["median"] if before["median"] else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<58} {before['median'] * 1000:9.2f}ms {result['median'] * 1000:9.2f}ms {ratio:7.2f}{flag}",
+              file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="cg-calc benchmark suite")
+    parser.add_argument("--suite", nargs="+", choices=sorted(SUITES), default=sorted(SUITES),
+                        help="Suites to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("-o", "--output", default="-", help="Result JSON file, or - for stdout (default)")
+    parser.add_argument("--baseline", help="Earlier result JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown of the median before it counts as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    current = run(args.suite, args.quick)
+    text = json.dumps(current, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            out.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than the baseline by more than "
+                  f"{args.tolerance:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ a = Analysis(
     ['cg-calc.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('catalogs', 'catalogs')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
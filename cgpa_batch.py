@@ -0,0 +1,303 @@
+"""Vectorized whole-cohort CGPA computation.
+
+A cohort is an (N students x grades) matrix of course counts, with the
+columns in the grading scale's order (13 grades for the default scale),
+plus an optional column of thesis grade codes (NO_THESIS where the thesis
+is not counted). Every student is computed in one pass with a dot product
+against the grade point vector.
+
+Like the engine, totals are exact int64 "tenths" (grade points x 10 x
+credits); the float CGPA is one division per student and the display
+strings come from integer rounding, so every row matches what the GUI
+shows for the same inputs.
+
+Everything runs off the scale's compiled tables: grade codes index the
+point vector directly, so other scales (see cgpa_scales) only need their
+own scale_tables().
+"""
+
+import os
+
+import numpy as np
+
+from cgpa_engine import CGPA_DECIMALS, COURSE_CREDITS, SCALE, THESIS_CREDITS, exact_value
+
+GRADE_LETTERS = SCALE.letters
+GRADE_CODES = SCALE.codes
+POINT_TENTHS = np.array(SCALE.tenths, dtype=np.int64)
+
+NO_THESIS = -1
+NO_GRADE = NO_THESIS  # Grade code of a blank mark
+NO_PROGRAM_CREDITS = -1  # Required credits of an unknown program
+
+
+def scale_tables(scale):
+    """batch_totals keyword arguments for a cgpa_scales.Scale"""
+    return {
+        "grade_tenths": np.array(scale.tenths, dtype=np.int64),
+        "course_credits": scale.course_credits,
+        "thesis_credits": scale.thesis_credits,
+    }
+
+
+def grade_code(letter, codes=GRADE_CODES):
+    """Column index of a grade letter, or NO_THESIS for a blank grade"""
+    if not letter:
+        return NO_THESIS
+    return codes[letter]
+
+
+def counts_matrix(histograms):
+    """Build an (N x grades) count matrix from grade -> count mappings"""
+    counts = np.zeros((len(histograms), len(GRADE_LETTERS)), dtype=np.int64)
+    for row, histogram in enumerate(histograms):
+        for letter, count in histogram.items():
+            counts[row, GRADE_CODES[letter]] = count
+    return counts
+
+
+def thesis_column(grades, codes=GRADE_CODES):
+    """Thesis grade codes for a sequence of letters (blank -> NO_THESIS)"""
+    return np.fromiter((grade_code(grade, codes) for grade in grades), dtype=np.int64, count=len(grades))
+
+
+def batch_totals(counts, thesis=None, grade_tenths=POINT_TENTHS,
+                 course_credits=COURSE_CREDITS, thesis_credits=THESIS_CREDITS):
+    """Tenths, credits, course counts and CGPA for every student at once
+
+    Negative counts are ignored like in the per-student path. Students
+    with no credits get a NaN CGPA. grade_tenths (integer tenths per
+    grade) overrides the scale, e.g. with the one recorded in a transcript
+    store; scale_tables() gives all three tables for another scale.
+    """
+    counts = np.asarray(counts)
+    width = len(grade_tenths)
+    if counts.ndim != 2 or counts.shape[1] != width:
+        raise ValueError(f"Expected an (N x {width}) grade count matrix, got {counts.shape}")
+    if counts.dtype.kind == "i":
+        counts = np.maximum(counts, 0)
+
+    courses = counts.sum(axis=1, dtype=np.int64)
+    credits = courses * course_credits
+    tenths = counts @ (grade_tenths.astype(np.int64) * course_credits)
+
+    # Add thesis where a grade is given
+    if thesis is not None:
+        thesis = np.asarray(thesis)
+        has_thesis = thesis != NO_THESIS
+        credits = credits + has_thesis * thesis_credits
+        tenths = tenths + np.where(has_thesis, grade_tenths[np.where(has_thesis, thesis, 0)] * thesis_credits, 0)
+
+    return _with_cgpa(tenths, credits, courses)
+
+
+def _with_cgpa(tenths, credits, courses):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cgpa = np.where(credits > 0, tenths / (10 * credits), np.nan)
+
+    return {"tenths": tenths, "credits": credits, "courses": courses, "cgpa": cgpa}
+
+
+def unique_histograms(counts, thesis=None):
+    """(distinct counts, their thesis codes, inverse) for a count matrix and thesis column
+
+    Rows reduce to the canonical key of cgpa_cache.histogram_key: counts
+    (negatives as 0, as batch_totals ignores them) and the thesis code.
+    When every value fits in a few bits the whole row packs into one int64
+    (a dot product with powers of two), so np.unique sorts plain integers
+    and the distinct rows are unpacked from the keys; otherwise rows are
+    compared whole. Indexing the distinct rows with inverse reproduces the
+    input.
+    """
+    counts = np.maximum(np.asarray(counts), 0)
+    thesis = np.full(len(counts), NO_THESIS) if thesis is None else np.asarray(thesis)
+    keys = np.column_stack((counts, thesis - NO_THESIS)).astype(np.int64)
+    bits = max(int(keys.max()).bit_length(), 1) if keys.size else 1
+    if bits * keys.shape[1] < 64:
+        shifts = bits * np.arange(keys.shape[1] - 1, -1, -1, dtype=np.int64)
+        packed, inverse = np.unique(keys @ (1 << shifts), return_inverse=True)
+        rows = (packed[:, None] >> shifts) & ((1 << bits) - 1)
+    else:
+        rows, inverse = np.unique(keys, axis=0, return_inverse=True)
+    return rows[:, :-1], rows[:, -1] + NO_THESIS, inverse.ravel()
+
+
+def deduplicated_totals(counts, thesis=None, **tables):
+    """batch_totals computed once per distinct histogram and shared by its duplicates
+
+    Most rows of a term recompute repeat another row's counts and thesis
+    grade, so only the distinct rows go through the dot product. Takes the
+    same tables as batch_totals.
+    """
+    counts = np.asarray(counts)
+    if counts.ndim != 2 or len(counts) < 2:
+        return batch_totals(counts, thesis, **tables)
+    distinct, distinct_thesis, inverse = unique_histograms(counts, thesis)
+    totals = batch_totals(distinct, distinct_thesis, **tables)
+    return {key: column[inverse] for key, column in totals.items()}
+
+
+# RAW MARKS
+def marks_out_of_range(marks, scale=SCALE):
+    """Mask of marks below the lowest cutoff or above the maximum mark (NaN is blank, not out of range)"""
+    marks = np.asarray(marks, dtype=np.float64)
+    if scale.cutoffs is None:
+        raise ValueError(f"Scale {scale.key!r} has no mark ranges")
+    return (marks < scale.cutoffs[0]) | (marks > scale.max_mark)
+
+
+def marks_to_codes(marks, scale=SCALE):
+    """Grade codes for raw marks, NO_GRADE where a mark is blank (NaN)
+
+    One np.searchsorted over the scale's ascending cutoffs converts the
+    whole array; a mark counts from its grade's lowest mark up to (not
+    including) the next grade's, e.g. 89.9 is an A- on the default scale.
+    """
+    marks = np.asarray(marks, dtype=np.float64)
+    bad = marks_out_of_range(marks, scale)
+    if bad.any():
+        index = int(np.argmax(bad))
+        raise ValueError(f"Mark {marks.flat[index]:g} (position {index}) is outside {scale.cutoffs[0]}-{scale.max_mark}")
+    cutoffs = np.asarray(scale.cutoffs, dtype=np.float64)
+    codes = len(cutoffs) - np.searchsorted(cutoffs, marks, side="right")
+    codes[np.isnan(marks)] = NO_GRADE
+    return codes
+
+
+def course_totals(students, codes, credits, n_students, grade_tenths=POINT_TENTHS):
+    """batch_totals for course-level rows: (student index, grade code, credits) per course
+
+    Courses with NO_GRADE are skipped. Sums are np.bincount over the
+    student index; the weights are integers far below 2**53, so the
+    float64 sums are exact.
+    """
+    students = np.asarray(students, dtype=np.int64)
+    codes = np.asarray(codes, dtype=np.int64)
+    credits = np.asarray(credits, dtype=np.int64)
+    graded = codes != NO_GRADE
+    if not graded.all():
+        students, codes, credits = students[graded], codes[graded], credits[graded]
+
+    tenths = np.bincount(students, weights=grade_tenths[codes] * credits, minlength=n_students).astype(np.int64)
+    credit_sums = np.bincount(students, weights=credits, minlength=n_students).astype(np.int64)
+    courses = np.bincount(students, minlength=n_students).astype(np.int64)
+    return _with_cgpa(tenths, credit_sums, courses)
+
+
+def format_cgpas(tenths, credits, decimals=CGPA_DECIMALS):
+    """Exact CGPAs rounded half-up to strings, "" where there are no credits
+
+    Same rounding as cgpa_engine.format_cgpa, done in int64 arithmetic:
+    round(tenths / (10 * credits) * 10^d) = (2 * tenths * 10^(d-1) + credits) // (2 * credits)
+
+    A cohort has far fewer distinct (tenths, credits) pairs than students,
+    so each distinct pair is formatted once (np.unique) and shared.
+    """
+    tenths = np.asarray(tenths, dtype=np.int64)
+    credits = np.asarray(credits, dtype=np.int64)
+    if len(credits) > 1:
+        stride = int(credits.max()) + 1 if credits.min() >= 0 else 0
+        # Pack each pair into one int64 when it cannot overflow
+        if stride and 0 <= tenths.min() and int(tenths.max()) < np.iinfo(np.int64).max // stride:
+            keys, inverse = np.unique(tenths * stride + credits, return_inverse=True)
+            strings = _format_unique(keys // stride, keys % stride, decimals)
+            return [strings[i] for i in inverse.ravel().tolist()]
+    return _format_unique(tenths, credits, decimals)
+
+
+def _format_unique(tenths, credits, decimals):
+    safe = np.where(credits > 0, credits, 1)
+    rounded = (2 * tenths * 10 ** (decimals - 1) + safe) // (2 * safe)
+    whole, fraction = np.divmod(rounded, 10 ** decimals)
+    return [
+        f"{w}.{f:0{decimals}d}" if c > 0 else ""
+        for w, f, c in zip(whole.tolist(), fraction.tolist(), credits.tolist())
+    ]
+
+
+# RETAKES
+def counted_attempts(attempts, codes, terms, policy="best", grade_tenths=POINT_TENTHS):
+    """Mask of the course rows that count when a course is taken more than once
+
+    attempts gives each row the index of its (student, course) pair and
+    terms an integer term order. "best" keeps the highest grade of each
+    pair (the later one on a tie), "latest" the last term, "all" every
+    row; ungraded rows never count. One np.maximum.at per pass over the
+    rows, so the cost stays linear however many retakes there are.
+    """
+    attempts = np.asarray(attempts, dtype=np.int64)
+    codes = np.asarray(codes, dtype=np.int64)
+    terms = np.asarray(terms, dtype=np.int64)
+    graded = codes != NO_GRADE
+    if policy == "all" or not len(codes):
+        return graded
+    if policy == "latest":
+        score = terms
+    elif policy == "best":
+        score = grade_tenths[np.where(graded, codes, 0)] * (int(terms.max()) + 1) + terms
+    else:
+        raise ValueError(f"Unknown retake policy {policy!r}")
+    score = np.where(graded, score, -1)
+
+    pairs = int(attempts.max()) + 1
+    top = np.full(pairs, -1, dtype=np.int64)
+    np.maximum.at(top, attempts, score)
+    winners = graded & (score == top[attempts])
+    # Duplicate rows of one attempt: keep the last
+    rows = np.flatnonzero(winners)
+    last = np.full(pairs, -1, dtype=np.int64)
+    np.maximum.at(last, attempts[rows], rows)
+    counted = np.zeros(len(codes), dtype=bool)
+    counted[last[last >= 0]] = True
+    return counted
+
+
+# DEGREE COMPLETION
+def program_credit_column(programs, scale=SCALE):
+    """Required credits per program name, NO_PROGRAM_CREDITS where the program is unknown"""
+    names, inverse = np.unique(np.asarray(programs, dtype=object).astype(str), return_inverse=True)
+    lookup = np.array([
+        scale.program_credits[scale.program_codes[name]] if name in scale.program_codes else NO_PROGRAM_CREDITS
+        for name in names.tolist()
+    ], dtype=np.int64)
+    return lookup[inverse.ravel()] if len(names) else np.zeros(0, dtype=np.int64)
+
+
+def degree_frontier(tenths, credits, required_credits, thresholds=(), grade_tenths=POINT_TENTHS):
+    """Best and worst final totals at graduation for every student, and which thresholds stay reachable
+
+    The remaining credits can each be graded anywhere from the lowest to
+    the highest grade, so the best and worst final totals are closed
+    forms; the CGPAs in between are the ones cgpa_planner.degree_frontier
+    enumerates. Each threshold (a CGPA) is compared exactly in integers:
+    reachable[t] where the best final CGPA is at least t, guaranteed[t]
+    where even the worst one is. Students with an unknown program
+    (NO_PROGRAM_CREDITS) or no credits by graduation are never flagged.
+    """
+    tenths = np.asarray(tenths, dtype=np.int64)
+    credits = np.asarray(credits, dtype=np.int64)
+    required_credits = np.asarray(required_credits, dtype=np.int64)
+    known = required_credits != NO_PROGRAM_CREDITS
+    remaining = np.where(known, np.maximum(required_credits - credits, 0), 0)
+    final_credits = credits + remaining
+    best = tenths + int(grade_tenths.max()) * remaining
+    worst = tenths + int(grade_tenths.min()) * remaining
+
+    frontier = {
+        "remaining": remaining, "credits": final_credits, "best": best, "worst": worst,
+        "reachable": {}, "guaranteed": {},
+    }
+    counted = known & (final_credits > 0)
+    for threshold in thresholds:
+        value = exact_value(threshold)
+        # total / (10 x credits) >= num / den  <=>  total x den >= 10 x num x credits
+        bound = 10 * value.numerator * final_credits
+        frontier["reachable"][threshold] = counted & (best * value.denominator >= bound)
+        frontier["guaranteed"][threshold] = counted & (worst * value.denominator >= bound)
+    return frontier
+
+
+# PARALLEL EXECUTION
+def default_workers():
+    """Number of worker processes to use when none is given"""
+    return os.cpu_count() or 1
@@ -0,0 +1,117 @@
+"""Memoized CGPA computations for repeated inputs.
+
+Many students share a grade histogram, and the same future plans come up
+again and again while advising. Inputs are reduced to a packed canonical
+key first, so equivalent inputs share a cache entry:
+
+    histogram   one count per grade, in scale order (blanks, junk and negatives -> 0)
+                plus the thesis grade code
+    plan        the sorted (grade code, credits) pairs of every complete
+                planned course, packed the same way; semester boundaries do
+                not change the totals
+
+Both caches are bounded LRUs (functools.lru_cache) and report hits and
+misses through cache_stats(). cgpa_batch.unique_histograms applies the
+histogram key to whole count matrices, so a term recompute computes each
+distinct histogram once.
+"""
+
+import functools
+import struct
+
+from cgpa_engine import COURSE_CREDITS, SCALE, THESIS_CREDITS, parse_count, parse_credits
+
+GRADE_LETTERS = SCALE.letters
+GRADE_CODES = SCALE.codes
+CODE_TENTHS = SCALE.tenths
+NO_THESIS = 255
+CACHE_SIZE = 4096
+
+_HISTOGRAM = struct.Struct(f"<{len(GRADE_LETTERS)}QB")
+_COURSE = struct.Struct("<BI")
+
+
+def histogram_key(grade_counts, thesis_grade=None):
+    """Packed canonical key for a grade -> count mapping and an optional thesis grade"""
+    counts = [max(parse_count(grade_counts.get(letter, 0)), 0) for letter in GRADE_LETTERS]
+    thesis = GRADE_CODES[thesis_grade] if thesis_grade else NO_THESIS
+    return _HISTOGRAM.pack(*counts, thesis)
+
+
+def plan_key(semesters):
+    """Packed canonical key for semesters of (grade letter, credits) pairs"""
+    return pack_plan(
+        (GRADE_CODES[grade], parse_credits(credits)) for semester in semesters for grade, credits in semester
+    )
+
+
+def pack_plan(courses):
+    """Packed canonical key for (grade code, credits) pairs in any order"""
+    return b"".join(_COURSE.pack(code, credits) for code, credits in sorted(courses))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _histogram_totals(key):
+    *counts, thesis = _HISTOGRAM.unpack(key)
+    courses = sum(counts)
+    credits = courses * COURSE_CREDITS
+    tenths = sum(count * tenths for count, tenths in zip(counts, CODE_TENTHS)) * COURSE_CREDITS
+    if thesis != NO_THESIS:
+        credits += THESIS_CREDITS
+        tenths += CODE_TENTHS[thesis] * THESIS_CREDITS
+    return tenths, credits, courses
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _plan_totals(key):
+    courses = list(_COURSE.iter_unpack(key))
+    tenths = sum(CODE_TENTHS[code] * credits for code, credits in courses)
+    return tenths, sum(credits for _, credits in courses), len(courses)
+
+
+def grade_totals(grade_counts, thesis_grade=None):
+    """cgpa_engine.grade_totals, answered from the cache for repeated histograms"""
+    tenths, credits, courses = _histogram_totals(histogram_key(grade_counts, thesis_grade))
+    return {"tenths": tenths, "credits": credits, "courses": courses}
+
+
+def future_totals(current, semesters):
+    """cgpa_engine.future_totals, with the plan's contribution cached
+
+    The plan part does not depend on the current standing, so one entry
+    serves every student considering the same courses.
+    """
+    return future_totals_for_key(current, plan_key(semesters))
+
+
+def future_totals_for_key(current, key):
+    """future_totals for a plan already packed into its key (see cgpa_model.Plan.key)"""
+    tenths, credits, courses = _plan_totals(key)
+    if not credits:
+        return None
+    return {
+        "tenths": current["tenths"] + tenths,
+        "credits": current["credits"] + credits,
+        "courses": current["courses"] + courses,
+    }
+
+
+def cache_stats():
+    """Hit/miss counts and sizes of both caches"""
+    stats = {}
+    for name, cached in (("histograms", _histogram_totals), ("plans", _plan_totals)):
+        info = cached.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
+def cache_clear():
+    _histogram_totals.cache_clear()
+    _plan_totals.cache_clear()
@@ -0,0 +1,1369 @@
+"""Command-line entry points for cg-calc (no GUI involved; tkinter is never imported).
+
+    python cg-calc.py compute --A 10 --B+ 4 --thesis A-
+    python cg-calc.py predict --cgpa 3.2 --credits 60 --plan "A,B+,B/A-@4"
+    python cg-calc.py batch students.csv -o results.csv
+    python cg-calc.py batch students.csv --scale bracu-undergrad@2024
+    cat students.jsonl | python cg-calc.py batch - --input-format jsonl
+    python cg-calc.py marks marks.csv -o results.csv
+    python cg-calc.py marks marks.csv --letters -o graded.csv
+    python cg-calc.py cohort students.csv --query 3.42 --program CSE
+    python cg-calc.py transcript attempts.csv --retakes latest -o results.csv
+    python cg-calc.py serve --port 8765
+    python cg-calc.py pack students.csv -o students.cgts
+    python cg-calc.py batch students.cgts --workers 0
+    python cg-calc.py frontier --cgpa 3.1 --credits 90 --program CSE --threshold 3.3
+    python cg-calc.py frontier --batch students.csv -o frontier.csv
+    python cg-calc.py target --cgpa 3.2 --credits 60 --target 3.5 --plan 3,3,3,3/3,3,3,3
+    python cg-calc.py forecast --cgpa 3.2 --credits 60 --plan "A=0.6|B+=0.4,B/A-@4"
+
+Input rows carry a student_id, one count column per grade letter of the
+grading scale (GRADES unless --scale picks another), a thesis grade and a
+program name. Rows are read and written in fixed-size chunks so memory
+stays flat however large the input is. The marks command takes raw
+percentage marks instead, one course per row, and grades them with the
+scale's cutoffs; the transcript command takes one letter-graded attempt per
+row and counts retaken courses by a retake policy.
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+
+import cgpa_cache
+import cgpa_engine
+import cgpa_model
+import cgpa_scales
+from cgpa_engine import GRADES, parse_count
+
+GRADE_LETTERS = tuple(GRADES.keys())
+OUTPUT_FIELDS = ("student_id", "program", "courses", "credits", "cgpa", "program_credits")
+MARK_FIELDS = ("student_id", "program", "mark", "credits", "grade")
+FRONTIER_FIELDS = (
+    "student_id", "program", "credits", "cgpa", "remaining_credits", "best_cgpa", "worst_cgpa",
+    "can_clear_probation", "can_reach_honors",
+)
+DEFAULT_CHUNK_SIZE = 65536
+
+
+# INPUT
+def _guess_format(path, default="csv"):
+    """Pick csv/jsonl/store from a file extension"""
+    if path and path != "-":
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".cgts":
+            return "store"
+        if extension in (".jsonl", ".ndjson", ".json"):
+            return "jsonl"
+        if extension == ".csv":
+            return "csv"
+    return default
+
+
+def _open_input(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _open_output(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=False)
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def csv_columns(header_line, letters=GRADE_LETTERS):
+    """Column positions (student_id, [grades], thesis, program) from a CSV header"""
+    header = next(csv.reader([header_line]), [])
+    index = {name.strip(): i for i, name in enumerate(header)}
+    if "student_id" not in index:
+        raise ValueError("CSV input needs a student_id column")
+    return (
+        index["student_id"],
+        [index.get(letter) for letter in letters],
+        index.get("thesis"),
+        index.get("program"),
+    )
+
+
+def parse_csv_lines(lines, columns):
+    """Yield (student_id, [grade counts], thesis, program) tuples from CSV lines"""
+    id_column, grade_columns, thesis_column, program_column = columns
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        width = len(row)
+        yield (
+            row[id_column],
+            [row[i] if i is not None and i < width else 0 for i in grade_columns],
+            row[thesis_column].strip() if thesis_column is not None and thesis_column < width else "",
+            row[program_column] if program_column is not None and program_column < width else "",
+        )
+
+
+def parse_jsonl_lines(lines, letters=GRADE_LETTERS):
+    """Yield (student_id, [grade counts], thesis, program) tuples from JSON lines"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        yield (
+            record.get("student_id", ""),
+            [record.get(letter, 0) for letter in letters],
+            (record.get("thesis") or "").strip(),
+            record.get("program") or "",
+        )
+
+
+def iter_chunks(rows, chunk_size):
+    """Group an iterator of rows into lists of at most chunk_size rows"""
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# CHUNK PROCESSING
+def _counts_array(np, raw_counts, width=len(GRADE_LETTERS)):
+    """Convert raw count cells to an int matrix, tolerating blanks and junk"""
+    try:
+        return np.array(raw_counts, dtype=np.int64).reshape(len(raw_counts), width)
+    except (TypeError, ValueError):
+        return np.array(
+            [[parse_count(value) for value in counts] for counts in raw_counts], dtype=np.int64
+        ).reshape(len(raw_counts), width)
+
+
+def compute_chunk(rows, scale=cgpa_engine.SCALE):
+    """Run parsed input rows through the vectorized batch engine"""
+    import numpy as np
+
+    import cgpa_batch
+
+    ids, raw_counts, thesis_grades, programs = zip(*rows)
+    counts = _counts_array(np, raw_counts, len(scale.letters))
+    try:
+        thesis = cgpa_batch.thesis_column(thesis_grades, scale.codes)
+    except KeyError as e:
+        raise ValueError(f"unknown thesis grade {e}") from None
+
+    totals = cgpa_batch.deduplicated_totals(counts, thesis, **cgpa_batch.scale_tables(scale))
+    return ids, programs, totals
+
+
+def format_results(ids, programs, totals, scale=cgpa_engine.SCALE):
+    """Yield output records (tuples in OUTPUT_FIELDS order) for a computed chunk"""
+    import cgpa_batch
+
+    cgpas = cgpa_batch.format_cgpas(totals["tenths"], totals["credits"])
+    program_codes, program_credits = scale.program_codes, scale.program_credits
+    for student_id, program, courses, credits, cgpa in zip(
+        ids, programs, totals["courses"].tolist(), totals["credits"].tolist(), cgpas
+    ):
+        code = program_codes.get(program)
+        yield (student_id, program, courses, credits, cgpa, program_credits[code] if code is not None else "")
+
+
+def format_csv(records):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(records)
+    return buffer.getvalue()
+
+
+def format_jsonl(records):
+    lines = []
+    for record in records:
+        record = dict(zip(OUTPUT_FIELDS, record))
+        record["cgpa"] = float(record["cgpa"]) if record["cgpa"] else None
+        record["program_credits"] = record["program_credits"] or None
+        lines.append(json.dumps(record) + "\n")
+    return "".join(lines)
+
+
+PARSERS = {"csv": parse_csv_lines, "jsonl": parse_jsonl_lines}
+FORMATTERS = {"csv": format_csv, "jsonl": format_jsonl}
+
+
+def process_chunk(task):
+    """Parse, compute and format one chunk of input lines
+
+    Module-level so process pool workers can run it; the task tuple is
+    (input_format, columns, output_format, lines, first_line_number,
+    scale_name) and the result is (row_count, formatted_text). columns is
+    the csv_columns() layout for CSV and the scale's grade letters for
+    JSONL; workers look the scale up by name, once per process.
+    """
+    input_format, columns, output_format, lines, first_line, scale_name = task
+    scale = cgpa_scales.get_scale(scale_name)
+    computed = _compute_lines(input_format, columns, lines, first_line, scale)
+    if computed is None:
+        return 0, ""
+    ids, programs, totals = computed
+    return len(ids), FORMATTERS[output_format](format_results(ids, programs, totals, scale))
+
+
+def _compute_lines(input_format, columns, lines, first_line, scale):
+    """(ids, programs, totals) for a chunk of input lines, or None when it has no rows"""
+    parse = PARSERS[input_format]
+    rows = list(parse(lines, columns))
+    if not rows:
+        return None
+    try:
+        return compute_chunk(rows, scale)
+    except ValueError as e:
+        # Find the offending line for the error message
+        for offset, line in enumerate(lines):
+            for row in parse([line], columns):
+                if row[2] and row[2] not in scale.codes:
+                    raise ValueError(f"Line {first_line + offset}: {e}") from None
+        raise
+
+
+def ordered_map(func, tasks, workers=1):
+    """Yield func(task) in input order, optionally across a process pool
+
+    At most two tasks per worker are in flight, so a lazy task iterator is
+    never read far ahead of the output. Tasks and results are pickled:
+    for text input that is a chunk's lines in and its formatted output
+    back, which the worker parses and produces anyway; for a .cgts store a
+    task is only (path, start, stop) and each worker maps the file itself,
+    so the count matrix is shared through the page cache, not copied.
+    Computing the totals is a small part of a row's cost next to parsing
+    and formatting, so those run in the workers too.
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield func(task)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(func, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_batch(in_stream, out_stream, input_format="csv", output_format="csv",
+              chunk_size=DEFAULT_CHUNK_SIZE, workers=1, scale_name=cgpa_scales.DEFAULT_SCALE):
+    """Stream input lines through the engine chunk by chunk, returning the row count"""
+    scale = cgpa_scales.get_scale(scale_name)
+    if output_format == "csv":
+        out_stream.write(format_csv([OUTPUT_FIELDS]))
+    columns = scale.letters
+    line_number = 1
+    if input_format == "csv":
+        header = in_stream.readline()
+        if not header:
+            return 0
+        columns = csv_columns(header, scale.letters)
+        line_number += 1
+
+    def tasks():
+        nonlocal line_number
+        for lines in iter_chunks(in_stream, chunk_size):
+            yield (input_format, columns, output_format, lines, line_number, scale.key)
+            line_number += len(lines)
+
+    processed = 0
+    for rows, text in ordered_map(process_chunk, tasks(), workers):
+        out_stream.write(text)
+        out_stream.flush()
+        processed += rows
+    return processed
+
+
+_open_stores = {}
+
+
+def process_store_chunk(task):
+    """Compute and format rows [start, stop) of a transcript store
+
+    Each process maps the store once and reuses it for every chunk, so
+    workers read the rows they need straight from the page cache.
+    """
+    path, start, stop, output_format = task
+    import cgpa_store
+
+    store = _open_stores.get(path)
+    if store is None:
+        store = _open_stores[path] = cgpa_store.open_store(path)
+    totals = store.totals(start, stop)
+    records = format_results(store.student_ids(start, stop), store.programs(start, stop), totals)
+    return stop - start, FORMATTERS[output_format](records)
+
+
+def run_store_batch(path, out_stream, output_format="csv", chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    """Stream a transcript store through the engine, returning the row count"""
+    import cgpa_store
+
+    with cgpa_store.open_store(path) as store:
+        rows = store.rows
+    if output_format == "csv":
+        out_stream.write(format_csv([OUTPUT_FIELDS]))
+    tasks = ((path, start, min(start + chunk_size, rows), output_format) for start in range(0, rows, chunk_size))
+
+    processed = 0
+    for count, text in ordered_map(process_store_chunk, tasks, workers):
+        out_stream.write(text)
+        out_stream.flush()
+        processed += count
+    return processed
+
+
+def pack_rows(in_stream, path, input_format="csv", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert CSV/JSONL rows into a transcript store, returning the row count"""
+    import numpy as np
+
+    import cgpa_store
+
+    columns = GRADE_LETTERS
+    if input_format == "csv":
+        header = in_stream.readline()
+        columns = csv_columns(header) if header else None
+
+    with cgpa_store.StoreWriter(path) as writer:
+        if columns is not None:
+            for lines in iter_chunks(in_stream, chunk_size):
+                rows = list(PARSERS[input_format](lines, columns))
+                if not rows:
+                    continue
+                ids, raw_counts, thesis_grades, programs = zip(*rows)
+                bad = [grade for grade in thesis_grades if grade and grade not in GRADES]
+                if bad:
+                    raise ValueError(f"unknown thesis grade {bad[0]!r}")
+                writer.append(ids, _counts_array(np, raw_counts), thesis_grades, programs)
+        return writer.rows
+
+
+# COHORT SUMMARIES
+def _sketch(scale, programs, totals):
+    import cgpa_cohort
+
+    sketch = cgpa_cohort.CohortSketch(scale)
+    return sketch.add(totals["tenths"], totals["credits"], sketch.group_codes(programs))
+
+
+def process_cohort_chunk(task):
+    """Sketch of one chunk of input lines; the task tuple is process_chunk's without the output format"""
+    input_format, columns, lines, first_line, scale_name = task
+    scale = cgpa_scales.get_scale(scale_name)
+    computed = _compute_lines(input_format, columns, lines, first_line, scale)
+    if computed is None:
+        return 0, None
+    ids, programs, totals = computed
+    return len(ids), _sketch(scale, programs, totals)
+
+
+def process_store_cohort_chunk(task):
+    """Sketch of rows [start, stop) of a transcript store"""
+    path, start, stop = task
+    import cgpa_store
+
+    store = _open_stores.get(path)
+    if store is None:
+        store = _open_stores[path] = cgpa_store.open_store(path)
+    return stop - start, _sketch(cgpa_engine.SCALE, store.programs(start, stop), store.totals(start, stop))
+
+
+def run_cohort(source, input_format="csv", chunk_size=DEFAULT_CHUNK_SIZE, workers=1,
+               scale_name=cgpa_scales.DEFAULT_SCALE):
+    """One streaming pass over students (a text stream, or a store path); returns (rows, merged sketch)
+
+    Every chunk is summarised into its own sketch, in a worker process when
+    workers > 1, and the sketches are merged as they come back.
+    """
+    import cgpa_cohort
+
+    if input_format == "store":
+        import cgpa_store
+
+        with cgpa_store.open_store(source) as store:
+            rows = store.rows
+        scale = cgpa_engine.SCALE  # Stores are written with the default scale
+        tasks = ((source, start, min(start + chunk_size, rows)) for start in range(0, rows, chunk_size))
+        func = process_store_cohort_chunk
+    else:
+        scale = cgpa_scales.get_scale(scale_name)
+        columns = scale.letters
+        line_number = 1
+        if input_format == "csv":
+            header = source.readline()
+            if not header:
+                return 0, cgpa_cohort.CohortSketch(scale)
+            columns = csv_columns(header, scale.letters)
+            line_number += 1
+
+        def tasks():
+            nonlocal line_number
+            for lines in iter_chunks(source, chunk_size):
+                yield (input_format, columns, lines, line_number, scale.key)
+                line_number += len(lines)
+        tasks = tasks()
+        func = process_cohort_chunk
+
+    merged = cgpa_cohort.CohortSketch(scale)
+    processed = 0
+    for count, sketch in ordered_map(func, tasks, workers):
+        if sketch is not None:
+            merged.merge(sketch)
+        processed += count
+    return processed, merged
+
+
+# DEGREE COMPLETION
+def frontier_records(ids, programs, totals, scale=cgpa_engine.SCALE):
+    """Output records (tuples in FRONTIER_FIELDS order) and (lost probation, lost honors) counts for a chunk
+
+    A flag is blank for a student whose program is unknown or whose scale
+    has no such threshold.
+    """
+    import numpy as np
+
+    import cgpa_batch
+
+    thresholds = [t for t in (scale.probation_cgpa, scale.honors_cgpa) if t is not None]
+    required = cgpa_batch.program_credit_column(programs, scale)
+    frontier = cgpa_batch.degree_frontier(
+        totals["tenths"], totals["credits"], required, thresholds, cgpa_batch.scale_tables(scale)["grade_tenths"]
+    )
+    known = (required != cgpa_batch.NO_PROGRAM_CREDITS) & (frontier["credits"] > 0)
+    flags, lost = [], []
+    for threshold in (scale.probation_cgpa, scale.honors_cgpa):
+        if threshold is None:
+            flags.append(itertools.repeat(""))
+            lost.append(0)
+            continue
+        reachable = frontier["reachable"][threshold]
+        flags.append([r if k else "" for r, k in zip(reachable.tolist(), known.tolist())])
+        lost.append(int((known & ~reachable).sum()))
+
+    columns = zip(
+        ids, programs, totals["credits"].tolist(),
+        cgpa_batch.format_cgpas(totals["tenths"], totals["credits"]),
+        [r if k else "" for r, k in zip(frontier["remaining"].tolist(), known.tolist())],
+        cgpa_batch.format_cgpas(frontier["best"], np.where(known, frontier["credits"], 0)),
+        cgpa_batch.format_cgpas(frontier["worst"], np.where(known, frontier["credits"], 0)),
+        *flags,
+    )
+    return list(columns), tuple(lost)
+
+
+def format_frontier_jsonl(records):
+    lines = []
+    for record in records:
+        record = {key: value if value != "" else None for key, value in zip(FRONTIER_FIELDS, record)}
+        for key in ("cgpa", "best_cgpa", "worst_cgpa"):
+            record[key] = float(record[key]) if record[key] else None
+        lines.append(json.dumps(record) + "\n")
+    return "".join(lines)
+
+
+FRONTIER_FORMATTERS = {"csv": format_csv, "jsonl": format_frontier_jsonl}
+
+
+def process_frontier_chunk(task):
+    """Frontier of one chunk of input lines; the task tuple is process_chunk's
+
+    The result is (row_count, formatted_text, (lost probation, lost honors)).
+    """
+    input_format, columns, output_format, lines, first_line, scale_name = task
+    scale = cgpa_scales.get_scale(scale_name)
+    computed = _compute_lines(input_format, columns, lines, first_line, scale)
+    if computed is None:
+        return 0, "", (0, 0)
+    records, lost = frontier_records(*computed, scale)
+    return len(records), FRONTIER_FORMATTERS[output_format](records), lost
+
+
+def process_store_frontier_chunk(task):
+    """Frontier of rows [start, stop) of a transcript store"""
+    path, start, stop, output_format = task
+    import cgpa_store
+
+    store = _open_stores.get(path)
+    if store is None:
+        store = _open_stores[path] = cgpa_store.open_store(path)
+    records, lost = frontier_records(store.student_ids(start, stop), store.programs(start, stop), store.totals(start, stop))
+    return len(records), FRONTIER_FORMATTERS[output_format](records), lost
+
+
+def run_frontier(source, out_stream, input_format="csv", output_format="csv", chunk_size=DEFAULT_CHUNK_SIZE,
+                 workers=1, scale_name=cgpa_scales.DEFAULT_SCALE):
+    """Stream students (a text stream, or a store path) through the frontier; returns (rows, lost counts)
+
+    lost counts is (students who can no longer clear probation, students
+    who can no longer reach honors).
+    """
+    if output_format == "csv":
+        out_stream.write(format_csv([FRONTIER_FIELDS]))
+    if input_format == "store":
+        import cgpa_store
+
+        with cgpa_store.open_store(source) as store:
+            rows = store.rows
+        tasks = ((source, start, min(start + chunk_size, rows), output_format) for start in range(0, rows, chunk_size))
+        func = process_store_frontier_chunk
+    else:
+        scale = cgpa_scales.get_scale(scale_name)
+        columns = scale.letters
+        line_number = 1
+        if input_format == "csv":
+            header = source.readline()
+            if not header:
+                return 0, (0, 0)
+            columns = csv_columns(header, scale.letters)
+            line_number += 1
+
+        def tasks():
+            nonlocal line_number
+            for lines in iter_chunks(source, chunk_size):
+                yield (input_format, columns, output_format, lines, line_number, scale.key)
+                line_number += len(lines)
+        tasks = tasks()
+        func = process_frontier_chunk
+
+    processed, lost_probation, lost_honors = 0, 0, 0
+    for count, text, (probation, honors) in ordered_map(func, tasks, workers):
+        out_stream.write(text)
+        out_stream.flush()
+        processed += count
+        lost_probation += probation
+        lost_honors += honors
+    return processed, (lost_probation, lost_honors)
+
+
+# RAW MARKS
+def mark_columns(header_line):
+    """Column positions (student_id, mark, credits, program) from a marks CSV header"""
+    header = next(csv.reader([header_line]), [])
+    index = {name.strip(): i for i, name in enumerate(header)}
+    if "student_id" not in index or "mark" not in index:
+        raise ValueError("Marks input needs student_id and mark columns")
+    return index["student_id"], index["mark"], index.get("credits"), index.get("program")
+
+
+def parse_mark_csv_lines(lines, columns):
+    """Yield (student_id, mark, credits, program) tuples from marks CSV lines"""
+    id_column, mark_column, credits_column, program_column = columns
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        width = len(row)
+        yield (
+            row[id_column],
+            row[mark_column].strip() if mark_column < width else "",
+            row[credits_column].strip() if credits_column is not None and credits_column < width else "",
+            row[program_column] if program_column is not None and program_column < width else "",
+        )
+
+
+def parse_mark_jsonl_lines(lines, columns=None):
+    """Yield (student_id, mark, credits, program) tuples from JSON lines"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        mark, credits = record.get("mark"), record.get("credits")
+        yield (
+            record.get("student_id", ""),
+            "" if mark is None else mark,
+            "" if credits is None else credits,
+            record.get("program") or "",
+        )
+
+
+MARK_PARSERS = {"csv": parse_mark_csv_lines, "jsonl": parse_mark_jsonl_lines}
+
+
+def _number_column(np, ids, cells, name, blank):
+    """Float array from raw cells; blanks become `blank`, junk is an error naming the student"""
+    cells = [blank if cell == "" else cell for cell in cells]
+    try:
+        return np.array(cells, dtype=np.float64)
+    except (TypeError, ValueError):
+        for student_id, cell in zip(ids, cells):
+            try:
+                float(cell)
+            except (TypeError, ValueError):
+                raise ValueError(f"student {student_id!r}: invalid {name} {cell!r}") from None
+        raise
+
+
+def grade_mark_rows(rows, scale=cgpa_engine.SCALE):
+    """Grade codes and credits for parsed mark rows, converted a chunk at a time"""
+    import numpy as np
+
+    import cgpa_batch
+
+    ids, marks, credits, programs = zip(*rows)
+    marks = _number_column(np, ids, marks, "mark", "nan")
+    credits = _number_column(np, ids, credits, "credits", scale.course_credits)
+    bad = cgpa_batch.marks_out_of_range(marks, scale)
+    if bad.any():
+        index = int(np.argmax(bad))
+        raise ValueError(f"student {ids[index]!r}: mark {marks[index]:g} is outside {scale.cutoffs[0]}-{scale.max_mark}")
+    bad = (credits < 0) | (credits % 1 != 0)
+    if bad.any():
+        index = int(np.argmax(bad))
+        raise ValueError(f"student {ids[index]!r}: credits must be whole numbers, got {credits[index]:g}")
+    codes = cgpa_batch.marks_to_codes(marks, scale)
+    return ids, marks, credits.astype(np.int64), programs, codes
+
+
+def format_mark_jsonl(records):
+    return "".join(json.dumps(dict(zip(MARK_FIELDS, record))) + "\n" for record in records)
+
+
+def run_mark_letters(in_stream, out_stream, input_format="csv", output_format="csv",
+                     chunk_size=DEFAULT_CHUNK_SIZE, scale_name=cgpa_scales.DEFAULT_SCALE):
+    """Write every mark row back with its letter grade, returning the row count"""
+    scale = cgpa_scales.get_scale(scale_name)
+    columns = None
+    if input_format == "csv":
+        header = in_stream.readline()
+        if not header:
+            return 0
+        columns = mark_columns(header)
+    if output_format == "csv":
+        out_stream.write(format_csv([MARK_FIELDS]))
+    letters = scale.letters + ("",)  # NO_GRADE (-1) picks the blank
+
+    processed = 0
+    for lines in iter_chunks(in_stream, chunk_size):
+        rows = list(MARK_PARSERS[input_format](lines, columns))
+        if not rows:
+            continue
+        ids, marks, credits, programs, codes = grade_mark_rows(rows, scale)
+        records = zip(
+            ids, programs, [mark if mark == mark else None for mark in marks.tolist()],
+            credits.tolist(), [letters[code] for code in codes.tolist()],
+        )
+        out_stream.write(format_csv(records) if output_format == "csv" else format_mark_jsonl(records))
+        processed += len(rows)
+    return processed
+
+
+def run_marks(in_stream, out_stream, input_format="csv", output_format="csv",
+              chunk_size=DEFAULT_CHUNK_SIZE, scale_name=cgpa_scales.DEFAULT_SCALE):
+    """Grade raw marks and compute every student's CGPA, returning the mark row count
+
+    A student's marks may be spread over the whole input, so per-student
+    totals are accumulated across chunks (memory grows with the number of
+    students, not marks) and written at the end, in order of first
+    appearance. Within a chunk, marks are summed per student with
+    cgpa_batch.course_totals; Python only touches each distinct student.
+    """
+    import numpy as np
+
+    import cgpa_batch
+
+    scale = cgpa_scales.get_scale(scale_name)
+    tables = cgpa_batch.scale_tables(scale)
+    columns = None
+    if input_format == "csv":
+        header = in_stream.readline()
+        columns = mark_columns(header) if header else None
+
+    students = {}  # student_id -> [tenths, credits, courses, program]
+    processed = 0
+    if columns is not None or input_format != "csv":
+        for lines in iter_chunks(in_stream, chunk_size):
+            rows = list(MARK_PARSERS[input_format](lines, columns))
+            if not rows:
+                continue
+            ids, _, credits, programs, codes = grade_mark_rows(rows, scale)
+            unique, first, inverse = np.unique(np.array(ids, dtype=object).astype(str),
+                                               return_index=True, return_inverse=True)
+            totals = cgpa_batch.course_totals(inverse.ravel(), codes, credits, len(unique), tables["grade_tenths"])
+            order = np.argsort(first, kind="stable")
+            rows_first = first[order].tolist()
+            for row, tenths, credits, courses in zip(
+                rows_first, totals["tenths"][order].tolist(), totals["credits"][order].tolist(),
+                totals["courses"][order].tolist(),
+            ):
+                entry = students.get(ids[row])
+                if entry is None:
+                    students[ids[row]] = [tenths, credits, courses, programs[row]]
+                else:
+                    entry[0] += tenths
+                    entry[1] += credits
+                    entry[2] += courses
+                    entry[3] = entry[3] or programs[row]
+            processed += len(rows)
+
+    if output_format == "csv":
+        out_stream.write(format_csv([OUTPUT_FIELDS]))
+    if students:
+        tenths, credits, courses, programs = zip(*students.values())
+        totals = {
+            "tenths": np.array(tenths, dtype=np.int64),
+            "credits": np.array(credits, dtype=np.int64),
+            "courses": np.array(courses, dtype=np.int64),
+        }
+        records = format_results(list(students), programs, totals, scale)
+        out_stream.write(FORMATTERS[output_format](records))
+    return processed
+
+
+# TRANSCRIPTS
+def transcript_columns(header_line):
+    """Column positions (student_id, course, term, grade, credits, program) from a transcript CSV header"""
+    header = next(csv.reader([header_line]), [])
+    index = {name.strip(): i for i, name in enumerate(header)}
+    missing = [name for name in ("student_id", "course", "grade") if name not in index]
+    if missing:
+        raise ValueError(f"Transcript input needs {', '.join(missing)} column{'s' if len(missing) > 1 else ''}")
+    return (index["student_id"], index["course"], index.get("term"), index["grade"],
+            index.get("credits"), index.get("program"))
+
+
+def parse_transcript_csv_lines(lines, columns):
+    """Yield (student_id, course, term, grade, credits, program) tuples from transcript CSV lines"""
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        width = len(row)
+        yield tuple(
+            row[column].strip() if column is not None and column < width else ""
+            for column in columns
+        )
+
+
+def parse_transcript_jsonl_lines(lines, columns=None):
+    """Yield (student_id, course, term, grade, credits, program) tuples from JSON lines"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        yield tuple(
+            "" if record.get(name) is None else str(record[name]).strip()
+            for name in ("student_id", "course", "term", "grade", "credits", "program")
+        )
+
+
+TRANSCRIPT_PARSERS = {"csv": parse_transcript_csv_lines, "jsonl": parse_transcript_jsonl_lines}
+
+
+def _term_order(terms):
+    """Rank per term label: numerically when every label is a number, else as text"""
+    try:
+        ordered = sorted(terms, key=float)
+    except ValueError:
+        ordered = sorted(terms)
+    rank = {term: position for position, term in enumerate(ordered)}
+    return [rank[term] for term in terms]
+
+
+def read_transcript(in_stream, input_format="csv", policy="best", chunk_size=DEFAULT_CHUNK_SIZE, scale=cgpa_engine.SCALE):
+    """Counted course attempts of a transcript under a retake policy
+
+    Attempts of one course may be anywhere in the input, so each row is
+    reduced to small integer codes (student, student+course pair, term,
+    grade, credits) as it is read, and the policy is applied to all rows at
+    once at the end with cgpa_batch.counted_attempts, in a linear pass.
+    Returns (student ids, programs, attempts, row count): students in order
+    of first appearance, and attempts a (student index, grade code,
+    credits) tuple of arrays holding only the attempts that count.
+    """
+    import numpy as np
+
+    import cgpa_batch
+
+    tables = cgpa_batch.scale_tables(scale)
+    columns = None
+    if input_format == "csv":
+        header = in_stream.readline()
+        columns = transcript_columns(header) if header else None
+
+    students = {}  # student_id -> index
+    programs = []
+    pairs = {}  # (student index, course) -> index
+    terms = {}  # term label -> index
+    chunks = []
+    processed = 0
+    codes = {**scale.codes, "": cgpa_batch.NO_GRADE}
+    if columns is not None or input_format != "csv":
+        for lines in iter_chunks(in_stream, chunk_size):
+            rows = list(TRANSCRIPT_PARSERS[input_format](lines, columns))
+            if not rows:
+                continue
+            student_column, pair_column, term_column, grade_column = [], [], [], []
+            for student_id, course, term, grade, _, program in rows:
+                student = students.get(student_id)
+                if student is None:
+                    student = students[student_id] = len(programs)
+                    programs.append(program)
+                elif program and not programs[student]:
+                    programs[student] = program
+                code = codes.get(grade)
+                if code is None:
+                    raise ValueError(f"student {student_id!r}, course {course!r}: unknown grade {grade!r}")
+                student_column.append(student)
+                pair_column.append(pairs.setdefault((student, course), len(pairs)))
+                term_column.append(terms.setdefault(term, len(terms)))
+                grade_column.append(code)
+            ids = [row[0] for row in rows]
+            credits = _number_column(np, ids, [row[4] for row in rows], "credits", scale.course_credits)
+            bad = (credits < 0) | (credits % 1 != 0)
+            if bad.any():
+                index = int(np.argmax(bad))
+                raise ValueError(f"student {ids[index]!r}: credits must be whole numbers, got {credits[index]:g}")
+            chunks.append(np.array([student_column, pair_column, term_column, grade_column], dtype=np.int64))
+            chunks.append(credits.astype(np.int64)[None, :])
+            processed += len(rows)
+
+    if not students:
+        empty = np.zeros(0, dtype=np.int64)
+        return [], [], (empty, empty, empty), processed
+    student_column, pair_column, term_column, grade_column = np.concatenate(chunks[0::2], axis=1)
+    credits = np.concatenate(chunks[1::2], axis=1)[0]
+    term_rank = np.array(_term_order(list(terms)), dtype=np.int64)
+    counted = cgpa_batch.counted_attempts(pair_column, grade_column, term_rank[term_column], policy,
+                                          tables["grade_tenths"])
+    return list(students), programs, (student_column[counted], grade_column[counted], credits[counted]), processed
+
+
+def run_transcript(in_stream, out_stream, input_format="csv", output_format="csv", policy="best",
+                   chunk_size=DEFAULT_CHUNK_SIZE, scale_name=cgpa_scales.DEFAULT_SCALE):
+    """CGPA of every student from course attempts under a retake policy, returning the attempt row count
+
+    Students are written in order of first appearance.
+    """
+    import cgpa_batch
+
+    scale = cgpa_scales.get_scale(scale_name)
+    ids, programs, (students, grades, credits), processed = read_transcript(
+        in_stream, input_format, policy, chunk_size, scale
+    )
+    if output_format == "csv":
+        out_stream.write(format_csv([OUTPUT_FIELDS]))
+    if ids:
+        totals = cgpa_batch.course_totals(students, grades, credits, len(ids), cgpa_batch.scale_tables(scale)["grade_tenths"])
+        out_stream.write(FORMATTERS[output_format](format_results(ids, programs, totals, scale)))
+    return processed
+
+
+def pack_transcript(in_stream, path, input_format="csv", policy="best", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Pack the counted attempts of a course-level transcript into a store, returning the attempt row count
+
+    Each student gets a row whose counts are the counted attempts per
+    grade, and the attempts themselves, with their credits, go into the
+    store's course section, which batch, cohort and frontier then read.
+    """
+    import numpy as np
+
+    import cgpa_store
+
+    ids, programs, (students, grades, credits), processed = read_transcript(in_stream, input_format, policy, chunk_size)
+    order = np.argsort(students, kind="stable")
+    students, grades, credits = students[order], grades[order], credits[order]
+    width = len(GRADE_LETTERS)
+    counts = np.bincount(students * width + grades, minlength=len(ids) * width).reshape(len(ids), width)
+    with cgpa_store.StoreWriter(path) as writer:
+        writer.append(ids, counts, None, programs)
+        writer.append_courses(students, grades, credits)
+    return processed
+
+
+# COMMANDS
+def _store_scale(args, input_format):
+    """Refuse --scale with a .cgts input: stores are always packed with the default scale"""
+    if input_format == "store" and cgpa_scales.get_scale(args.scale).key != cgpa_engine.SCALE.key:
+        raise ValueError(f".cgts stores use the default scale {cgpa_engine.SCALE.key!r}; --scale does not apply")
+
+
+def cmd_batch(args):
+    import cgpa_batch
+
+    input_format = args.input_format or _guess_format(args.input)
+    _store_scale(args, input_format)
+    output_format = args.format or _guess_format(args.output, default="csv" if input_format == "store" else input_format)
+    workers = args.workers or cgpa_batch.default_workers()
+
+    start = time.perf_counter()
+    if input_format == "store":
+        with _open_output(args.output) as out_stream:
+            processed = run_store_batch(args.input, out_stream, output_format, args.chunk_size, workers)
+    else:
+        with _open_input(args.input) as in_stream, _open_output(args.output) as out_stream:
+            processed = run_batch(in_stream, out_stream, input_format, output_format, args.chunk_size, workers,
+                                  args.scale)
+    _report_rate(processed, time.perf_counter() - start)
+    return 0
+
+
+def cmd_pack(args):
+    input_format = args.input_format or _guess_format(args.input)
+
+    start = time.perf_counter()
+    with _open_input(args.input) as in_stream:
+        if args.transcript:
+            processed = pack_transcript(in_stream, args.output, input_format, args.retakes, args.chunk_size)
+        else:
+            processed = pack_rows(in_stream, args.output, input_format, args.chunk_size)
+    _report_rate(processed, time.perf_counter() - start)
+    return 0
+
+
+def cmd_cohort(args):
+    import cgpa_batch
+
+    input_format = args.input_format or _guess_format(args.input)
+    _store_scale(args, input_format)
+    workers = args.workers or cgpa_batch.default_workers()
+
+    start = time.perf_counter()
+    if input_format == "store":
+        processed, sketch = run_cohort(args.input, "store", args.chunk_size, workers)
+    else:
+        with _open_input(args.input) as in_stream:
+            processed, sketch = run_cohort(in_stream, input_format, args.chunk_size, workers, args.scale)
+    _report_rate(processed, time.perf_counter() - start)
+
+    if args.query:
+        group = args.program or "the cohort"
+        answers = [
+            {"cgpa": value, "program": args.program, "percentile": sketch.percentile_rank(value, args.program),
+             "below": sketch.count_below(value, args.program), "students": sketch.count(args.program)}
+            for value in args.query
+        ]
+        if args.json:
+            print(json.dumps(answers))
+            return 0
+        for answer in answers:
+            if answer["percentile"] is None:
+                print(f"No students with credits in {group}")
+            else:
+                print(f"CGPA {answer['cgpa']}: {answer['percentile']:.2f}th percentile of {group} "
+                      f"({answer['below']} of {answer['students']} students below)")
+        return 0
+    print(json.dumps(sketch.summary(histogram_width=args.histogram_width), indent=2))
+    return 0
+
+
+def cmd_marks(args):
+    input_format = args.input_format or _guess_format(args.input)
+    output_format = args.format or _guess_format(args.output, default=input_format)
+    run = run_mark_letters if args.letters else run_marks
+
+    start = time.perf_counter()
+    with _open_input(args.input) as in_stream, _open_output(args.output) as out_stream:
+        processed = run(in_stream, out_stream, input_format, output_format, args.chunk_size, args.scale)
+    _report_rate(processed, time.perf_counter() - start)
+    return 0
+
+
+def cmd_transcript(args):
+    input_format = args.input_format or _guess_format(args.input)
+    output_format = args.format or _guess_format(args.output, default=input_format)
+
+    start = time.perf_counter()
+    with _open_input(args.input) as in_stream, _open_output(args.output) as out_stream:
+        processed = run_transcript(in_stream, out_stream, input_format, output_format, args.retakes,
+                                   args.chunk_size, args.scale)
+    _report_rate(processed, time.perf_counter() - start)
+    return 0
+
+
+def cmd_serve(args):
+    import asyncio
+
+    import cgpa_server
+
+    try:
+        asyncio.run(cgpa_server.serve(
+            args.host, args.port, window=args.batch_window / 1000, max_batch=args.max_batch,
+            max_queue=args.max_queue, queue_timeout=args.queue_timeout, max_connections=args.max_connections,
+        ))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_frontier(args):
+    if args.batch:
+        import cgpa_batch
+
+        input_format = args.input_format or _guess_format(args.batch)
+        _store_scale(args, input_format)
+        output_format = args.format or _guess_format(args.output, default="csv" if input_format == "store" else input_format)
+        workers = args.workers or cgpa_batch.default_workers()
+
+        start = time.perf_counter()
+        with _open_output(args.output) as out_stream:
+            if input_format == "store":
+                processed, lost = run_frontier(args.batch, out_stream, "store", output_format, args.chunk_size, workers)
+            else:
+                with _open_input(args.batch) as in_stream:
+                    processed, lost = run_frontier(in_stream, out_stream, input_format, output_format, args.chunk_size,
+                                                   workers, args.scale)
+        _report_rate(processed, time.perf_counter() - start)
+        print(f"Can no longer clear probation: {lost[0]}; can no longer reach honors: {lost[1]}", file=sys.stderr)
+        return 0
+
+    import cgpa_planner
+
+    if args.cgpa is None or args.credits is None or not args.program:
+        raise ValueError("frontier needs --cgpa, --credits and --program (or --batch FILE)")
+    frontier = cgpa_planner.degree_frontier(args.cgpa, args.credits, args.program, args.threshold, args.thesis_done)
+    if args.json:
+        print(json.dumps(frontier))
+        return 0
+    remaining = frontier["remaining_credits"]
+    print(f"Remaining: {remaining} credits in {frontier['remaining_courses']} courses")
+    print(f"Final CGPA: {frontier['worst']['cgpa_text']} to {frontier['best']['cgpa_text']} "
+          f"({len(frontier['reachable'])} reachable values)")
+    if args.threshold is None:
+        return 0
+    if frontier["guaranteed"]:
+        print(f"A CGPA of {args.threshold} is reached whatever the remaining grades")
+    elif not frontier["can_reach"]:
+        print(f"A CGPA of {args.threshold} is out of reach by graduation")
+    else:
+        print(f"Needs an average of {frontier['min_average']:.3f} points per remaining credit "
+              f"(lowest reachable CGPA at or above {args.threshold}: {frontier['lowest_reaching']['cgpa_text']})")
+        print(f"Same grade in every course: {frontier['min_uniform_grade']} or better")
+    return 0
+
+
+def cmd_compute(args):
+    counts = {letter: getattr(args, f"count_{code}") for code, letter in enumerate(GRADE_LETTERS)}
+    totals = cgpa_cache.grade_totals(counts, args.thesis)
+    if not totals["credits"]:
+        raise ValueError("No valid grades entered")
+    if args.json:
+        print(json.dumps({**totals, "cgpa": cgpa_engine.cgpa(totals), "cgpa_text": cgpa_engine.format_cgpa(totals)}))
+        return 0
+    thesis_text = " + thesis/internship" if args.thesis else ""
+    print(f"Total courses: {totals['courses']}{thesis_text}")
+    print(f"Total credits: {totals['credits']}")
+    print(f"Current CGPA: {cgpa_engine.format_cgpa(totals)}")
+    return 0
+
+
+def parse_planned_course(text):
+    """(letter, credits) from text like "B+" or "A-@4" (credits default to 3)"""
+    letter, _, credits = text.partition("@")
+    letter = letter.strip()
+    if letter not in GRADES:
+        raise ValueError(f"Unknown grade {letter!r}")
+    return letter, credits.strip() or cgpa_engine.COURSE_CREDITS
+
+
+def cmd_predict(args):
+    current = cgpa_engine.standing(args.cgpa, args.credits)
+    semesters = [[parse_planned_course(course) for course in semester] for semester in parse_plan(args.plan)]
+    future = cgpa_engine.future_totals(current, semesters)
+    if future is None:
+        raise ValueError("Add future courses to calculate")
+    after = cgpa_engine.trajectory(current, semesters)
+    if args.json:
+        print(json.dumps({
+            "semesters": len(semesters), "credits": future["credits"],
+            "cgpa": cgpa_engine.cgpa(future), "cgpa_text": cgpa_engine.format_cgpa(future),
+            "trajectory": [
+                {"credits": totals["credits"], "cgpa": cgpa_engine.cgpa(totals), "cgpa_text": cgpa_engine.format_cgpa(totals)}
+                for totals in after
+            ],
+        }))
+        return 0
+    if len(semesters) > 1:
+        for number, totals in enumerate(after, 1):
+            print(f"After semester {number}: {cgpa_engine.format_cgpa(totals)} ({totals['credits']} credits)")
+    print(f"Total credits: {future['credits']}")
+    print(f"Future CGPA after {len(semesters)} semester{'s' if len(semesters) > 1 else ''}: {cgpa_engine.format_cgpa(future)}")
+    return 0
+
+
+def parse_plan(text):
+    """Split a plan like "3,3,3/4,3" into semesters of course entries"""
+    return [
+        [entry.strip() for entry in semester.split(",") if entry.strip()]
+        for semester in text.split("/")
+    ]
+
+
+def cmd_target(args):
+    import cgpa_planner
+
+    semesters = parse_plan(args.plan)
+    max_courses = None if args.no_course_limit else cgpa_planner.MAX_COURSES_PER_SEMESTER
+    plans = cgpa_planner.solve_target(args.cgpa, args.credits, args.target, semesters, args.limit, max_courses)
+    if args.json:
+        print(json.dumps(plans))
+        return 0
+    if not plans:
+        print(f"A CGPA of {args.target} is out of reach with this plan")
+        return 0
+    uniform = cgpa_planner.minimum_uniform_grade(args.cgpa, args.credits, args.target, semesters, max_courses)
+    print(f"Same grade in every course: {uniform} or better")
+    for number, plan in enumerate(plans, 1):
+        semesters_text = " / ".join(", ".join(grades) for grades in plan["grades"])
+        print(f"{number}. {semesters_text}  (CGPA {plan['cgpa_text']})")
+    return 0
+
+
+def parse_course_spec(text):
+    """Course spec from text like "A=0.5|B+=0.5@4" (grade distribution, optional credits)"""
+    grades, _, credits = text.partition("@")
+    distribution = {}
+    for part in grades.split("|"):
+        letter, _, probability = part.strip().partition("=")
+        distribution[letter.strip()] = float(probability) if probability else 1.0
+    spec = {"grades": distribution}
+    if credits:
+        spec["credits"] = cgpa_engine.parse_credits(credits)
+    return spec
+
+
+def _forecast_options(args):
+    options = {"thresholds": tuple(args.threshold or ()) or None, "samples": args.samples, "seed": args.seed}
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def _forecast_record(number, line):
+    """(record, (cgpa, credits, semesters)) from line number of a forecast --batch file
+
+    Course specs are left to the forecast itself, which parses them anyway;
+    _check_forecast_plan finds the line of a bad one only when it fails.
+    """
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("expected a JSON object")
+        missing = [key for key in ("cgpa", "credits", "plan") if key not in record]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        try:
+            cgpa_engine.exact_value(record["cgpa"])
+        except (TypeError, ValueError, ZeroDivisionError):
+            raise ValueError(f"Invalid CGPA {record['cgpa']!r}") from None
+        credits = cgpa_engine.parse_credits(record["credits"])
+        plan = record["plan"]
+        if not isinstance(plan, list) or not all(isinstance(semester, list) for semester in plan):
+            raise ValueError("plan must be a list of semesters, each a list of courses")
+    except ValueError as error:
+        raise ValueError(f"line {number}: {error}") from None
+    return record, (record["cgpa"], credits, plan)
+
+
+def _check_forecast_plan(number, plan):
+    import cgpa_forecast
+
+    try:
+        cgpa_forecast.parse_plan(plan)
+    except (TypeError, AttributeError):
+        raise ValueError(f"line {number}: plan courses must be grade letters or {{letter: probability}} objects") from None
+    except ValueError as error:
+        raise ValueError(f"line {number}: {error}") from None
+
+
+def cmd_forecast(args):
+    import cgpa_forecast
+
+    options = _forecast_options(args)
+    if args.batch:
+        start = time.perf_counter()
+        processed = 0
+        with _open_input(args.batch) as in_stream, _open_output(args.output) as out_stream:
+            numbered = enumerate(in_stream, 1)
+            for lines in iter_chunks(numbered, args.chunk_size):
+                lines = [(number, line) for number, line in lines if line.strip()]
+                parsed = [_forecast_record(number, line) for number, line in lines]
+                records = [record for record, _ in parsed]
+                students = [student for _, student in parsed]
+                try:
+                    results = cgpa_forecast.forecast_batch(students, args.mode, first_index=processed, **options)
+                except (TypeError, AttributeError, ValueError):
+                    for (number, _), (_, _, plan) in zip(lines, students):
+                        _check_forecast_plan(number, plan)
+                    raise
+                for record, result in zip(records, results):
+                    result["student_id"] = record.get("student_id")
+                    out_stream.write(json.dumps(result) + "\n")
+                processed += len(records)
+        _report_rate(processed, time.perf_counter() - start)
+        return 0
+
+    if args.cgpa is None or args.credits is None or not args.plan:
+        raise ValueError("forecast needs --cgpa, --credits and --plan (or --batch FILE)")
+    semesters = [[parse_course_spec(course) for course in semester] for semester in parse_plan(args.plan)]
+    credits = cgpa_engine.parse_credits(args.credits)
+    result = cgpa_forecast.forecast(args.cgpa, credits, semesters, args.mode, **options)
+    if args.json:
+        print(json.dumps(result))
+        return 0
+    print(f"Mean CGPA: {result['mean']:.5f} (std {result['std']:.5f}, range {result['min']:.5f}-{result['max']:.5f})")
+    for q, value in result["percentiles"].items():
+        print(f"  {q}th percentile: {value:.5f}")
+    for threshold, probability in result["p_at_least"].items():
+        print(f"  P(CGPA >= {threshold}): {probability:.4f}")
+    return 0
+
+
+def _report_rate(processed, elapsed):
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {processed} rows in {elapsed:.3f}s ({rate:,.0f} rows/s)", file=sys.stderr)
+
+
+def _course_count(text):
+    count = int(text)
+    if count < 0:
+        raise argparse.ArgumentTypeError("course counts cannot be negative")
+    return count
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cg-calc", description="CGPA Calculator command-line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compute = commands.add_parser("compute", help="Current CGPA from course counts per grade")
+    for code, letter in enumerate(GRADE_LETTERS):
+        compute.add_argument(f"--{letter}", dest=f"count_{code}", type=_course_count, default=0, metavar="N",
+                             help=f"Courses graded {letter}")
+    compute.add_argument("--thesis", choices=GRADE_LETTERS, metavar="GRADE", help="Thesis/internship grade (4 credits)")
+    compute.add_argument("--json", action="store_true", help="Print totals as JSON")
+    compute.set_defaults(handler=cmd_compute)
+
+    predict = commands.add_parser("predict", help="Future CGPA after planned semesters")
+    predict.add_argument("--cgpa", required=True, help="Current CGPA")
+    predict.add_argument("--credits", required=True, help="Completed credits")
+    predict.add_argument("--plan", required=True, help='Planned grades, semesters split by "/", credits after "@" (default 3), e.g. "A,B+,B/A-@4"')
+    predict.add_argument("--json", action="store_true", help="Print the result as JSON")
+    predict.set_defaults(handler=cmd_predict)
+
+    batch = commands.add_parser("batch", help="Compute CGPA for every row of a CSV/JSONL file")
+    batch.add_argument("input", nargs="?", default="-", help="Input file, or - for stdin (default)")
+    batch.add_argument("-o", "--output", default="-", help="Output file, or - for stdout (default)")
+    batch.add_argument("--input-format", choices=sorted(PARSERS) + ["store"], help="Input format (default: from extension, else csv)")
+    batch.add_argument("--format", choices=sorted(FORMATTERS), help="Output format (default: from extension, else input format)")
+    batch.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk (default: %(default)s)")
+    batch.add_argument("--workers", type=int, default=1, help="Worker processes, 0 for one per core (default: %(default)s)")
+    batch.add_argument("--scale", default=cgpa_scales.DEFAULT_SCALE,
+                       help="Grading scale id or id@version from catalogs/ (default: %(default)s; .cgts stores always use the default scale)")
+    batch.set_defaults(handler=cmd_batch)
+
+    cohort = commands.add_parser("cohort", help="Cohort summary (histograms, percentiles, per-program spread) in one streaming pass")
+    cohort.add_argument("input", nargs="?", default="-", help="Student file in batch format (CSV/JSONL/.cgts), or - for stdin (default)")
+    cohort.add_argument("--input-format", choices=sorted(PARSERS) + ["store"], help="Input format (default: from extension, else csv)")
+    cohort.add_argument("--query", type=float, action="append", metavar="CGPA", help="Print the percentile rank of a CGPA instead of the summary; repeatable")
+    cohort.add_argument("--program", help='Program name or abbreviation (e.g. "CSE") for --query (default: whole cohort)')
+    cohort.add_argument("--histogram-width", type=float, default=0.25, help="CGPA width of the summary histogram bins (default: %(default)s)")
+    cohort.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk (default: %(default)s)")
+    cohort.add_argument("--workers", type=int, default=1, help="Worker processes, 0 for one per core (default: %(default)s)")
+    cohort.add_argument("--scale", default=cgpa_scales.DEFAULT_SCALE, help="Grading scale id or id@version (default: %(default)s)")
+    cohort.add_argument("--json", action="store_true", help="Print --query answers as JSON")
+    cohort.set_defaults(handler=cmd_cohort)
+
+    marks = commands.add_parser("marks", help="Grade raw percentage marks and compute CGPA per student")
+    marks.add_argument("input", nargs="?", default="-", help="Input file (student_id, mark, optional credits and program per course), or - for stdin (default)")
+    marks.add_argument("-o", "--output", default="-", help="Output file, or - for stdout (default)")
+    marks.add_argument("--input-format", choices=sorted(MARK_PARSERS), help="Input format (default: from extension, else csv)")
+    marks.add_argument("--format", choices=sorted(FORMATTERS), help="Output format (default: from extension, else input format)")
+    marks.add_argument("--letters", action="store_true", help="Write each mark row with its letter grade instead of per-student CGPAs")
+    marks.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk (default: %(default)s)")
+    marks.add_argument("--scale", default=cgpa_scales.DEFAULT_SCALE, help="Grading scale id or id@version (default: %(default)s)")
+    marks.set_defaults(handler=cmd_marks)
+
+    transcript = commands.add_parser("transcript", help="Compute CGPA per student from course attempts, counting retakes by a policy")
+    transcript.add_argument("input", nargs="?", default="-", help="Input file (student_id, course, term, grade, optional credits and program per attempt), or - for stdin (default)")
+    transcript.add_argument("-o", "--output", default="-", help="Output file, or - for stdout (default)")
+    transcript.add_argument("--input-format", choices=sorted(TRANSCRIPT_PARSERS), help="Input format (default: from extension, else csv)")
+    transcript.add_argument("--format", choices=sorted(FORMATTERS), help="Output format (default: from extension, else input format)")
+    transcript.add_argument("--retakes", choices=cgpa_model.RETAKE_POLICIES, default="best",
+                            help="Which attempts of a retaken course count (default: %(default)s)")
+    transcript.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk (default: %(default)s)")
+    transcript.add_argument("--scale", default=cgpa_scales.DEFAULT_SCALE, help="Grading scale id or id@version (default: %(default)s)")
+    transcript.set_defaults(handler=cmd_transcript)
+
+    serve = commands.add_parser("serve", help="Local HTTP/JSON service: POST /cgpa and /predict, GET /stats")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: %(default)s)")
+    serve.add_argument("--port", type=int, default=8765, help="Port to listen on (default: %(default)s)")
+    serve.add_argument("--batch-window", type=float, default=2.0, metavar="MS", help="How long a batch collects requests, in milliseconds (default: %(default)s)")
+    serve.add_argument("--max-batch", type=int, default=1024, help="Most requests computed together (default: %(default)s)")
+    serve.add_argument("--max-queue", type=int, default=4096, help="Queued requests per endpoint before clients are held back (default: %(default)s)")
+    serve.add_argument("--queue-timeout", type=float, default=1.0, help="Seconds a request may wait for queue space before a 503 (default: %(default)s)")
+    serve.add_argument("--max-connections", type=int, default=1024, help="Open connections before new ones get a 503 (default: %(default)s)")
+    serve.set_defaults(handler=cmd_serve)
+
+    frontier = commands.add_parser("frontier", help="Final CGPAs still reachable by graduation, for one student or a whole file")
+    frontier.add_argument("--cgpa", help="Current CGPA")
+    frontier.add_argument("--credits", help="Completed credits")
+    frontier.add_argument("--program", help='Program name or abbreviation, e.g. "CSE"')
+    frontier.add_argument("--threshold", help="Report what it takes to graduate with at least this CGPA")
+    frontier.add_argument("--thesis-done", action="store_true", help="The thesis/internship is already among the completed credits")
+    frontier.add_argument("--json", action="store_true", help="Print the result as JSON")
+    frontier.add_argument("--batch", help="Student file in batch format (CSV/JSONL/.cgts), or -, to flag every student instead")
+    frontier.add_argument("-o", "--output", default="-", help="Output file for --batch, or - for stdout (default)")
+    frontier.add_argument("--input-format", choices=sorted(PARSERS) + ["store"], help="Input format for --batch (default: from extension, else csv)")
+    frontier.add_argument("--format", choices=sorted(FRONTIER_FORMATTERS), help="Output format for --batch (default: from extension, else input format)")
+    frontier.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk (default: %(default)s)")
+    frontier.add_argument("--workers", type=int, default=1, help="Worker processes, 0 for one per core (default: %(default)s)")
+    frontier.add_argument("--scale", default=cgpa_scales.DEFAULT_SCALE, help="Grading scale id or id@version (default: %(default)s)")
+    frontier.set_defaults(handler=cmd_frontier)
+
+    pack = commands.add_parser("pack", help="Convert a CSV/JSONL file (default grading scale) into a memory-mapped .cgts store")
+    pack.add_argument("input", nargs="?", default="-", help="Input file, or - for stdin (default)")
+    pack.add_argument("-o", "--output", required=True, help="Store file to write (.cgts)")
+    pack.add_argument("--input-format", choices=sorted(PARSERS), help="Input format (default: from extension, else csv)")
+    pack.add_argument("--transcript", action="store_true",
+                      help="Input is course attempts, as for transcript; the counted attempts and their credits are stored per course")
+    pack.add_argument("--retakes", choices=cgpa_model.RETAKE_POLICIES, default="best",
+                      help="With --transcript, which attempts of a retaken course count (default: %(default)s)")
+    pack.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk (default: %(default)s)")
+    pack.set_defaults(handler=cmd_pack)
+
+    target = commands.add_parser("target", help="Find the least demanding grades that reach a target CGPA")
+    target.add_argument("--cgpa", required=True, help="Current CGPA")
+    target.add_argument("--credits", required=True, help="Completed credits")
+    target.add_argument("--target", required=True, help="Target CGPA")
+    target.add_argument("--plan", required=True, help='Planned course credits, semesters split by "/", e.g. "3,3,3,3/3,3,4"')
+    target.add_argument("--limit", type=int, default=10, help="Maximum number of grade plans to list (default: %(default)s)")
+    target.add_argument("--no-course-limit", action="store_true", help="Allow more than 5 courses per semester")
+    target.add_argument("--json", action="store_true", help="Print plans as JSON")
+    target.set_defaults(handler=cmd_target)
+
+    forecast = commands.add_parser("forecast", help="Distribution of the future CGPA when planned grades are uncertain")
+    forecast.add_argument("--cgpa", help="Current CGPA")
+    forecast.add_argument("--credits", help="Completed credits")
+    forecast.add_argument("--plan", help='Courses as grade distributions, e.g. "A=0.6|B+=0.4,B/A-@4" (semesters split by "/", credits after "@")')
+    forecast.add_argument("--batch", help="JSONL file (or -) of {student_id, cgpa, credits, plan} records to forecast")
+    forecast.add_argument("-o", "--output", default="-", help="Output file for --batch, or - for stdout (default)")
+    forecast.add_argument("--chunk-size", type=int, default=1024, help="Students per chunk for --batch (default: %(default)s)")
+    forecast.add_argument("--mode", choices=("exact", "montecarlo"), default="exact", help="Exact convolution or Monte Carlo (default: %(default)s)")
+    forecast.add_argument("--samples", type=int, help="Monte Carlo samples per student (default: 100000)")
+    forecast.add_argument("--seed", type=int, default=0, help="Monte Carlo seed (default: %(default)s)")
+    forecast.add_argument("--threshold", type=float, action="append", help="Report P(CGPA >= value); repeatable")
+    forecast.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    forecast.set_defaults(handler=cmd_forecast)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); stop quietly
+        sys.stderr.close()
+        return 1
+    except (ValueError, OSError) as e:
+        print(f"cg-calc: error: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,218 @@
+"""Streaming cohort summaries with mergeable sketches.
+
+A CohortSketch takes student totals chunk by chunk and keeps, per program
+(plus one group for rows without a known program):
+
+    histogram   student counts in fixed CGPA bins of 0.001 (4001 bins on a
+                4.0 scale); the bin is floor(CGPA x 1000) computed from the
+                exact integer totals, so float rounding never moves a
+                student into a neighbouring bin
+    moments     count, mean and sum of squared deviations, combined with
+                Chan's parallel update, for the mean and standard deviation
+    no_credits  students with nothing counted yet
+
+Sketches of separate chunks or processes merge by adding histograms and
+combining moments, so the full result is never held or sorted. Percentile
+ranks, quantiles and probation/honors counts are read off the cumulative
+histogram, exact at the 0.001 bin resolution; cumulative sums are cached
+between updates, so a query is a couple of array lookups.
+"""
+
+import math
+
+import numpy as np
+
+from cgpa_engine import SCALE, exact_value
+
+BINS_PER_POINT = 1000
+NO_PROGRAM = "(no program)"
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class CohortSketch:
+    """Per-program CGPA histograms and moments for a stream of students"""
+
+    def __init__(self, scale=SCALE):
+        self.scale = scale
+        self.groups = len(scale.programs) + 1  # Last group: no or unknown program
+        self.bins = max(scale.tenths) * BINS_PER_POINT // 10 + 1
+        self.counts = np.zeros((self.groups, self.bins), dtype=np.int64)
+        self.n = np.zeros(self.groups, dtype=np.int64)
+        self.mean = np.zeros(self.groups)
+        self.m2 = np.zeros(self.groups)
+        self.no_credits = np.zeros(self.groups, dtype=np.int64)
+        self._cumulative = {}
+        self._groups = {}  # Query name -> group index
+
+    # UPDATES
+    def group_codes(self, programs):
+        """Group index per program name; unknown and blank names share the last group"""
+        names, inverse = np.unique(np.asarray(programs, dtype=object).astype(str), return_inverse=True)
+        other = self.groups - 1
+        lookup = np.array([self.scale.program_codes.get(name, other) for name in names.tolist()], dtype=np.int64)
+        return lookup[inverse.ravel()] if len(names) else np.zeros(0, dtype=np.int64)
+
+    def add(self, tenths, credits, groups=None):
+        """Add students given as exact totals (e.g. a batch_totals result); groups from group_codes()"""
+        tenths = np.asarray(tenths, dtype=np.int64)
+        credits = np.asarray(credits, dtype=np.int64)
+        if groups is None:
+            groups = np.full(len(credits), self.groups - 1, dtype=np.int64)
+        groups = np.asarray(groups, dtype=np.int64)
+
+        counted = credits > 0
+        if not counted.all():
+            self.no_credits += np.bincount(groups[~counted], minlength=self.groups)
+            tenths, credits, groups = tenths[counted], credits[counted], groups[counted]
+        if not len(credits):
+            return self
+
+        # floor(CGPA x 1000) = floor(tenths x 100 / credits), in integers
+        bins = np.clip(tenths * (BINS_PER_POINT // 10) // credits, 0, self.bins - 1)
+        self.counts += np.bincount(
+            groups * self.bins + bins, minlength=self.groups * self.bins
+        ).reshape(self.groups, self.bins)
+
+        values = tenths / (10 * credits)
+        n = np.bincount(groups, minlength=self.groups)
+        mean = np.bincount(groups, weights=values, minlength=self.groups) / np.maximum(n, 1)
+        m2 = np.bincount(groups, weights=(values - mean[groups]) ** 2, minlength=self.groups)
+        self._merge_moments(n, mean, m2)
+        return self
+
+    def merge(self, other):
+        """Fold another sketch of the same scale into this one"""
+        if other.scale.key != self.scale.key:
+            raise ValueError(f"Cannot merge sketches of {self.scale.key!r} and {other.scale.key!r}")
+        self.counts += other.counts
+        self.no_credits += other.no_credits
+        self._merge_moments(other.n, other.mean, other.m2)
+        return self
+
+    def _merge_moments(self, n, mean, m2):
+        total = self.n + n
+        safe = np.maximum(total, 1)
+        delta = mean - self.mean
+        self.m2 = self.m2 + m2 + delta ** 2 * self.n * n / safe
+        self.mean = np.where(total > 0, self.mean + delta * n / safe, 0.0)
+        self.n = total
+        self._cumulative.clear()
+
+    # QUERIES
+    def group(self, program):
+        """Group index for a program name or its abbreviation ("CSE"); None means the whole cohort"""
+        if program is None:
+            return None
+        group = self._groups.get(program)
+        if group is None:
+            group = self.groups - 1 if program == NO_PROGRAM else self.scale.program_code(program)
+            self._groups[program] = group
+        return group
+
+    def _cdf(self, group):
+        """Cumulative counts: cdf[k] students have a CGPA below k / 1000"""
+        cdf = self._cumulative.get(group)
+        if cdf is None:
+            counts = self.counts.sum(axis=0) if group is None else self.counts[group]
+            cdf = self._cumulative[group] = np.concatenate(([0], np.cumsum(counts)))
+        return cdf
+
+    def _edge(self, cgpa):
+        """Bin edge of a CGPA, rounded up to the 0.001 resolution"""
+        if isinstance(cgpa, (int, float)):
+            # 3.42 * 1000 is 3419.9999999999995; the slack keeps typed edges exact
+            edge = math.ceil(cgpa * BINS_PER_POINT - 1e-6)
+        else:
+            scaled = exact_value(cgpa) * BINS_PER_POINT
+            edge = -(-scaled.numerator // scaled.denominator)
+        return min(max(edge, 0), self.bins)
+
+    def count(self, program=None):
+        """Students with credits in a program (or the whole cohort)"""
+        return int(self._cdf(self.group(program))[-1])
+
+    def count_below(self, cgpa, program=None):
+        return int(self._cdf(self.group(program))[self._edge(cgpa)])
+
+    def count_at_least(self, cgpa, program=None):
+        cdf = self._cdf(self.group(program))
+        return int(cdf[-1] - cdf[self._edge(cgpa)])
+
+    def percentile_rank(self, cgpa, program=None):
+        """Percentage of students with a lower CGPA, or None for an empty group"""
+        cdf = self._cdf(self.group(program))
+        if not cdf[-1]:
+            return None
+        return 100.0 * int(cdf[self._edge(cgpa)]) / int(cdf[-1])
+
+    def quantile(self, q, program=None):
+        """Lowest CGPA (at 0.001 resolution) with at least a fraction q of students at or below it"""
+        cdf = self._cdf(self.group(program))
+        total = int(cdf[-1])
+        if not total:
+            return None
+        rank = max(math.ceil(q * total), 1)
+        return (int(np.searchsorted(cdf, rank, side="left")) - 1) / BINS_PER_POINT
+
+    def standing_counts(self, program=None, probation=None, honors=None):
+        """Students below the probation CGPA and at or above the honors CGPA (scale defaults)"""
+        probation = self.scale.probation_cgpa if probation is None else probation
+        honors = self.scale.honors_cgpa if honors is None else honors
+        counts = {}
+        if probation is not None:
+            counts["probation"] = self.count_below(probation, program)
+        if honors is not None:
+            counts["honors"] = self.count_at_least(honors, program)
+        return counts
+
+    def histogram(self, width=0.25, program=None):
+        """[lower CGPA, students] pairs for bins of the given width"""
+        step = self._edge(width) or 1
+        group = self.group(program)
+        counts = self.counts.sum(axis=0) if group is None else self.counts[group]
+        return [
+            [start / BINS_PER_POINT, int(counts[start:start + step].sum())]
+            for start in range(0, self.bins, step)
+        ]
+
+    def _moments(self, group):
+        if group is not None:
+            return int(self.n[group]), float(self.mean[group]), float(self.m2[group])
+        total = int(self.n.sum())
+        if not total:
+            return 0, 0.0, 0.0
+        mean = float((self.n * self.mean).sum() / total)
+        return total, mean, float(self.m2.sum() + (self.n * (self.mean - mean) ** 2).sum())
+
+    def describe(self, program=None, percentiles=DEFAULT_PERCENTILES, histogram_width=0.25):
+        """Summary dict of one program (or the whole cohort)"""
+        group = self.group(program)
+        n, mean, m2 = self._moments(group)
+        no_credits = int(self.no_credits.sum() if group is None else self.no_credits[group])
+        summary = {"students": n, "no_credits": no_credits}
+        if n:
+            counts = self.counts.sum(axis=0) if group is None else self.counts[group]
+            filled = np.flatnonzero(counts)
+            summary.update({
+                "mean": mean,
+                "std": math.sqrt(m2 / n),
+                "min": filled[0] / BINS_PER_POINT,
+                "max": filled[-1] / BINS_PER_POINT,
+                "percentiles": {str(p): self.quantile(p / 100, program) for p in percentiles},
+                **self.standing_counts(program),
+                "histogram": self.histogram(histogram_width, program),
+            })
+        return summary
+
+    def summary(self, percentiles=DEFAULT_PERCENTILES, histogram_width=0.25):
+        """describe() for the whole cohort and every program that has students"""
+        programs = {}
+        for code, name in enumerate(self.scale.programs + (NO_PROGRAM,)):
+            if self.n[code] or self.no_credits[code]:
+                programs[name] = self.describe(name, percentiles, histogram_width)
+        return {
+            "scale": self.scale.key,
+            "bin_width": 1 / BINS_PER_POINT,
+            "cohort": self.describe(None, percentiles, histogram_width),
+            "programs": programs,
+        }
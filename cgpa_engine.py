@@ -0,0 +1,161 @@
+"""Headless CGPA engine shared by the GUI and the batch tools.
+
+Nothing in here touches tkinter: grade histograms and plans go in as plain
+Python data, totals and CGPAs come out.
+
+Every grade point is a multiple of 0.1 and credits are whole numbers, so
+totals are kept exactly as integer "tenths" (grade points x 10 x credits).
+A CGPA only becomes a float or a decimal string at the very end: cgpa()
+does one correctly rounded division and format_cgpa() rounds the exact
+ratio, which is what the GUI, the CLI and the batch paths all share.
+"""
+
+from fractions import Fraction
+
+import cgpa_scales
+
+# Grading scale and program catalog, compiled from catalogs/ (see cgpa_scales)
+SCALE = cgpa_scales.get_scale(cgpa_scales.DEFAULT_SCALE)
+
+GRADES = SCALE.grade_points()
+PROGRAMS = SCALE.program_catalog()
+
+# Grade points as integer tenths, e.g. "B+" -> 33
+GRADE_TENTHS = dict(zip(SCALE.letters, SCALE.tenths))
+
+COURSE_CREDITS = SCALE.course_credits  # Every counted course carries the same credits (3 at BRACU)
+THESIS_CREDITS = SCALE.thesis_credits  # Thesis/internship credits (4 at BRACU)
+MAX_COURSES_PER_SEMESTER = SCALE.max_courses_per_semester
+CGPA_DECIMALS = 5
+
+
+def parse_count(value):
+    """Parse a course count, treating blanks and junk as zero"""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip() or 0)
+    except ValueError:
+        return 0
+
+
+def exact_value(value):
+    """Exact rational for a CGPA or credit figure given as str/int/float/Fraction"""
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    if isinstance(value, str):
+        value = value.strip()
+    return Fraction(value)
+
+
+def parse_credits(value):
+    """Whole-number credits from user input"""
+    try:
+        credits = exact_value(value)
+    except (TypeError, ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid credits {value!r}") from None
+    if credits.denominator != 1 or credits < 0:
+        raise ValueError(f"Credits must be whole numbers, got {value!r}")
+    return int(credits)
+
+
+def grade_totals(grade_counts, thesis_grade=None):
+    """Sum tenths, credits and courses from a grade -> course count mapping"""
+    totals = {"tenths": 0, "credits": 0, "courses": 0}
+
+    # Calculate regular courses
+    for letter, count in grade_counts.items():
+        count = parse_count(count)
+        if count > 0:
+            totals["courses"] += count
+            totals["credits"] += count * COURSE_CREDITS
+            totals["tenths"] += GRADE_TENTHS[letter] * count * COURSE_CREDITS
+
+    # Add thesis if included
+    if thesis_grade:
+        totals["credits"] += THESIS_CREDITS
+        totals["tenths"] += GRADE_TENTHS[thesis_grade] * THESIS_CREDITS
+
+    return totals
+
+
+def standing(current_cgpa, current_credits):
+    """Totals for a CGPA/credits pair typed in by hand
+
+    The tenths are exact, so they are a Fraction whenever the CGPA has
+    more decimals than the credits can account for.
+    """
+    credits = parse_credits(current_credits)
+    tenths = exact_value(current_cgpa) * credits * 10
+    if tenths.denominator == 1:
+        tenths = int(tenths)
+    return {"tenths": tenths, "credits": credits, "courses": 0}
+
+
+def cgpa(totals):
+    """CGPA for a totals dict, or None when no credits are counted
+
+    int / int (and float() of a Fraction) is correctly rounded, so this is
+    bit-for-bit the same float the NumPy batch path produces.
+    """
+    if totals["credits"] > 0:
+        return float(totals["tenths"] / (10 * totals["credits"]))
+    return None
+
+
+def exact_cgpa(totals):
+    """Exact CGPA of a totals dict as a Fraction, or None without credits"""
+    if totals["credits"] > 0:
+        return Fraction(totals["tenths"]) / (10 * totals["credits"])
+    return None
+
+
+def format_cgpa(totals, decimals=CGPA_DECIMALS):
+    """Exact CGPA rounded half-up to a fixed number of decimals, for display"""
+    value = exact_cgpa(totals)
+    if value is None:
+        return ""
+    scaled = value * 10 ** decimals
+    rounded = (2 * scaled.numerator + scaled.denominator) // (2 * scaled.denominator)
+    whole, fraction = divmod(rounded, 10 ** decimals)
+    return f"{whole}.{fraction:0{decimals}d}"
+
+
+def plan_totals(current, semesters):
+    """Fold planned semesters of (grade, credits) pairs onto current totals"""
+    totals = {
+        "tenths": current["tenths"],
+        "credits": current["credits"],
+        "courses": current["courses"],
+    }
+    for courses in semesters:
+        for grade, credits in courses:
+            credits = parse_credits(credits)
+            totals["courses"] += 1
+            totals["credits"] += credits
+            totals["tenths"] += GRADE_TENTHS[grade] * credits
+    return totals
+
+
+def future_totals(current, semesters):
+    """Totals after all planned semesters, or None when the plan adds no credits"""
+    totals = plan_totals(current, semesters)
+    if totals["credits"] > current["credits"]:
+        return totals
+    return None
+
+
+def trajectory(current, semesters):
+    """Totals after each planned semester in turn (running prefix sums of plan_totals)"""
+    totals, after = current, []
+    for courses in semesters:
+        totals = plan_totals(totals, [courses])
+        after.append(totals)
+    return after
+
+
+def program_requirement(program):
+    """Required credits and regular course count for a program"""
+    info = PROGRAMS[program]
+    regular_courses = (info["credits"] - THESIS_CREDITS) / COURSE_CREDITS
+    return info["credits"], int(regular_courses)
@@ -0,0 +1,194 @@
+"""Future-CGPA distributions for plans with uncertain grades.
+
+Each planned course carries a probability distribution over GRADES
+letters instead of a single letter. Two modes give the distribution of
+the CGPA after the plan:
+
+    exact        convolves per-course distributions over integer
+                 tenth-point totals (grade points x 10 x credits)
+    montecarlo   draws seeded samples for every course at once with NumPy
+
+A course spec is a letter ("B+"), a {letter: probability} mapping, or a
+{"grades": {letter: probability}, "credits": n} mapping; credits default
+to 3.
+"""
+
+import numpy as np
+
+import cgpa_engine
+from cgpa_engine import COURSE_CREDITS, GRADES, exact_value
+from cgpa_planner import required_tenths
+
+GRADE_LETTERS = tuple(GRADES.keys())
+GRADE_TENTHS = np.array([cgpa_engine.GRADE_TENTHS[letter] for letter in GRADE_LETTERS], dtype=np.int64)
+MAX_TENTHS = int(GRADE_TENTHS.max())
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_THRESHOLDS = (2.0, 3.0, 3.5)
+
+
+def parse_course(spec):
+    """(probability vector over GRADE_LETTERS, credits) for a course spec"""
+    credits = COURSE_CREDITS
+    grades = spec
+    if isinstance(spec, dict) and "grades" in spec:
+        grades = spec["grades"]
+        credits = spec.get("credits", COURSE_CREDITS)
+    if isinstance(grades, str):
+        grades = {grades: 1.0}
+
+    probs = np.zeros(len(GRADE_LETTERS), dtype=np.float64)
+    for letter, probability in grades.items():
+        if letter not in GRADES:
+            raise ValueError(f"Unknown grade {letter!r}")
+        if probability < 0:
+            raise ValueError(f"Negative probability for {letter}")
+        probs[GRADE_LETTERS.index(letter)] += probability
+    if probs.sum() <= 0:
+        raise ValueError("A course needs at least one grade with positive probability")
+
+    credits = cgpa_engine.parse_credits(credits)
+    if credits <= 0:
+        raise ValueError("Course credits must be positive")
+    return probs / probs.sum(), credits
+
+
+def parse_plan(semesters):
+    """Flatten semesters of course specs into (probs matrix, credits vector)"""
+    courses = [parse_course(spec) for semester in semesters for spec in semester]
+    if not courses:
+        raise ValueError("Add future courses to forecast")
+    probs, credits = zip(*courses)
+    return np.array(probs), np.array(credits, dtype=np.int64)
+
+
+def _course_levels(course_probs, course_credits):
+    """Distinct (contribution, probability) pairs with non-zero probability, ascending"""
+    merged = np.bincount(GRADE_TENTHS, weights=course_probs)
+    values = np.flatnonzero(merged)
+    return values * course_credits, merged[values]
+
+
+def total_distribution(probs, credits):
+    """Exact distribution of the plan total: p[s] = P(sum of tenths x credits = s)
+
+    Each course adds a handful of shifted copies of the running
+    distribution (one per grade it can take), which is much cheaper than
+    a dense convolution with a kernel spanning every tenth-point.
+    """
+    dist = np.ones(1)
+    for course_probs, course_credits in zip(probs, credits):
+        values, level_probs = _course_levels(course_probs, course_credits)
+        new = np.zeros(len(dist) + values[-1])
+        for value, probability in zip(values.tolist(), level_probs.tolist()):
+            new[value:value + len(dist)] += probability * dist
+        dist = new
+    return dist
+
+
+def _summary(cgpa_values, probs, thresholds_hit, percentiles, mode):
+    """Summary dict from a discrete distribution (values ascending)"""
+    cdf = np.cumsum(probs)
+    cdf /= cdf[-1]
+    mean = float(np.dot(cgpa_values, probs) / probs.sum())
+    variance = float(np.dot((cgpa_values - mean) ** 2, probs) / probs.sum())
+    return {
+        "mode": mode,
+        "mean": mean,
+        "std": variance ** 0.5,
+        "min": float(cgpa_values[np.argmax(probs > 0)]),
+        "max": float(cgpa_values[len(probs) - 1 - np.argmax(probs[::-1] > 0)]),
+        "percentiles": {
+            q: float(cgpa_values[min(np.searchsorted(cdf, q / 100 - 1e-12), len(cdf) - 1)])
+            for q in percentiles
+        },
+        "p_at_least": thresholds_hit,
+    }
+
+
+def exact_forecast(current_cgpa, current_credits, semesters,
+                   thresholds=DEFAULT_THRESHOLDS, percentiles=DEFAULT_PERCENTILES):
+    """CGPA distribution after the plan by exact convolution"""
+    probs, credits = parse_plan(semesters)
+    dist = total_distribution(probs, credits)
+
+    base = float(exact_value(current_cgpa) * exact_value(current_credits) * 10)
+    total_credits = float(current_credits) + int(credits.sum())
+    cgpa_values = (base + np.arange(len(dist))) / (total_credits * 10)
+
+    tail = np.cumsum(dist[::-1])[::-1]  # tail[s] = P(total >= s)
+    hit = {}
+    for threshold in thresholds:
+        needed = required_tenths(current_cgpa, current_credits, threshold, credits.tolist())
+        hit[threshold] = float(min(tail[needed], 1.0)) if needed < len(tail) else 0.0
+    return _summary(cgpa_values, dist, hit, percentiles, "exact")
+
+
+def sample_totals(probs, credits, samples, rng):
+    """Monte Carlo draws of the plan total, one vectorized draw per course
+
+    A uniform draw u lands on a course's k-th possible grade when it passes
+    the first k cumulative probabilities, so the drawn contribution is the
+    lowest value plus one step for every cumulative cut-off below u.
+    """
+    totals = np.zeros(samples, dtype=np.int64)
+    for course_probs, course_credits in zip(probs, credits):
+        values, level_probs = _course_levels(course_probs, course_credits)
+        totals += values[0]
+        if len(values) > 1:
+            draws = rng.random(samples)
+            cutoffs = np.cumsum(level_probs)[:-1] / level_probs.sum()
+            for cutoff, step in zip(cutoffs.tolist(), np.diff(values).tolist()):
+                totals += (draws >= cutoff) * step
+    return totals
+
+
+def monte_carlo_forecast(current_cgpa, current_credits, semesters, samples=100000, seed=0,
+                         thresholds=DEFAULT_THRESHOLDS, percentiles=DEFAULT_PERCENTILES):
+    """CGPA distribution after the plan from seeded Monte Carlo samples"""
+    probs, credits = parse_plan(semesters)
+    rng = np.random.default_rng(seed)
+    totals = sample_totals(probs, credits, samples, rng)
+
+    base = float(exact_value(current_cgpa) * exact_value(current_credits) * 10)
+    total_credits = float(current_credits) + int(credits.sum())
+    counts = np.bincount(totals)
+    cgpa_values = (base + np.arange(len(counts))) / (total_credits * 10)
+
+    hit = {}
+    for threshold in thresholds:
+        needed = required_tenths(current_cgpa, current_credits, threshold, credits.tolist())
+        hit[threshold] = float(np.count_nonzero(totals >= needed) / samples)
+    summary = _summary(cgpa_values, counts.astype(np.float64), hit, percentiles, "montecarlo")
+    summary["samples"] = samples
+    return summary
+
+
+def forecast(current_cgpa, current_credits, semesters, mode="exact", **options):
+    """Distribution summary of the future CGPA in the chosen mode"""
+    if mode == "exact":
+        options.pop("samples", None)
+        options.pop("seed", None)
+        return exact_forecast(current_cgpa, current_credits, semesters, **options)
+    if mode == "montecarlo":
+        return monte_carlo_forecast(current_cgpa, current_credits, semesters, **options)
+    raise ValueError(f"Unknown forecast mode {mode!r}")
+
+
+def forecast_batch(students, mode="exact", first_index=0, **options):
+    """Forecast many students; each is a (current_cgpa, current_credits, semesters) tuple
+
+    Students are forecast one at a time; each forecast is already
+    vectorized over its courses (exact) or samples (Monte Carlo), and plans
+    differ too much in length and credits to share one padded convolution.
+    Monte Carlo runs use one generator per student seeded from the batch
+    seed and the student's position (first_index for the first one), so
+    results do not depend on how a cohort is split into chunks.
+    """
+    seed = options.pop("seed", 0)
+    results = []
+    for index, (current_cgpa, current_credits, semesters) in enumerate(students, first_index):
+        if mode == "montecarlo":
+            options["seed"] = (seed, index)
+        results.append(forecast(current_cgpa, current_credits, semesters, mode, **options))
+    return results
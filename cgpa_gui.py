@@ -0,0 +1,1351 @@
+"""Tkinter calculator window; started by cg-calc.py when it gets no command"""
+
+import bisect
+import contextlib
+import functools
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import cgpa_cache
+import cgpa_engine
+import cgpa_model
+import cgpa_planner
+from cgpa_engine import GRADES, PROGRAMS
+
+# Style configurations
+COLORS = {
+    "primary": "#2c3e50",  # Dark blue-gray
+    "secondary": "#3498db",  # Blue
+    "background": "#ecf0f1",  # Light gray
+    "text": "#2c3e50",  # Dark blue-gray
+    "error": "#e74c3c",  # Red
+    "success": "#27ae60",  # Green
+}
+
+FONTS = {
+    "AppName": ("Helvetica", 16, "bold"),
+    "header": ("Helvetica", 14, "bold"),
+    "subheader": ("Helvetica", 12, "bold"),
+    "normal": ("Helvetica", 10),
+    "normal-bold": ("Helvetica", 10, "bold"),
+    "small": ("Helvetica", 9),
+    "result": ("Helvetica", 14, "bold"),
+}
+
+
+class _LazyMessagebox:
+    """tkinter.messagebox, imported the first time a dialog is shown"""
+
+    def __getattr__(self, name):
+        from tkinter import messagebox
+        return getattr(messagebox, name)
+
+
+messagebox = _LazyMessagebox()
+
+
+class StartupProfile:
+    """Phase timings from process start to an interactive window (--startup-profile)"""
+
+    def __init__(self, started):
+        self.started = started
+        self.phases = []  # (depth, name, seconds) in start order
+        self._depth = 0
+
+    def mark(self, name, since):
+        """Record a top-level phase that began at perf_counter() value since"""
+        self.phases.append((0, name, time.perf_counter() - since))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a block; phases opened inside it are reported nested under it"""
+        index = len(self.phases)
+        self.phases.append(None)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.phases[index] = (self._depth, name, time.perf_counter() - start)
+
+    def report(self, stream=sys.stderr):
+        for depth, name, seconds in self.phases:
+            print(f"{'  ' * depth}{name:<{36 - 2 * depth}} {seconds * 1000:8.1f} ms", file=stream)
+        print(f"{'time to interactive':<36} {(time.perf_counter() - self.started) * 1000:8.1f} ms", file=stream)
+
+
+class RuntimeProfile:
+    """Callback timings and event-loop stalls while the window is in use (--runtime-profile)
+
+    Instrumented callbacks report their run time; a heartbeat scheduled
+    with after() measures how late each beat fires, which is how long the
+    event loop was blocked. Every report_every seconds (and on close) a
+    snapshot with live widget and Tcl variable counts is appended as one
+    JSON line to a size-rotated stats file.
+    """
+
+    def __init__(self, path, interval=0.1, report_every=10.0, stall=0.05, max_bytes=1 << 20, backups=3):
+        import logging
+        import logging.handlers
+
+        self.interval = interval
+        self.report_every = report_every
+        self.stall = stall  # A beat this late counts as a stall
+        self._due = None
+        self._reset()
+
+        self.log = logging.getLogger(f"cg-calc.profile.{path}")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.log.addHandler(handler)
+
+    def _reset(self):
+        self.callbacks = {}  # name -> [calls, total seconds, slowest]
+        self.beats = {"count": 0, "stalls": 0, "stalled_seconds": 0.0, "worst": 0.0}
+        self._last_report = time.perf_counter()
+
+    def record(self, name, seconds):
+        stats = self.callbacks.get(name)
+        if stats is None:
+            stats = self.callbacks[name] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+
+    def start(self, calculator):
+        self.calculator = calculator
+        self._beat()
+
+    def _beat(self):
+        now = time.perf_counter()
+        if self._due is not None:
+            late = max(now - self._due, 0.0)
+            beats = self.beats
+            beats["count"] += 1
+            beats["worst"] = max(beats["worst"], late)
+            if late >= self.stall:
+                beats["stalls"] += 1
+                beats["stalled_seconds"] += late
+        if now - self._last_report >= self.report_every:
+            self.write()
+        self._due = time.perf_counter() + self.interval
+        self.calculator.app.after(int(self.interval * 1000), self._beat)
+
+    def snapshot(self):
+        """Counters since the last snapshot, plus the window's current size"""
+        app = self.calculator.app
+        widgets, pending = 0, [app]
+        while pending:
+            children = pending.pop().winfo_children()
+            widgets += len(children)
+            pending.extend(children)
+        variables = sum(1 for name in app.tk.call("info", "globals") if str(name).startswith("PY_VAR"))
+        return {
+            "time": time.time(),
+            "callbacks": {
+                name: {"calls": calls, "total_ms": total * 1000, "max_ms": slowest * 1000}
+                for name, (calls, total, slowest) in sorted(self.callbacks.items())
+            },
+            "event_loop": {
+                "beats": self.beats["count"], "stalls": self.beats["stalls"],
+                "stalled_ms": self.beats["stalled_seconds"] * 1000, "worst_ms": self.beats["worst"] * 1000,
+            },
+            "widgets": widgets,
+            "tcl_variables": variables,
+            "semesters": len(self.calculator.plan),
+            "list_lines": self.calculator.tracking["line_count"],
+            "pooled_rows": {kind: len(rows) for kind, rows in self.calculator.semester_rows.items()},
+            "caches": cgpa_cache.cache_stats(),
+        }
+
+    def write(self):
+        import json
+
+        self.log.info(json.dumps(self.snapshot()))
+        self._reset()
+
+    def close(self):
+        self.write()
+        for handler in self.log.handlers[:]:
+            handler.close()
+            self.log.removeHandler(handler)
+
+
+def instrumented(method):
+    """Report a callback's run time when the window runs with a RuntimeProfile"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.runtime is None:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.runtime.record(method.__name__, time.perf_counter() - start)
+    return wrapper
+
+
+def profiled(method):
+    """Time a SETUP_* method when the window runs with a StartupProfile"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._phase(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# Semester list geometry: every line (header, course, Add Course) is one row
+LINE_HEIGHT = 34
+SEMESTER_WIDTH = 430
+
+
+class CGPACalculator:
+    def __init__(self, profile=None, runtime=None):
+        self.profile = profile  # StartupProfile, or None outside --startup-profile
+        self.runtime = runtime  # RuntimeProfile, or None outside --runtime-profile
+
+        with self._phase("Tk init"):
+            self.app = tk.Tk()
+            self.app.title("CGPA Calculator")
+            self.app.geometry("960x780") # Set window size
+            self.app.resizable(False, False) # Make window non-resizable
+            # Add icon to window
+            try:
+                self.app.iconbitmap("app_icon.ico")
+            except tk.TclError:
+                pass  # Icon file not found, use default
+
+            self.app.configure(bg=COLORS["background"])
+
+            # Create style for ttk widgets
+            self.style = ttk.Style()
+            self.style.configure("Custom.TCombobox", padding=5)
+            self.style.configure("Custom.TButton", padding=5)
+
+        # Program selection variables
+        self.selected_program = tk.StringVar()
+
+        # Grade input options
+        self.grade_rows = []
+
+        # Thesis related variables
+        self.thesis_grade = tk.StringVar()
+
+        # Display variables
+        self.calculate_future_btn = None  # To store the calculate future button
+        self.prediction_frame = None  # Right pane, filled in after the first frame
+        self.prediction_ready = False
+        
+        self.manual_cgpa = tk.StringVar()
+        self.plan = cgpa_model.Plan()  # Future semesters; plain data, no Tk variables
+        self.semester_rows = {"header": [], "course": [], "footer": []}  # Pooled list row widgets by line kind
+        self.target_cgpa = tk.StringVar()
+        self.thesis_frame = None
+        
+        # Consolidate tracking variables
+        self.tracking = {
+            "current_cgpa": None,
+            "current_totals": None,
+            "line_starts": [],  # First list line of each semester
+            "line_count": 0
+        }
+
+        # Writes and recalculations waiting for the next idle flush
+        self.pending = {
+            "writes": {},  # Tcl variable name -> (variable, value)
+            "calls": {},  # key -> callable, each run once per flush
+            "flush_id": None,
+        }
+        
+        # Consolidate state variables
+        self.state = {
+            "manual_input_enabled": tk.BooleanVar(value=False),
+            "unlimited_courses": tk.BooleanVar(value=False),
+            "include_thesis": tk.BooleanVar(),
+            "error_var": tk.StringVar(),
+            "program_info_var": tk.StringVar()
+        }
+        
+        # Consolidate result variables
+        self.results = {
+            "current_result": tk.StringVar(value="Calculated CGPA: ---"),
+            "future_result": tk.StringVar(value="Future CGPA: ---"),
+            "total_credits": tk.StringVar(),
+            "total_course_count": tk.StringVar()
+        }
+
+        # Add tooltip text
+        self.thesis_tooltip = "Enable thesis/internship checkbox to input grade"
+
+        # Add calculator variables
+        self.grade_counts = {grade: tk.StringVar(value="0") for grade in GRADES.keys()}
+
+        self.SETUP_model()
+        self.SETUP_UI()
+        self.init_done = time.perf_counter()
+
+    def _phase(self, name):
+        return self.profile.phase(name) if self.profile else contextlib.nullcontext()
+
+    # STATE MODEL
+    @profiled
+    def SETUP_model(self):
+        """Dependency graph between the inputs and everything derived from them"""
+        self.grade_totals = cgpa_model.GradeTotals()
+        self.model = cgpa_model.Reactive()
+
+        self.model.define_input("grades", self.grade_totals)
+        self.model.define_input("include_thesis", False)
+        self.model.define_input("thesis_grade", "")
+        self.model.define_input("program", "")
+        self.model.define_input("standing", None)
+        self.model.define_input("semesters", self.plan)
+
+        self.model.define("course_summary", self._course_summary, ["grades", "include_thesis"])
+        self.model.define("current_totals", self._current_totals, ["grades", "include_thesis", "thesis_grade"])
+        self.model.define("program_info", self._program_info_text, ["program", "current_totals", "include_thesis"])
+        self.model.define("future_totals", self._future_totals, ["standing", "semesters"])
+
+        self.model.subscribe("program_info", self.update_program_info)
+        self.model.subscribe("course_summary", self.update_course_count)
+        self.model.subscribe("standing", lambda standing: self._call_later("trajectory", self._update_trajectory))
+
+        # Tk variables only feed the model; each write is O(1)
+        for letter, var in self.grade_counts.items():
+            var.trace_add("write", lambda *args, letter=letter: self._on_grade_count(letter))
+        self.selected_program.trace_add(
+            "write", lambda *args: self.model.set("program", self.selected_program.get())
+        )
+        self.state["include_thesis"].trace_add(
+            "write", lambda *args: self.model.set("include_thesis", self.state["include_thesis"].get())
+        )
+        self.thesis_grade.trace_add("write", self._on_thesis_grade)
+    # DEFERRED UPDATES
+    def _set_later(self, var, value):
+        """Queue a Tk variable write for the next idle flush (last write wins)"""
+        self.pending["writes"][str(var)] = (var, value)
+        self._schedule_flush()
+    def _call_later(self, key, func):
+        """Run func once at the next idle flush, however often it is requested"""
+        self.pending["calls"][key] = func
+        self._schedule_flush()
+    def _schedule_flush(self):
+        if self.pending["flush_id"] is None:
+            self.pending["flush_id"] = self.app.after_idle(self._flush)
+    @instrumented
+    def _flush(self):
+        """Run queued recalculations, then push all queued label writes in one go"""
+        self.pending["flush_id"] = None
+        calls, self.pending["calls"] = self.pending["calls"], {}
+        for func in calls.values():
+            func()
+        writes, self.pending["writes"] = self.pending["writes"], {}
+        for var, value in writes.values():
+            if var.get() != value:
+                var.set(value)
+    def _on_grade_count(self, letter):
+        if self.grade_totals.set_count(letter, self.grade_counts[letter].get()):
+            self.model.touch("grades")
+    def _on_thesis_grade(self, *args):
+        self.model.set("thesis_grade", self.thesis_grade.get())
+        self._call_later("calculate_cgpa", lambda: self.calculate_cgpa(quiet=True))
+    @staticmethod
+    def _program_info_text(program, totals, include_thesis):
+        if program not in PROGRAMS:
+            return ""
+        credits, regular_courses = cgpa_engine.program_requirement(program)
+        text = (
+            f"Program requirement: {credits} credits "
+            f"({regular_courses} regular courses + thesis/internship)"
+        )
+        if totals and totals["credits"]:
+            worst, best = cgpa_planner.graduation_range(totals, program, thesis_done=bool(include_thesis))
+            text += f"\nReachable at graduation: {cgpa_engine.format_cgpa(worst)} to {cgpa_engine.format_cgpa(best)}"
+        return text
+    @staticmethod
+    def _course_summary(grades, include_thesis):
+        """(courses, credits, thesis included) shown under the grade grid"""
+        credits = grades.credits + (cgpa_engine.THESIS_CREDITS if include_thesis else 0)
+        return grades.courses, credits, bool(include_thesis)
+    @staticmethod
+    def _current_totals(grades, include_thesis, thesis_grade):
+        return grades.totals(thesis_grade if include_thesis and thesis_grade else None)
+    @staticmethod
+    def _future_totals(standing, plan):
+        # Plans recur while comparing options, so their totals come from the cache
+        return cgpa_cache.future_totals_for_key(standing, plan.key())
+
+    # FULL UI SETUP
+    @profiled
+    def SETUP_UI(self):
+        # Main container with padding
+        main_frame = tk.Frame(self.app, bg=COLORS["background"], padx=20, pady=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Split into left and right frames with clear separation
+
+        left_frame = tk.Frame(main_frame, bg=COLORS["background"], width=450)
+        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        left_frame.pack_propagate(False)  # Maintain width
+
+        separator = ttk.Separator(main_frame, orient="vertical")
+        separator.pack(side=tk.LEFT, fill=tk.Y, padx=10)
+        
+        right_frame = tk.Frame(main_frame, bg=COLORS["background"], width=450)
+        right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        right_frame.pack_propagate(False)  # Maintain width
+
+        self.SETUP_left_frame(left_frame)
+
+        # The prediction pane is built once the window is on screen
+        self.prediction_frame = right_frame
+        self.app.bind("<Map>", self._on_first_map, add="+")
+    def _on_first_map(self, event):
+        if event.widget is not self.app or self.prediction_ready:
+            return
+        self.prediction_ready = True
+        if self.profile:
+            self.profile.mark("first frame", self.init_done)
+        self.app.after_idle(self._build_prediction_pane)
+    def _build_prediction_pane(self):
+        self.SETUP_right_frame(self.prediction_frame)
+        if self.profile:
+            self.profile.report()
+            self.app.after_idle(self.app.destroy)
+    @profiled
+    def SETUP_left_frame(self, parent):
+
+        # Header & Instructions frame
+        self.SETUP_instruction_frame(parent)
+
+        # Degree selection frame
+        self.SETUP_degree_frame(parent)
+
+        # Include Thesis frame
+        self.SETUP_thesis_section(parent)
+
+        # BRACU Grading scale information frame
+        self.SETUP_gradeInfo_frame(parent)
+
+        # Grade count input section Frame
+        self.SETUP_gradeInput_grid(parent)
+
+        # Calculate button and Result display
+        self.SETUP_result_frame(parent)
+    @profiled
+    def SETUP_right_frame(self, parent):
+        # Header
+        tk.Label(
+            parent,
+            text="Future CGPA Prediction",
+            font=FONTS["AppName"],
+            bg=COLORS["background"],
+            fg=COLORS["secondary"],
+        ).pack(pady=10)
+
+        # Manual input frame
+        self.SETUP_ManualInput_frame(parent)
+
+        # Add semester button and course limit toggle
+        semester_controls = tk.Frame(parent, bg=COLORS["background"])
+        semester_controls.pack(pady=5)
+
+        tk.Button(
+            semester_controls,
+            text="Add New Semester",
+            command=self.add_semester_box,
+            bg=COLORS["secondary"],
+            fg="white",
+            font=FONTS["normal-bold"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        tk.Checkbutton(
+            semester_controls,
+            text="No course limit",
+            variable=self.state["unlimited_courses"],
+            command=self.toggle_unlimited_courses,
+            bg=COLORS["background"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Semester container
+        self.SETUP_scrollable_semester_frame(parent)
+
+        # Calculate button
+        self.calculate_future_btn = tk.Button(
+            parent,
+            text="Calculate Future CGPA",
+            command=self.calculate_all_semesters,
+            font=FONTS["normal-bold"],
+            bg=COLORS["secondary"],
+            fg="white",
+        )
+        self.calculate_future_btn.pack(pady=5)
+
+        # Target CGPA solver
+        target_frame = tk.Frame(parent, bg=COLORS["background"])
+        target_frame.pack(pady=2)
+
+        tk.Label(
+            target_frame,
+            text="Target CGPA:",
+            font=FONTS["normal-bold"],
+            bg=COLORS["background"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        tk.Entry(
+            target_frame,
+            textvariable=self.target_cgpa,
+            width=6,
+            justify="center",
+            font=FONTS["normal"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        tk.Button(
+            target_frame,
+            text="Find Required Grades",
+            command=self.solve_target_cgpa,
+            font=FONTS["normal-bold"],
+            bg=COLORS["secondary"],
+            fg="white",
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Future CGPA display
+        tk.Label(
+            parent,
+            textvariable=self.results["future_result"],
+            font=FONTS["result"],
+            bg=COLORS["background"],
+            fg=COLORS["secondary"],
+        ).pack(pady=8)
+
+        # Clear All button at bottom right
+        tk.Button(
+            parent,
+            text="Clear All",
+            command=self.clear_all,
+            font=FONTS["normal-bold"],
+            bg=COLORS["error"],
+            fg="white",
+        ).pack(side=tk.BOTTOM, anchor=tk.SE, padx=10, pady=5)
+    
+    # LEFT FRAMES
+    @profiled
+    def SETUP_instruction_frame(self, parent):
+        # Add header for current CGPA section
+        tk.Label(
+            parent,
+            text="Current CGPA Calculator",
+            font=FONTS["AppName"],
+            bg=COLORS["background"],
+            fg=COLORS["primary"],
+        ).pack(pady=5)
+
+        # Add instructions
+        instruction_frame = tk.Frame(parent, bg=COLORS["background"], relief="groove", borderwidth=1)
+        instruction_frame.pack(fill=tk.X, pady=10, padx=5)
+        
+        tk.Label(
+            instruction_frame,
+            text="Calculate Your Current CGPA Upto 5 Decimal Accuracy",
+            font=FONTS["subheader"],
+            bg=COLORS["background"],
+            fg=COLORS["primary"],
+        ).pack(pady=(5,0))
+        
+        tk.Label(
+            instruction_frame,
+            text="1. Select a degree from dropdown to see credit details\n2. Input below the number of courses you got each respected grade\n3. Include thesis/internship grade if completed",
+            font=FONTS["normal"],
+            bg=COLORS["background"],
+            fg=COLORS["text"],
+            justify="left",
+        ).pack(pady=5)
+    @profiled
+    def SETUP_degree_frame(self, parent):
+        degree_frame = tk.Frame(parent, bg=COLORS["background"])
+        degree_frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(
+            degree_frame,
+            text="Undergrad Degree Details:",
+            font=FONTS["normal-bold"],
+            bg=COLORS["background"],
+            fg=COLORS["primary"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Degree selector dropdown
+        degree_selector = ttk.Combobox(
+            degree_frame,
+            values=list(PROGRAMS.keys()),
+            textvariable=self.selected_program,
+            width=40,
+            state="readonly",
+        )
+        degree_selector.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+
+        # Degree info display
+        tk.Label(
+            parent,
+            textvariable=self.state["program_info_var"],
+            font=FONTS["normal"],
+            bg=COLORS["background"],
+            fg=COLORS["secondary"],
+        ).pack(pady=5)
+    @profiled
+    def SETUP_thesis_section(self, parent):
+        self.thesis_frame = tk.Frame(parent, bg=COLORS["background"])
+        self.thesis_frame.pack(fill=tk.BOTH, pady=5)
+
+        # Thesis label and grade selector
+        tk.Label(
+            self.thesis_frame,
+            text="Thesis Grade:",
+            font=FONTS["normal"],
+            bg=COLORS["background"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        grade_selector = ttk.Combobox(
+            self.thesis_frame,
+            values=list(GRADES.keys()),
+            textvariable=self.thesis_grade,
+            width=5,
+            state="disabled",  # Initially disabled
+            style="Custom.TCombobox",
+        )
+        grade_selector.pack(side=tk.LEFT, padx=5)
+
+        tk.Checkbutton(
+            self.thesis_frame,
+            text="Include (4 Credits)",
+            variable=self.state["include_thesis"],
+            bg=COLORS["background"],
+            command=self.toggle_thesis,
+        ).pack(side=tk.LEFT, padx=5)
+    @profiled
+    def SETUP_gradeInfo_frame(self, parent):
+        info_frame = tk.Frame(
+            parent, bg=COLORS["background"], relief="groove", borderwidth=1
+        )
+        info_frame.pack(fill=tk.X, pady=10)
+
+        tk.Label(
+            info_frame,
+            text=f"Grading Scale ({cgpa_engine.SCALE.title})",
+            font=FONTS["subheader"],
+            bg=COLORS["background"],
+            fg=COLORS["primary"],
+        ).pack(pady=5)
+
+        scale_frame = tk.Frame(info_frame, bg=COLORS["background"])
+        scale_frame.pack(pady=5)
+
+        # Grading scale labels, generated from the scale's mark ranges
+        for info in cgpa_engine.SCALE.grades_info():
+            tk.Label(
+                scale_frame,
+                text=info,
+                font=FONTS["small"],
+                bg=COLORS["background"],
+                fg=COLORS["text"],
+            ).pack()
+    @profiled
+    def SETUP_gradeInput_grid(self, parent):
+        self.grade_counts_frame = tk.Frame(parent, bg=COLORS["background"])
+        self.grade_counts_frame.pack(fill=tk.X, pady=5, padx=5)
+        
+        # Header for grade input section
+        tk.Label(
+            self.grade_counts_frame,
+            text="Course Count per Grade",
+            font=FONTS["subheader"],
+            bg=COLORS["background"],
+            fg=COLORS["primary"],
+        ).pack(pady=(5,5))
+
+        # Create grid frame
+        grid_frame = tk.Frame(self.grade_counts_frame, bg=COLORS["background"])
+        grid_frame.pack(pady=5)
+
+        # Organize grades in a 4x4 grid
+        row = 0
+        col = 0
+        for letter in GRADES.keys():
+            frame = tk.Frame(grid_frame, bg=COLORS["background"])
+            frame.grid(row=row, column=col, padx=2, pady=2)
+
+            grade_text = f"{letter} ({GRADES[letter]:.1f})"
+            tk.Label(
+                frame,
+                text=grade_text,
+                font=FONTS["normal"],
+                width=8,
+                bg=COLORS["background"],
+            ).pack(side=tk.LEFT)
+
+            tk.Entry(
+                frame,
+                textvariable=self.grade_counts[letter],
+                width=4,
+                font=FONTS["normal"],
+                state="normal",
+            ).pack(side=tk.LEFT, padx=2)
+
+            col += 1
+            if col > 3:  # 4 columns
+                col = 0
+                row += 1
+
+        # Course count display
+        tk.Label(
+            parent,
+            textvariable=self.results["total_course_count"],
+            font=FONTS["small"],
+            bg=COLORS["background"],
+            fg=COLORS["text"],
+        ).pack(pady=5)
+
+        # Button container for calculate button
+        button_frame = tk.Frame(self.grade_counts_frame, bg=COLORS["background"])
+        button_frame.pack(pady=10)
+
+        # Calculate button
+        self.calculate_btn = tk.Button(
+            button_frame,
+            text="Calculate Current CGPA",
+            command=self.calculate_cgpa,
+            font=FONTS["normal-bold"],
+            bg=COLORS["secondary"],
+            fg="white",
+            state="normal",
+        )
+        self.calculate_btn.pack(pady=5)
+    @profiled
+    def SETUP_result_frame(self, parent):
+        # Add result display frame after grade count section
+        result_display = tk.Frame(parent, bg=COLORS["background"], relief="groove", borderwidth=1)
+        result_display.pack(fill=tk.X, pady=10, padx=5)
+        
+        tk.Label(
+            result_display,
+            textvariable=self.results["current_result"],
+            font=FONTS["result"],
+            bg=COLORS["background"],
+            fg=COLORS["primary"],
+        ).pack(pady=5)
+
+        tk.Label(
+            result_display,
+            textvariable=self.state["error_var"],
+            font=FONTS["normal"],
+            bg=COLORS["background"],
+            fg=COLORS["error"],
+            wraplength=400,
+        ).pack(pady=5)
+
+    # RIGHT FRAMES
+    @profiled
+    def SETUP_ManualInput_frame(self, parent):
+        # Manual CGPA input section
+        manual_frame = tk.Frame(parent, bg=COLORS["background"], relief="groove", borderwidth=1)
+        manual_frame.pack(fill=tk.X, pady=5, padx=5)
+
+        header_frame = tk.Frame(manual_frame, bg=COLORS["background"])
+        header_frame.pack(fill=tk.X, pady=5)
+
+        # Manual input toggle
+        tk.Checkbutton(
+            header_frame,
+            text="Manual CGPA & Credit Input",
+            variable=self.state["manual_input_enabled"],
+            command=self.toggle_manual_input,
+            bg=COLORS["background"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        input_frame = tk.Frame(manual_frame, bg=COLORS["background"])
+        input_frame.pack(pady=5)
+
+        # Manual CGPA input
+        tk.Label(
+            input_frame,
+            text="Current CGPA",
+            font=FONTS["normal-bold"],
+            bg=COLORS["background"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.manual_cgpa_entry = tk.Entry(
+            input_frame,
+            textvariable=self.manual_cgpa,
+            width=9,
+            justify="center",
+            state="disabled",
+            font=FONTS["normal"],
+        )
+        self.manual_cgpa_entry.pack(side=tk.LEFT, padx=5)
+
+        # Total credits input
+        tk.Label(
+            input_frame,
+            text="Completed Total Credits:",
+            font=FONTS["normal-bold"],
+            bg=COLORS["background"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.credits_entry = tk.Entry(
+            input_frame,
+            textvariable=self.results["total_credits"],
+            width=10,
+            justify="center",
+            state="disabled",
+            font=FONTS["normal"],
+        )
+        self.credits_entry.pack(side=tk.LEFT, padx=5)
+    @profiled
+    def SETUP_scrollable_semester_frame(self, parent):
+        # Create scrollable container
+        container = tk.Frame(parent, bg=COLORS["background"])
+        container.pack(fill=tk.BOTH, expand=True, pady=5)
+
+        # Virtualized list: only the lines in view exist as widgets, recycled while scrolling
+        self.canvas = tk.Canvas(
+            container, bg="white", highlightthickness=0, yscrollincrement=LINE_HEIGHT
+        )
+        scrollbar = ttk.Scrollbar(container, orient="vertical", command=self._scroll_semesters)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas.bind("<Configure>", lambda e: self._render_semesters())
+
+        # Pack scrollbar and canvas
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Bind mousewheel scrolling
+        def _on_mousewheel(event):
+            self._scroll_semesters("scroll", int(-1*(event.delta/120)), "units")
+        self.canvas.bind_all("<MouseWheel>", _on_mousewheel)
+
+    # HELPER FUNCTIONS
+    def _reset_display(self):
+        """Reset display after error"""
+        self.results["current_result"].set("Calculated CGPA: ---")
+        self.calculate_btn.config(bg=COLORS["secondary"])
+    def update_program_info(self, info):
+        self._set_later(self.state["program_info_var"], info)
+    @instrumented
+    def update_course_count(self, summary):
+        """Update course count and maintain total credits"""
+        total_courses, total_credits, include_thesis = summary
+        thesis_text = " + thesis/internship" if include_thesis else ""
+
+        # Update displays
+        self._set_later(self.results["total_course_count"], f"Total courses: {total_courses}{thesis_text}")
+        
+        # Only update total_credits if not in manual mode
+        if not self.state["manual_input_enabled"].get():
+            self._set_later(self.results["total_credits"], str(total_credits))
+    # SEMESTER LIST
+    # Semesters and courses are cgpa_model objects in self.plan. Each
+    # semester takes len(courses) + 2 lines of the list: a header, one line
+    # per course and the Add Course button. Every line is LINE_HEIGHT tall,
+    # so the lines in view follow from the scroll offset alone.
+    def _layout_semesters(self, start=0):
+        """Recompute the first line of semesters[start:] and the scroll region"""
+        semesters = self.plan.semesters
+        starts = self.tracking["line_starts"]
+        del starts[start:]
+        line = starts[-1] + len(semesters[start - 1].courses) + 2 if start else 0
+        for semester in semesters[start:]:
+            starts.append(line)
+            line += len(semester.courses) + 2
+        self.tracking["line_count"] = line
+        self.canvas.configure(scrollregion=(0, 0, SEMESTER_WIDTH, line * LINE_HEIGHT))
+    def _scroll_semesters(self, *args):
+        self.canvas.yview(*args)
+        self._render_semesters()
+    @instrumented
+    def _render_semesters(self):
+        """Bind pooled row widgets to the lines currently in view"""
+        semesters = self.plan.semesters
+        starts = self.tracking["line_starts"]
+        top = max(int(self.canvas.canvasy(0)), 0)
+        line = top // LINE_HEIGHT
+        last = min(self.tracking["line_count"], (top + self.canvas.winfo_height()) // LINE_HEIGHT + 1)
+        index = bisect.bisect_right(starts, line) - 1
+        used = dict.fromkeys(self.semester_rows, 0)
+
+        while line < last:
+            semester = semesters[index]
+            offset = line - starts[index]
+            if offset == 0:
+                kind = "header"
+            elif offset <= len(semester.courses):
+                kind = "course"
+            else:
+                kind = "footer"
+                index += 1
+            row = self._pooled_row(kind, used[kind])
+            used[kind] += 1
+            self._bind_row(row, semester, offset - 1)
+            self.canvas.coords(row["window"], 0, line * LINE_HEIGHT)
+            self.canvas.itemconfigure(row["window"], state="normal")
+            line += 1
+
+        # Park whatever the view does not need
+        for kind, rows in self.semester_rows.items():
+            for row in rows[used[kind]:]:
+                if row["semester"] is not None:
+                    row["semester"] = row["course"] = None
+                    self.canvas.itemconfigure(row["window"], state="hidden")
+    def _pooled_row(self, kind, position):
+        """The position-th pooled row of a kind, created on first use"""
+        rows = self.semester_rows[kind]
+        if position == len(rows):
+            row = {"kind": kind, "semester": None, "course": None, "course_index": None, "title_text": None, "binding": False}
+            row["frame"] = tk.Frame(self.canvas, bg="white")
+            getattr(self, f"_create_{kind}_row")(row)
+            row["window"] = self.canvas.create_window(
+                0, 0, window=row["frame"], anchor="nw", width=SEMESTER_WIDTH, height=LINE_HEIGHT
+            )
+            rows.append(row)
+        return rows[position]
+    def _create_header_row(self, row):
+        # Left side: Semester number
+        row["title"] = tk.Label(row["frame"], font=FONTS["subheader"], bg="white")
+        row["title"].pack(side=tk.LEFT, padx=5)
+
+        # Right side: delete button and stats
+        tk.Button(
+            row["frame"],
+            text=chr(10005),
+            command=lambda: self.delete_semester(row["semester"]),
+            bg=COLORS["error"],
+            fg="white",
+            font=FONTS["normal"],
+        ).pack(side=tk.RIGHT, padx=5)
+
+        row["course_count"] = tk.StringVar()
+        row["credits_count"] = tk.StringVar()
+        row["running_cgpa"] = tk.StringVar()
+        tk.Label(
+            row["frame"], textvariable=row["running_cgpa"], font=FONTS["small"], bg="white", fg=COLORS["secondary"]
+        ).pack(side=tk.RIGHT, padx=5)
+        tk.Label(
+            row["frame"], textvariable=row["course_count"], font=FONTS["small"], bg="white"
+        ).pack(side=tk.RIGHT, padx=5)
+        tk.Label(
+            row["frame"], textvariable=row["credits_count"], font=FONTS["small"], bg="white"
+        ).pack(side=tk.RIGHT, padx=5)
+    def _create_course_row(self, row):
+        row["title"] = tk.Label(row["frame"], font=FONTS["normal-bold"], bg="white")
+        row["title"].pack(side=tk.LEFT, padx=5)
+
+        row["grade"] = tk.StringVar()
+        row["credits"] = tk.StringVar()
+        ttk.Combobox(
+            row["frame"],
+            textvariable=row["grade"],
+            values=list(GRADES.keys()),
+            width=5,
+            state="readonly",
+        ).pack(side=tk.LEFT, padx=5)
+
+        tk.Entry(
+            row["frame"],
+            textvariable=row["credits"],
+            width=5,
+            font=FONTS["normal"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Remove button
+        tk.Button(
+            row["frame"],
+            text=chr(10005),
+            command=lambda: self.remove_course(row["semester"], row["course_index"]),
+            bg=COLORS["error"],
+            fg="white",
+        ).pack(side=tk.RIGHT, padx=5)
+
+        # Edits go straight into the course the row is showing
+        def on_edit(*args):
+            if not row["binding"] and row["course"] is not None:
+                row["course"].grade = cgpa_model.GRADE_CODES.get(row["grade"].get(), cgpa_model.NO_GRADE)
+                row["course"].credits = cgpa_model.parse_course_credits(row["credits"].get())
+                self._semester_changed(row["semester"])
+
+        row["grade"].trace_add("write", on_edit)
+        row["credits"].trace_add("write", on_edit)
+    def _create_footer_row(self, row):
+        tk.Button(
+            row["frame"],
+            text="Add Course",
+            command=lambda: self.add_course_to_semester(row["semester"]),
+            bg=COLORS["secondary"],
+            fg="white",
+            font=FONTS["normal-bold"],
+        ).pack(pady=2)
+    def _bind_row(self, row, semester, course_index):
+        """Point a pooled row at a semester (and course) and show its data"""
+        previous = row["semester"]
+        row["semester"] = semester
+        if row["kind"] == "header":
+            self._set_title(row, f"Semester {semester.number}")
+            if semester is not previous:
+                course_count, credits_count = self._semester_stats(semester)
+                row["course_count"].set(course_count)
+                row["credits_count"].set(credits_count)
+            # Earlier semesters may have changed while this one was out of view
+            running = self._running_cgpa(semester)
+            if row["running_cgpa"].get() != running:
+                row["running_cgpa"].set(running)
+        elif row["kind"] == "course":
+            course = semester.courses[course_index]
+            self._set_title(row, f"Course {course_index + 1}:")
+            row["course_index"] = course_index
+            if course is not row["course"]:
+                row["course"] = course
+                row["binding"] = True
+                row["grade"].set(course.letter)
+                row["credits"].set("" if course.credits is None else str(course.credits))
+                row["binding"] = False
+    @staticmethod
+    def _set_title(row, text):
+        """Retitle a row through its label handle, skipping no-op redraws"""
+        if row["title_text"] != text:
+            row["title_text"] = text
+            row["title"].config(text=text)
+    def _semester_stats(self, semester):
+        """Course and credit count labels for a semester header"""
+        limit = "" if self.state["unlimited_courses"].get() else f"/{cgpa_engine.MAX_COURSES_PER_SEMESTER}"
+        return f"{len(semester.courses)}{limit} courses", f"Credits: {semester.credits()}"
+    def _running_cgpa(self, semester):
+        """CGPA after a semester (its complete courses and all before it), once a current CGPA is known"""
+        current = self.model.get("standing")
+        if current is None:
+            return ""
+        text = cgpa_engine.format_cgpa(self.plan.totals_after(current, semester.number))
+        return f"CGPA {text}" if text else ""
+    def _semester_changed(self, semester):
+        """Invalidate future totals from a semester on and queue the header refreshes"""
+        self.plan.changed(semester)
+        self.model.touch("semesters")
+        self._call_later(("stats", id(semester)), lambda: self._update_semester_stats(semester))
+        self._call_later("trajectory", self._update_trajectory)
+    @instrumented
+    def _update_semester_stats(self, semester):
+        """Queue the stats labels of the header row showing semester, if it is in view"""
+        for row in self.semester_rows["header"]:
+            if row["semester"] is semester:
+                course_count, credits_count = self._semester_stats(semester)
+                self._set_later(row["course_count"], course_count)
+                self._set_later(row["credits_count"], credits_count)
+    @instrumented
+    def _update_trajectory(self):
+        """Queue the running CGPA of every semester header in view"""
+        for row in self.semester_rows["header"]:
+            if row["semester"] is not None:
+                self._set_later(row["running_cgpa"], self._running_cgpa(row["semester"]))
+    @instrumented
+    def add_semester_box(self):
+        self.plan.add_semester()
+        self.model.touch("semesters")
+
+        # Show the new semester at the bottom of the list
+        self._layout_semesters(len(self.plan) - 1)
+        self.canvas.yview_moveto(1.0)
+        self._render_semesters()
+    @instrumented
+    def delete_semester(self, semester_data):
+        """Delete a semester and update numbering"""
+        try:
+            # Renumbers only the semesters after the deleted one
+            index = self.plan.remove_semester(semester_data)
+
+            self.model.touch("semesters")
+            self._layout_semesters(index)
+            self._render_semesters()
+
+            # Update button states
+            self._update_future_calculation_state()
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to delete semester: {str(e)}")
+    @instrumented
+    def add_course_to_semester(self, semester_data):
+        limit = cgpa_engine.MAX_COURSES_PER_SEMESTER
+        if not self.state["unlimited_courses"].get() and len(semester_data.courses) >= limit:
+            messagebox.showwarning("Limit Reached", f"Maximum {limit} courses allowed per semester")
+            return
+
+        semester_data.courses.append(cgpa_model.Course())
+        self._semester_changed(semester_data)
+        self._layout_semesters(semester_data.number - 1)
+        self._render_semesters()
+    @instrumented
+    def remove_course(self, semester_data, course_index):
+        try:
+            del semester_data.courses[course_index]
+            self._semester_changed(semester_data)
+            self._layout_semesters(semester_data.number - 1)
+            self._render_semesters()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to remove course: {str(e)}")
+    def toggle_unlimited_courses(self):
+        """Switch the per-semester course limit and refresh the headers"""
+        for row in self.semester_rows["header"]:
+            if row["semester"] is not None:
+                self._update_semester_stats(row["semester"])
+    def toggle_thesis(self):
+        state_update = "readonly" if self.state["include_thesis"].get() else "disabled"
+        for widget in self.thesis_frame.winfo_children():
+            if isinstance(widget, ttk.Combobox):
+                widget.config(state=state_update)
+        self._call_later("calculate_cgpa", lambda: self.calculate_cgpa(quiet=True))
+    def toggle_manual_input(self):
+        """Toggle manual CGPA input with proper credit sync"""
+        if self.state["manual_input_enabled"].get():
+            # Enable manual input
+            self.manual_cgpa_entry.config(state="normal")
+            self.credits_entry.config(state="normal")
+            
+            # Set current values if available
+            if self.tracking["current_cgpa"]:
+                self.manual_cgpa.set(cgpa_engine.format_cgpa(self.tracking["current_totals"]))
+            else:
+                self.manual_cgpa.set("")
+                
+            # Don't clear credits if they're already calculated
+            if not self.results["total_credits"].get():
+                self.credits_entry.delete(0, tk.END)
+        else:
+            # Disable manual input
+            self.manual_cgpa_entry.config(state="disabled")
+            self.credits_entry.config(state="disabled")
+            
+            # Sync with calculated values
+            if self.tracking["current_cgpa"]:
+                self.manual_cgpa.set(cgpa_engine.format_cgpa(self.tracking["current_totals"]))
+            else:
+                self.manual_cgpa.set("")
+    def _current_standing(self):
+        """Current exact totals for predictions, or None after warning the user"""
+        if self.state["manual_input_enabled"].get():
+            try:
+                current = cgpa_engine.standing(
+                    self.manual_cgpa.get() or 0, self.results["total_credits"].get() or 0
+                )
+                if current["tenths"] == 0 or current["credits"] == 0:
+                    messagebox.showwarning("Invalid Input", "Please enter valid CGPA and credits")
+                    return None
+            except (ValueError, ZeroDivisionError):
+                messagebox.showwarning("Invalid Input", "Invalid CGPA or credits format")
+                return None
+        elif self.tracking["current_cgpa"]:
+            current = self.tracking["current_totals"]
+        else:
+            messagebox.showwarning("No CGPA", "Calculate current CGPA first or use manual input")
+            return None
+        return current
+    @instrumented
+    def calculate_all_semesters(self):
+        """Simplified future CGPA calculation"""
+        try:
+            # Get current CGPA and credits
+            current = self._current_standing()
+            if current is None:
+                return
+
+            # Process each semester
+            incomplete = self.plan.first_incomplete()
+            if incomplete is not None:
+                messagebox.showwarning("Missing Data", f"Missing grade or credit in Semester {incomplete}")
+                return
+
+            # Calculate future CGPA (recomputed only if the standing or a course changed)
+            self.model.set("standing", current)
+            future = self.model.get("future_totals")
+
+            if future is not None:
+                self.results["future_result"].set(
+                    f"Future CGPA after {len(self.plan)} semester{'s' if len(self.plan)>1 else ''}: {cgpa_engine.format_cgpa(future)}"
+                )
+            else:
+                messagebox.showwarning("No Future Courses", "Add future courses to calculate")
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Calculation error: {str(e)}")
+            self.results["future_result"].set("Future CGPA: Not calculated")
+    @instrumented
+    def solve_target_cgpa(self):
+        """Show the least demanding grade plans that reach the target CGPA"""
+        try:
+            current = self._current_standing()
+            if current is None:
+                return
+
+            top = cgpa_planner.LEVEL_TENTHS[0] / 10  # best grade point on the active scale
+            try:
+                target = float(self.target_cgpa.get())
+            except ValueError:
+                messagebox.showwarning("Invalid Input", f"Enter a target CGPA between 0 and {top:g}")
+                return
+            if not 0 <= target <= top:
+                messagebox.showwarning("Invalid Input", f"Enter a target CGPA between 0 and {top:g}")
+                return
+
+            semesters = self.plan.credit_plan()
+            for number, credits in enumerate(semesters, 1):
+                if not all(credits):
+                    messagebox.showwarning("Missing Data", f"Missing credit in Semester {number}")
+                    return
+            if not any(semesters):
+                messagebox.showwarning("No Future Courses", "Add future courses to find required grades")
+                return
+
+            current_cgpa, current_credits = cgpa_engine.exact_cgpa(current), current["credits"]
+            max_per_semester = None if self.state["unlimited_courses"].get() else cgpa_engine.MAX_COURSES_PER_SEMESTER
+            plans = cgpa_planner.solve_target(
+                current_cgpa, current_credits, target, semesters, limit=3, max_per_semester=max_per_semester
+            )
+            if not plans:
+                messagebox.showinfo("Target CGPA", f"A CGPA of {target:.2f} is out of reach with the planned courses")
+                return
+
+            uniform = cgpa_planner.minimum_uniform_grade(
+                current_cgpa, current_credits, target, semesters, max_per_semester=max_per_semester
+            )
+            lines = [f"Same grade in every course: {uniform} or better", ""]
+            for number, plan in enumerate(plans, 1):
+                lines.append(f"Option {number} (CGPA {plan['cgpa_text']}):")
+                for semester_number, grades in enumerate(plan["grades"], 1):
+                    if grades:
+                        lines.append(f"  Semester {semester_number}: {', '.join(grades)}")
+            messagebox.showinfo(f"Reaching CGPA {target:.2f}", "\n".join(lines))
+        except ValueError as e:
+            messagebox.showwarning("Invalid Input", str(e))
+    def clear_all(self):
+        """Clear all inputs and reset calculator"""
+        if messagebox.askyesno("Confirm Clear", "Are you sure you want to clear all entries?"):
+            # Clear grade counts
+            for var in self.grade_counts.values():
+                var.set("0")
+            
+            # Clear thesis data
+            self.state["include_thesis"].set(False)
+            self.thesis_grade.set("")
+            
+            # Clear program selection
+            self.selected_program.set("")
+            
+            # Clear result variables (queued, so they land after the count updates above)
+            self.pending["calls"].clear()
+            self._set_later(self.results["total_credits"], "")
+            self._set_later(self.results["current_result"], "Calculated CGPA: ---")
+            self._set_later(self.results["future_result"], "Future CGPA: ---")
+            self._set_later(self.state["error_var"], "")
+            
+            self.target_cgpa.set("")
+            
+            # Clear tracking data
+            self.tracking["current_cgpa"] = None
+            self.tracking["current_totals"] = None
+            self.model.set("standing", None)
+            
+            # Clear all semesters in one pass
+            self.plan.clear()
+            self.model.touch("semesters")
+            self._layout_semesters()
+            self._render_semesters()
+            
+            # Reset buttons
+            self.calculate_btn.config(bg=COLORS["secondary"])
+            self.calculate_future_btn.config(state="disabled")
+            
+            # Reset manual input if enabled
+            if self.state["manual_input_enabled"].get():
+                self.state["manual_input_enabled"].set(False)
+                self.toggle_manual_input()
+
+    # CGPA CALCULATION
+    @instrumented
+    def calculate_cgpa(self, quiet=False):
+        """Calculate the current CGPA; quiet reports problems inline instead of in a dialog"""
+        try:
+            totals = self._calculate_grade_totals()
+            cgpa = cgpa_engine.cgpa(totals)
+            
+            if cgpa is not None:
+                self._update_cgpa_display(cgpa, totals)
+            else:
+                if quiet:
+                    self.state["error_var"].set("No valid grades entered")
+                else:
+                    messagebox.showwarning("No Data", "No valid grades entered")
+                self._reset_display()
+                
+        except Exception as e:
+            if quiet:
+                self.state["error_var"].set(f"Calculation error: {str(e)}")
+            else:
+                messagebox.showerror("Error", f"Calculation error: {str(e)}")
+            self._reset_display()
+    def _calculate_grade_totals(self):
+        return self.model.get("current_totals")
+    def _update_cgpa_display(self, cgpa, totals):
+        """Update display with calculated CGPA"""
+        credits = totals["credits"]
+        self.tracking["current_cgpa"] = cgpa
+        self.tracking["current_totals"] = totals
+        self.results["current_result"].set(f"Current CGPA: {cgpa_engine.format_cgpa(totals)}")
+        self.calculate_btn.config(bg=COLORS["success"])
+        self.state["error_var"].set("")
+        
+        # Update total credits if not in manual mode
+        if not self.state["manual_input_enabled"].get():
+            self.results["total_credits"].set(str(credits))
+            self.model.set("standing", totals)
+            
+        # Enable future CGPA calculation
+        if self.calculate_future_btn is not None:
+            self.calculate_future_btn.config(state="normal")
+    def _update_future_calculation_state(self):
+        """Helper method to update future calculation button state"""
+        try:
+            if self.state["manual_input_enabled"].get() and self.manual_cgpa.get() and self.results["total_credits"].get():
+                self.calculate_future_btn.config(state="normal")
+            elif not self.state["manual_input_enabled"].get() and self.tracking["current_cgpa"]:
+                self.calculate_future_btn.config(state="normal")
+            else:
+                self.calculate_future_btn.config(state="disabled")
+                self.results["future_result"].set("Future CGPA: Not calculated")
+        except Exception as e:
+            print(f"Debug - Button state update error: {str(e)}")
+
+
+def main(started=None, startup_profile=False, runtime_profile=None):
+    """Run the calculator window
+
+    With startup_profile, phase timings (counted from started, a
+    time.perf_counter() value) are printed to stderr once the window is
+    interactive, and the window closes. runtime_profile is a stats file
+    path; callback timings and event-loop stalls are written to it while
+    the window is in use.
+    """
+    profile = None
+    if startup_profile:
+        profile = StartupProfile(time.perf_counter() if started is None else started)
+        profile.mark("imports", profile.started)
+    runtime = RuntimeProfile(runtime_profile) if runtime_profile else None
+    calculator = CGPACalculator(profile, runtime)
+    if runtime:
+        runtime.start(calculator)
+
+        def close():
+            runtime.close()
+            calculator.app.destroy()
+        calculator.app.protocol("WM_DELETE_WINDOW", close)
+    calculator.app.mainloop()
+    return 0
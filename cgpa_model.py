@@ -0,0 +1,373 @@
+"""Tk-free state model behind the calculator window.
+
+GradeTotals keeps the running totals of the grade-count inputs, so editing
+one count is O(1) however many grades there are. Reactive is a tiny
+dependency graph: inputs are set from widget callbacks, derived values are
+recomputed only when one of their inputs changed, and only values someone
+is listening to are recomputed eagerly.
+
+Plan, Semester and Course hold the future-semester plan as grade codes and
+integer credits. Tk variables exist only for the rows on screen.
+
+Transcript is the course-level alternative to GradeTotals: attempts per
+course with any credits, and a retake policy deciding which attempts count.
+"""
+
+import bisect
+
+import cgpa_cache
+from cgpa_engine import (
+    COURSE_CREDITS, GRADE_TENTHS, SCALE, THESIS_CREDITS, exact_value, parse_count,
+)
+
+# Grade codes are positions in the scale's grade order, as in the batch tools
+GRADE_LETTERS = SCALE.letters
+GRADE_CODES = SCALE.codes
+CODE_TENTHS = SCALE.tenths
+NO_GRADE = -1
+
+
+class GradeTotals:
+    """Running course/credit/tenths totals of a grade -> course count histogram"""
+
+    __slots__ = ("counts", "courses", "credits", "tenths")
+
+    def __init__(self):
+        self.counts = dict.fromkeys(GRADE_TENTHS, 0)
+        self.courses = 0
+        self.credits = 0
+        self.tenths = 0
+
+    def set_count(self, letter, value):
+        """Replace one grade's count, adjusting the totals by the difference
+
+        Returns True when the count actually changed.
+        """
+        count = max(parse_count(value), 0)  # Negative counts are ignored like in the engine
+        delta = count - self.counts[letter]
+        if not delta:
+            return False
+        self.counts[letter] = count
+        self.courses += delta
+        self.credits += delta * COURSE_CREDITS
+        self.tenths += delta * COURSE_CREDITS * GRADE_TENTHS[letter]
+        return True
+
+    def totals(self, thesis_grade=None):
+        """Engine-style totals dict, with the thesis added when a grade is given"""
+        totals = {"tenths": self.tenths, "credits": self.credits, "courses": self.courses}
+        if thesis_grade:
+            totals["credits"] += THESIS_CREDITS
+            totals["tenths"] += GRADE_TENTHS[thesis_grade] * THESIS_CREDITS
+        return totals
+
+
+class Reactive:
+    """Inputs and lazily recomputed derived values with change listeners"""
+
+    def __init__(self):
+        self._values = {}
+        self._compute = {}
+        self._depends_on = {}
+        self._dependents = {}
+        self._dirty = set()
+        self._listeners = {}
+
+    def define_input(self, name, value=None):
+        self._values[name] = value
+        self._dependents.setdefault(name, [])
+
+    def define(self, name, compute, depends_on):
+        """Derived value: compute(*dependency_values), refreshed when a dependency changes"""
+        self._compute[name] = compute
+        self._depends_on[name] = tuple(depends_on)
+        self._dependents.setdefault(name, [])
+        for dependency in depends_on:
+            self._dependents[dependency].append(name)
+        self._dirty.add(name)
+
+    def subscribe(self, name, callback):
+        """Call callback(value) whenever name takes a new value"""
+        self._listeners.setdefault(name, []).append(callback)
+
+    def get(self, name):
+        if name in self._dirty:
+            # Stays dirty if compute raises, so the next get() retries
+            self._values[name] = self._compute[name](*(self.get(d) for d in self._depends_on[name]))
+            self._dirty.discard(name)
+        return self._values[name]
+
+    def set(self, name, value):
+        """Set an input; nothing happens when the value is unchanged"""
+        if self._values.get(name) == value:
+            return
+        self._values[name] = value
+        self.touch(name)
+
+    def touch(self, name):
+        """Mark name as changed (e.g. after mutating an input in place) and propagate"""
+        stale = []
+        pending = list(self._dependents[name])
+        while pending:
+            node = pending.pop()
+            if node in stale:
+                continue
+            self._dirty.add(node)
+            stale.append(node)
+            pending.extend(self._dependents[node])
+
+        self._notify(name, self._values[name])
+        for node in stale:
+            if node in self._listeners:
+                previous = self._values.get(node)
+                value = self.get(node)
+                if value != previous:
+                    self._notify(node, value)
+
+    def _notify(self, name, value):
+        for callback in self._listeners.get(name, ()):
+            callback(value)
+
+
+def parse_course_credits(text):
+    """Whole-number credits from an entry, or None for blank/invalid input"""
+    try:
+        value = exact_value(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+    if value.denominator != 1 or value < 0:
+        return None
+    return int(value)
+
+
+class Course:
+    """One planned course: a grade code (NO_GRADE until picked) and credits (None if invalid)"""
+
+    __slots__ = ("grade", "credits")
+
+    def __init__(self, grade=NO_GRADE, credits=COURSE_CREDITS):
+        self.grade = grade
+        self.credits = credits
+
+    @property
+    def letter(self):
+        return GRADE_LETTERS[self.grade] if self.grade != NO_GRADE else ""
+
+    @property
+    def complete(self):
+        return self.grade != NO_GRADE and bool(self.credits)
+
+
+class Semester:
+    """Planned semester; number is its 1-based position in the plan"""
+
+    __slots__ = ("number", "courses")
+
+    def __init__(self, number):
+        self.number = number
+        self.courses = []
+
+    def credits(self):
+        return sum(course.credits or 0 for course in self.courses)
+
+    def totals(self):
+        """(tenths, credits, courses) of the semester's complete courses"""
+        tenths = credits = courses = 0
+        for course in self.courses:
+            if course.complete:
+                tenths += CODE_TENTHS[course.grade] * course.credits
+                credits += course.credits
+                courses += 1
+        return tenths, credits, courses
+
+
+class Plan:
+    """Ordered planned semesters with prefix-sum totals
+
+    prefix[k] holds the (tenths, credits, courses) of the complete courses
+    in semesters 1..k+1. Entries are filled in lazily and dropped from the
+    first semester that changes onward, so after editing semester k only
+    semesters k.. are summed again, and the totals after any semester are
+    a list lookup. Call changed() after mutating a semester's courses.
+    """
+
+    __slots__ = ("semesters", "prefix")
+
+    def __init__(self):
+        self.semesters = []
+        self.prefix = []
+
+    def __len__(self):
+        return len(self.semesters)
+
+    def __iter__(self):
+        return iter(self.semesters)
+
+    def __getitem__(self, index):
+        return self.semesters[index]
+
+    def add_semester(self):
+        semester = Semester(len(self.semesters) + 1)
+        self.semesters.append(semester)
+        return semester
+
+    def remove_semester(self, semester):
+        """Remove a semester and renumber the ones after it; returns its old index"""
+        index = semester.number - 1
+        del self.semesters[index]
+        del self.prefix[index:]
+        for number, later in enumerate(self.semesters[index:], index + 1):
+            later.number = number
+        return index
+
+    def clear(self):
+        self.semesters.clear()
+        self.prefix.clear()
+
+    def changed(self, semester):
+        """Drop the prefix sums from a semester whose courses changed onward"""
+        del self.prefix[semester.number - 1:]
+
+    def cumulative(self, count):
+        """(tenths, credits, courses) of the complete courses in the first count semesters"""
+        prefix = self.prefix
+        tenths, credits, courses = prefix[-1] if prefix else (0, 0, 0)
+        for semester in self.semesters[len(prefix):count]:
+            semester_tenths, semester_credits, semester_courses = semester.totals()
+            tenths, credits, courses = tenths + semester_tenths, credits + semester_credits, courses + semester_courses
+            prefix.append((tenths, credits, courses))
+        return prefix[count - 1] if count else (0, 0, 0)
+
+    def totals_after(self, current, count):
+        """Totals after the first count semesters (complete courses only) on top of current totals"""
+        tenths, credits, courses = self.cumulative(count)
+        return {
+            "tenths": current["tenths"] + tenths,
+            "credits": current["credits"] + credits,
+            "courses": current["courses"] + courses,
+        }
+
+    def first_incomplete(self):
+        """Number of the first semester with a course missing its grade or credits"""
+        for semester in self.semesters:
+            if not all(course.complete for course in semester.courses):
+                return semester.number
+        return None
+
+    def credit_plan(self):
+        """Course credits per semester, the shape the target solver takes"""
+        return [[course.credits for course in semester.courses] for semester in self.semesters]
+
+    def key(self):
+        """Packed canonical key of the complete courses for cgpa_cache"""
+        return cgpa_cache.pack_plan(
+            (course.grade, course.credits) for semester in self.semesters for course in semester.courses
+            if course.complete
+        )
+
+    def future_totals(self, current):
+        """Totals after the plan, or None when it adds no credits
+
+        Same result as cgpa_engine.future_totals, without going through
+        letters and credit strings. Every course must be complete.
+        """
+        totals = self.totals_after(current, len(self.semesters))
+        if totals["credits"] > current["credits"]:
+            return totals
+        return None
+
+
+# Retake policies: which attempts of a course count towards the CGPA
+RETAKE_POLICIES = ("best", "latest", "all")
+
+
+class Transcript:
+    """Course-level attempts with running totals under a retake policy
+
+    Each course keeps its attempts sorted by the policy's rank (grade
+    points, then term, for "best"; term for "latest"), so the counted
+    attempt is the last one and finding a slot after a change is a binary
+    search over that course's k attempts; inserting or deleting there
+    shifts the list, so an edit costs O(k), with k a handful of retakes.
+    Recording, replacing or removing an attempt adjusts the totals by the
+    difference in what the course contributes, without rescanning the
+    transcript. Under "all" every attempt counts, as with grade counts.
+
+    Terms only need to compare with each other (e.g. 20241 or "2024-1");
+    recording an attempt for a course and term that already has one
+    replaces it.
+    """
+
+    __slots__ = ("policy", "attempts", "courses", "credits", "tenths")
+
+    def __init__(self, policy="best"):
+        if policy not in RETAKE_POLICIES:
+            raise ValueError(f"Unknown retake policy {policy!r}; expected one of {', '.join(RETAKE_POLICIES)}")
+        self.policy = policy
+        self.attempts = {}  # course -> (attempts sorted by rank, {term: attempt})
+        self.courses = 0
+        self.credits = 0
+        self.tenths = 0
+
+    def _add(self, attempt, sign):
+        _, _, grade, credits = attempt
+        self.courses += sign
+        self.credits += sign * credits
+        self.tenths += sign * CODE_TENTHS[grade] * credits
+
+    def _update(self, course, old=None, new=None):
+        """Swap one attempt of a course for another (either may be None), keeping the totals current"""
+        ranked, by_term = self.attempts.setdefault(course, ([], {}))
+        counted = ranked[-1] if ranked else None
+        if old is not None:
+            del ranked[bisect.bisect_left(ranked, old)]
+            del by_term[old[1]]
+        if new is not None:
+            bisect.insort(ranked, new)
+            by_term[new[1]] = new
+
+        if self.policy == "all":
+            if old is not None:
+                self._add(old, -1)
+            if new is not None:
+                self._add(new, 1)
+        elif (ranked[-1] if ranked else None) is not counted:
+            if counted is not None:
+                self._add(counted, -1)
+            if ranked:
+                self._add(ranked[-1], 1)
+        if not ranked:
+            del self.attempts[course]
+
+    def record(self, course, term, grade, credits=COURSE_CREDITS):
+        """Add an attempt (grade letter or code), replacing any earlier one for the same term"""
+        grade = GRADE_CODES[grade] if isinstance(grade, str) else grade
+        rank = (CODE_TENTHS[grade], term) if self.policy == "best" else (term,)
+        old = self.attempts.get(course, (None, {}))[1].get(term)
+        self._update(course, old, (rank, term, grade, credits))
+
+    def remove(self, course, term):
+        """Drop one attempt; returns False when there was none"""
+        old = self.attempts.get(course, (None, {}))[1].get(term)
+        if old is None:
+            return False
+        self._update(course, old)
+        return True
+
+    def _counted(self, ranked):
+        return ranked if self.policy == "all" else ranked[-1:]
+
+    def counted(self, course):
+        """(term, letter, credits) of each attempt of a course that counts"""
+        return [
+            (term, GRADE_LETTERS[grade], credits)
+            for _, term, grade, credits in self._counted(self.attempts.get(course, ([],))[0])
+        ]
+
+    def totals(self, thesis_grade=None):
+        """Engine-style totals dict, with the thesis added when a grade is given"""
+        totals = {"tenths": self.tenths, "credits": self.credits, "courses": self.courses}
+        if thesis_grade:
+            totals["credits"] += THESIS_CREDITS
+            totals["tenths"] += GRADE_TENTHS[thesis_grade] * THESIS_CREDITS
+        return totals
@@ -0,0 +1,264 @@
+"""Plan solvers built on the engine's future-CGPA math.
+
+Grade points are handled as integer tenths (A- = 37, B+ = 33, ...), so a
+plan's contribution is an integer and "which totals can this plan reach"
+is a bitset over integers: bit s of reach[i] is set when courses i.. can
+add exactly s tenth-points. Searches use those bitsets to cut every branch
+that can no longer hit the target window, instead of trying all 13^k
+grade combinations.
+
+The same bitsets give the degree-completion frontier: every final CGPA a
+student can still graduate with, given the credits their program still
+requires.
+"""
+
+from cgpa_engine import (
+    COURSE_CREDITS, GRADE_TENTHS, MAX_COURSES_PER_SEMESTER, SCALE, THESIS_CREDITS, cgpa, exact_value, format_cgpa,
+    parse_credits, standing,
+)
+
+
+def _grade_levels():
+    """Distinct point values, best first, each with the least demanding letter
+
+    A+ and A are both worth 4.0; A (90+) is the one a plan should ask for.
+    """
+    levels = {}
+    for letter, tenths in GRADE_TENTHS.items():
+        levels[tenths] = letter
+    return sorted(levels.items(), reverse=True)
+
+
+LEVELS = _grade_levels()  # [(tenths, letter), ...] best first
+LEVEL_TENTHS = [tenths for tenths, _ in LEVELS]
+LOWEST = len(LEVELS) - 1
+
+
+def flatten_plan(semesters, max_per_semester=MAX_COURSES_PER_SEMESTER):
+    """Course credits of a plan, checking the per-semester course limit"""
+    credits = []
+    for number, semester in enumerate(semesters, 1):
+        if max_per_semester is not None and len(semester) > max_per_semester:
+            raise ValueError(f"Semester {number} has {len(semester)} courses (maximum {max_per_semester})")
+        for value in semester:
+            try:
+                value = exact_value(value)
+            except (ValueError, ZeroDivisionError):
+                raise ValueError(f"Semester {number}: invalid credits {value!r}") from None
+            if value.denominator != 1 or value <= 0:
+                raise ValueError(f"Semester {number}: credits must be whole positive numbers")
+            credits.append(int(value))
+    return credits
+
+
+def required_tenths(current_cgpa, current_credits, target, plan_credits):
+    """Smallest plan total (sum of tenth-points x credits) that reaches target"""
+    current_cgpa, current_credits, target = exact_value(current_cgpa), exact_value(current_credits), exact_value(target)
+    needed = 10 * (target * (current_credits + sum(plan_credits)) - current_cgpa * current_credits)
+    return max(0, -((-needed.numerator) // needed.denominator))  # ceil
+
+
+def _reach_bitsets(credits, top=0):
+    """reach[i]: bitset of the totals courses i.. can add with grades no better than level top (reach[len] = {0})"""
+    reach = [0] * (len(credits) + 1)
+    reach[-1] = 1
+    for i in range(len(credits) - 1, -1, -1):
+        bits = 0
+        for tenths in LEVEL_TENTHS[top:]:
+            bits |= reach[i + 1] << (tenths * credits[i])
+        reach[i] = bits
+    return reach
+
+
+def _hits(bits, low, high):
+    """True when bitset has any bit set in [low, high]"""
+    low = max(low, 0)
+    if high < low:
+        return False
+    return (bits >> low) & ((1 << (high - low + 1)) - 1) != 0
+
+
+def minimal_assignments(credits, required, limit=None):
+    """Yield Pareto-minimal level assignments for courses with these credits
+
+    An assignment reaches the required total and dropping any single
+    course one grade level falls short of it. Courses with equal credits
+    are interchangeable, so each multiset of grades is produced once, with
+    the better grades on the earlier courses. Assignments come in order of
+    their best grade, lowest first: every plan topping out at A- before
+    any that needs an A, whatever the credits of the courses.
+    """
+    order = sorted(range(len(credits)), key=lambda i: -credits[i])
+    ordered = [credits[i] for i in order]
+    max_drop = max((a - b) for a, b in zip(LEVEL_TENTHS, LEVEL_TENTHS[1:])) * max(ordered, default=0)
+    no_drop = max_drop + 1  # "no course can drop" sentinel, above any real drop
+    levels = [LOWEST] * len(ordered)
+    found = 0
+
+    def search(i, total, min_drop, top, reach):
+        # Grades are capped at level top, and some course has to reach it
+        nonlocal found
+        if i == len(ordered):
+            if total >= required and total - min_drop < required and top in levels:
+                found += 1
+                yield list(levels)
+            return
+        same_group = i > 0 and ordered[i - 1] == ordered[i]
+        best = max(levels[i - 1], top) if same_group else top
+        for level in range(LOWEST, best - 1, -1):  # lowest grades first
+            gained = total + LEVEL_TENTHS[level] * ordered[i]
+            drop = min_drop
+            if level != LOWEST:
+                drop = min(drop, (LEVEL_TENTHS[level] - LEVEL_TENTHS[level + 1]) * ordered[i])
+            # The rest must land the final total in [required, required + drop - 1]
+            if not _hits(reach[i + 1], required - gained, required + drop - 1 - gained):
+                continue
+            levels[i] = level
+            yield from search(i + 1, gained, drop, top, reach)
+            if limit is not None and found >= limit:
+                return
+        levels[i] = LOWEST
+
+    for top in range(LOWEST, -1, -1):
+        reach = _reach_bitsets(ordered, top)
+        if not reach[0] >> max(required, 0):
+            continue  # Even every course at this grade falls short
+        for ordered_levels in search(0, 0, no_drop, top, reach):
+            assignment = [0] * len(credits)
+            for position, course in enumerate(order):
+                assignment[course] = ordered_levels[position]
+            yield assignment
+            if limit is not None and found >= limit:
+                return
+
+
+def solve_target(current_cgpa, current_credits, target, semesters, limit=20,
+                 max_per_semester=MAX_COURSES_PER_SEMESTER):
+    """Pareto-minimal grade plans that bring the CGPA up to target
+
+    semesters is a list of semesters, each a list of course credits.
+    Returns a list of {"grades": [[letter, ...], ...], "cgpa": float,
+    "cgpa_text": str} shaped like semesters; an empty list means the
+    target is out of reach.
+    """
+    credits = flatten_plan(semesters, max_per_semester)
+    if not credits:
+        raise ValueError("Add future courses to solve for a target")
+    required = required_tenths(current_cgpa, current_credits, target, credits)
+    if required > LEVEL_TENTHS[0] * sum(credits):
+        return []
+
+    base = exact_value(current_cgpa) * exact_value(current_credits) * 10
+    total_credits = exact_value(current_credits) + sum(credits)
+    plans = []
+    for assignment in minimal_assignments(credits, required, limit):
+        letters = iter([LEVELS[level][1] for level in assignment])
+        grades = [[next(letters) for _ in semester] for semester in semesters]
+        totals = {
+            "tenths": base + sum(LEVEL_TENTHS[level] * c for level, c in zip(assignment, credits)),
+            "credits": total_credits,
+            "courses": len(credits),
+        }
+        plans.append({"grades": grades, "cgpa": cgpa(totals), "cgpa_text": format_cgpa(totals)})
+    return plans
+
+
+def minimum_uniform_grade(current_cgpa, current_credits, target, semesters,
+                          max_per_semester=MAX_COURSES_PER_SEMESTER):
+    """Lowest single letter that reaches target if earned in every planned course"""
+    credits = flatten_plan(semesters, max_per_semester)
+    required = required_tenths(current_cgpa, current_credits, target, credits)
+    for tenths, letter in reversed(LEVELS):
+        if tenths * sum(credits) >= required:
+            return letter
+    return None
+
+
+# DEGREE COMPLETION
+def remaining_courses(program, completed_credits, thesis_done=False):
+    """Credits of the courses a program still requires: the thesis (unless done), then regular courses
+
+    A remainder smaller than a regular course is counted as one shorter
+    course.
+    """
+    required = SCALE.program_credits[SCALE.program_code(program)]
+    remaining = max(required - parse_credits(completed_credits), 0)
+    courses = []
+    if not thesis_done and remaining >= THESIS_CREDITS:
+        courses.append(THESIS_CREDITS)
+        remaining -= THESIS_CREDITS
+    regular, rest = divmod(remaining, COURSE_CREDITS)
+    courses.extend([COURSE_CREDITS] * regular)
+    if rest:
+        courses.append(rest)
+    return courses
+
+
+def graduation_range(totals, program, thesis_done=False):
+    """(worst, best) final totals when every remaining course gets the lowest / highest grade
+
+    The closed form of degree_frontier's end points, cheap enough to
+    refresh on every edit.
+    """
+    remaining = sum(remaining_courses(program, totals["credits"], thesis_done))
+    final = {"credits": totals["credits"] + remaining, "courses": totals["courses"]}
+    return (
+        {**final, "tenths": totals["tenths"] + LEVEL_TENTHS[LOWEST] * remaining},
+        {**final, "tenths": totals["tenths"] + LEVEL_TENTHS[0] * remaining},
+    )
+
+
+def _set_bits(bits):
+    """Positions of the set bits, lowest first"""
+    positions = []
+    while bits:
+        low = bits & -bits
+        positions.append(low.bit_length() - 1)
+        bits ^= low
+    return positions
+
+
+def degree_frontier(current_cgpa, current_credits, program, threshold=None, thesis_done=False):
+    """Final CGPAs still reachable by graduation
+
+    Returns {"remaining_credits", "remaining_courses", "best", "worst",
+    "reachable"} where best/worst are {"cgpa", "cgpa_text"} and reachable
+    is the sorted list of every exactly reachable final CGPA (as floats).
+    With a threshold, also {"threshold", "can_reach", "guaranteed",
+    "lowest_reaching" (the smallest reachable final CGPA at or above it),
+    "min_average" (grade points needed per remaining credit) and
+    "min_uniform_grade" (lowest letter that does it in every course)}.
+    """
+    current = standing(current_cgpa, current_credits)
+    courses = remaining_courses(program, current["credits"], thesis_done)
+    remaining = sum(courses)
+    base, final_credits = current["tenths"], current["credits"] + remaining
+    sums = _set_bits(_reach_bitsets(courses)[0])
+
+    def final(points):
+        totals = {"tenths": base + points, "credits": final_credits, "courses": len(courses)}
+        return {"cgpa": cgpa(totals), "cgpa_text": format_cgpa(totals)}
+
+    frontier = {
+        "remaining_credits": remaining,
+        "remaining_courses": len(courses),
+        "best": final(sums[-1]),
+        "worst": final(sums[0]),
+        "reachable": [cgpa({"tenths": base + points, "credits": final_credits}) for points in sums],
+    }
+    if threshold is None:
+        return frontier
+
+    required = required_tenths(current_cgpa, current_credits, threshold, courses)
+    reaching = [points for points in sums if points >= required]
+    frontier.update({
+        "threshold": float(exact_value(threshold)),
+        "can_reach": bool(reaching),
+        "guaranteed": sums[0] >= required,
+        "lowest_reaching": final(reaching[0]) if reaching else None,
+        "min_average": required / (10 * remaining) if remaining else None,
+        "min_uniform_grade": next(
+            (letter for tenths, letter in reversed(LEVELS) if tenths * remaining >= required), None
+        ),
+    })
+    return frontier
@@ -0,0 +1,162 @@
+"""Grading scales and program catalogs loaded from data files.
+
+Each JSON file in catalogs/ describes one institution's scale version:
+the grade letters with their points and lowest marks, the credit rules
+and the program catalog. Loading compiles it into dense tuples indexed by
+small integer codes (grade code -> tenths, program code -> credits), so
+the batch engine only ever deals in codes; letters and program names are
+hashed once, when input is parsed.
+
+Scales are looked up by id ("bracu-undergrad", the newest version) or by
+id@version ("bracu-undergrad@2024"); several versions can sit side by
+side in the directory.
+"""
+
+import bisect
+import json
+import os
+import sys
+
+# Data files live next to the modules, or in the unpacked bundle of the frozen build
+CATALOG_DIR = os.path.join(getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__))), "catalogs")
+DEFAULT_SCALE = "bracu-undergrad"
+
+
+class Scale:
+    """A grading scale and program catalog compiled to lookup tables"""
+
+    __slots__ = (
+        "id", "version", "institution", "title", "max_mark",
+        "course_credits", "thesis_credits", "max_courses_per_semester", "probation_cgpa", "honors_cgpa",
+        "letters", "codes", "points", "tenths", "min_marks", "cutoffs",
+        "programs", "program_codes", "program_credits",
+    )
+
+    def __init__(self, data):
+        self.id = data["id"]
+        self.version = str(data.get("version", ""))
+        self.institution = data.get("institution", "")
+        self.title = data.get("title", self.id)
+        self.max_mark = data.get("max_mark", 100)
+        self.course_credits = data.get("course_credits", 3)
+        self.thesis_credits = data.get("thesis_credits", 4)
+        self.max_courses_per_semester = data.get("max_courses_per_semester")
+        # Standing thresholds: probation below the first, honors at or above the second
+        self.probation_cgpa = data.get("probation_cgpa")
+        self.honors_cgpa = data.get("honors_cgpa")
+
+        grades = data["grades"]
+        if not grades:
+            raise ValueError(f"Scale {self.id!r} has no grades")
+        self.letters = tuple(grade["letter"] for grade in grades)
+        if len(set(self.letters)) != len(self.letters):
+            raise ValueError(f"Scale {self.id!r} lists a grade letter twice")
+        self.codes = {letter: code for code, letter in enumerate(self.letters)}
+        self.points = tuple(float(grade["points"]) for grade in grades)
+        # Exact integer arithmetic relies on points being whole tenths
+        self.tenths = tuple(round(points * 10) for points in self.points)
+        if any(abs(tenths - points * 10) > 1e-9 for tenths, points in zip(self.tenths, self.points)):
+            raise ValueError(f"Scale {self.id!r}: grade points must be multiples of 0.1")
+
+        self.min_marks = tuple(grade.get("min_mark") for grade in grades)
+        if None not in self.min_marks and any(a <= b for a, b in zip(self.min_marks, self.min_marks[1:])):
+            raise ValueError(f"Scale {self.id!r}: min_mark must fall from the best grade to the worst")
+        # Lowest marks in ascending order for binary search; None when the scale has no mark ranges
+        self.cutoffs = tuple(reversed(self.min_marks)) if None not in self.min_marks else None
+
+        self.programs = tuple(program["name"] for program in data.get("programs", ()))
+        self.program_codes = {name: code for code, name in enumerate(self.programs)}
+        self.program_credits = tuple(int(program["credits"]) for program in data.get("programs", ()))
+
+    @property
+    def key(self):
+        return f"{self.id}@{self.version}" if self.version else self.id
+
+    def program_code(self, program):
+        """Code of a program given by full name or abbreviation ("CSE"); ValueError if unknown"""
+        if program in self.program_codes:
+            return self.program_codes[program]
+        suffix = f"({program.strip().upper()})"
+        matches = [code for code, name in enumerate(self.programs) if name.upper().endswith(suffix)]
+        if len(matches) != 1:
+            raise ValueError(f"Unknown program {program!r}")
+        return matches[0]
+
+    def grade_points(self):
+        """{letter: points}, the shape of cgpa_engine.GRADES"""
+        return dict(zip(self.letters, self.points))
+
+    def program_catalog(self):
+        """{name: {"credits", "courses"}}, the shape of cgpa_engine.PROGRAMS"""
+        return {
+            name: {"credits": credits, "courses": ((credits - self.thesis_credits) / self.course_credits) + 1}
+            for name, credits in zip(self.programs, self.program_credits)
+        }
+
+    def code_for_mark(self, mark):
+        """Grade code for one raw mark (binary search over the cutoffs)"""
+        if self.cutoffs is None:
+            raise ValueError(f"Scale {self.key!r} has no mark ranges")
+        if not self.cutoffs[0] <= mark <= self.max_mark:
+            raise ValueError(f"Mark {mark!r} is outside {self.cutoffs[0]}-{self.max_mark}")
+        return len(self.cutoffs) - bisect.bisect_right(self.cutoffs, mark)
+
+    def letter_for_mark(self, mark):
+        return self.letters[self.code_for_mark(mark)]
+
+    def grades_info(self, per_line=3):
+        """Mark ranges per grade as display lines, e.g. "90-<97: A (4.0)  |  ..." """
+        if self.cutoffs is None:
+            entries = [f"{letter} ({points:.1f})" for letter, points in zip(self.letters, self.points)]
+        else:
+            entries = []
+            upper = None
+            for letter, points, low in zip(self.letters, self.points, self.min_marks):
+                if upper is None:
+                    marks = f"{low}-{self.max_mark}"
+                elif low == 0:
+                    marks = f"<{upper}"
+                else:
+                    marks = f"{low}-<{upper}"
+                entries.append(f"{marks}: {letter} ({points:.1f})")
+                upper = low
+        return ["  |  ".join(entries[i:i + per_line]) for i in range(0, len(entries), per_line)]
+
+
+def load_scale(path):
+    with open(path, encoding="utf-8") as handle:
+        try:
+            return Scale(json.load(handle))
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{path}: invalid scale file ({e})") from None
+
+
+def _version_order(version):
+    return tuple(int(part) if part.isdigit() else part for part in version.split("."))
+
+
+_loaded = {}
+
+
+def available_scales(directory=CATALOG_DIR):
+    """{id@version: Scale} for every catalog file in directory"""
+    if directory not in _loaded:
+        scales = {}
+        for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else ():
+            if name.endswith(".json"):
+                scale = load_scale(os.path.join(directory, name))
+                scales[scale.key] = scale
+        _loaded[directory] = scales
+    return _loaded[directory]
+
+
+def get_scale(name=DEFAULT_SCALE, directory=CATALOG_DIR):
+    """Scale by id (newest version) or id@version"""
+    scales = available_scales(directory)
+    if name in scales:
+        return scales[name]
+    versions = [scale for scale in scales.values() if scale.id == name]
+    if not versions:
+        known = ", ".join(sorted(scales)) or "none"
+        raise ValueError(f"Unknown grading scale {name!r} (available: {known})")
+    return max(versions, key=lambda scale: _version_order(scale.version))
@@ -0,0 +1,416 @@
+"""Local HTTP/JSON service for the CGPA engine (asyncio, standard library only).
+
+    python cg-calc.py serve --port 8765
+
+    POST /cgpa      {"grades": {"A": 10, "B+": 4}, "thesis": "A-"}
+    POST /predict   {"cgpa": "3.2", "credits": 60, "plan": "A,B+,B/A-@4"}
+                    plan may also be a list of semesters: [[["A", 3], ["B+", 3]], [["A-", 4]]]
+    GET  /stats     request and batch counters, queue depths, p50/p99 latency
+    GET  /health
+
+Requests are validated (types and bounds, 400 on anything else) as they
+arrive and queued. A MicroBatcher takes whatever has arrived within a
+short window (2 ms by default, at most max_batch requests) and answers all
+of it with one vectorized engine call; if that call fails, the batch is
+answered one request at a time, so a bad request only fails itself.
+Queues are bounded: a request that cannot be queued within queue_timeout
+is answered with 503 and Retry-After, so a spike slows clients down
+instead of growing memory. Connections are HTTP/1.1 keep-alive, closed
+after idle_timeout without a request.
+"""
+
+import asyncio
+import collections
+import itertools
+import json
+import sys
+import time
+
+import numpy as np
+
+import cgpa_batch
+import cgpa_cli
+import cgpa_engine
+from cgpa_engine import SCALE
+
+DEFAULT_PORT = 8765
+MAX_BODY = 1 << 20
+# Request bounds; far above any real transcript, low enough that batch sums stay in int64
+MAX_COUNT = 10000  # Courses per grade
+MAX_CREDITS = 10000  # Credits of one course, or completed credits
+MAX_CGPA = max(SCALE.tenths) / 10
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 501: "Not Implemented", 503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# REQUEST PARSING
+def parse_current(payload):
+    """(grade counts in scale order, thesis code) from a /cgpa body"""
+    grades = payload.get("grades")
+    if not isinstance(grades, dict):
+        raise HTTPError(400, 'Expected {"grades": {letter: count}, "thesis": letter or null}')
+    counts = [0] * len(SCALE.letters)
+    for letter, count in grades.items():
+        if letter not in SCALE.codes:
+            raise HTTPError(400, f"Unknown grade {letter!r}")
+        if not isinstance(count, int) or isinstance(count, bool) or not 0 <= count <= MAX_COUNT:
+            raise HTTPError(400, f"Course count for {letter} must be an integer from 0 to {MAX_COUNT}")
+        counts[SCALE.codes[letter]] = count
+    thesis = payload.get("thesis")
+    if thesis is not None and not isinstance(thesis, str):
+        raise HTTPError(400, "Thesis grade must be a letter or null")
+    if thesis and thesis not in SCALE.codes:
+        raise HTTPError(400, f"Unknown thesis grade {thesis!r}")
+    return counts, SCALE.codes[thesis] if thesis else cgpa_batch.NO_THESIS
+
+
+def parse_future(payload):
+    """(standing totals, grade codes, credits) from a /predict body"""
+    plan = payload.get("plan")
+    try:
+        for name in ("cgpa", "credits"):
+            if not isinstance(payload.get(name), (str, int, float)) or isinstance(payload.get(name), bool):
+                raise ValueError(f"{name} must be a number or a numeric string")
+        current = cgpa_engine.standing(payload["cgpa"], payload["credits"])
+        if not 0 <= cgpa_engine.exact_value(payload["cgpa"]) <= MAX_CGPA:
+            raise ValueError(f"cgpa must be from 0 to {MAX_CGPA}")
+        if current["credits"] > MAX_CREDITS:
+            raise ValueError(f"credits must be at most {MAX_CREDITS}")
+        if isinstance(plan, str):
+            plan = [[cgpa_cli.parse_planned_course(course) for course in semester]
+                    for semester in cgpa_cli.parse_plan(plan)]
+        if not isinstance(plan, list) or not all(isinstance(semester, list) for semester in plan):
+            raise ValueError('Expected {"cgpa", "credits", "plan"} with plan a string or a list of semesters')
+        codes, credits = [], []
+        for course in itertools.chain.from_iterable(plan):
+            if not isinstance(course, (list, tuple)) or len(course) != 2:
+                raise ValueError(f"Planned courses must be [grade, credits] pairs, got {course!r}")
+            letter, course_credits = course
+            if not isinstance(letter, str) or letter not in SCALE.codes:
+                raise ValueError(f"Unknown grade {letter!r}")
+            if isinstance(course_credits, bool) or not isinstance(course_credits, (str, int, float)):
+                raise ValueError(f"Invalid credits {course_credits!r}")
+            course_credits = cgpa_engine.parse_credits(course_credits)
+            if course_credits > MAX_CREDITS:
+                raise ValueError(f"Course credits must be at most {MAX_CREDITS}")
+            codes.append(SCALE.codes[letter])
+            credits.append(course_credits)
+    except (ValueError, TypeError, ZeroDivisionError, OverflowError) as e:
+        raise HTTPError(400, str(e)) from None
+    return current, codes, credits
+
+
+# BATCHED COMPUTATION
+def compute_current(requests):
+    """Answer a batch of /cgpa requests with one batch_totals call"""
+    counts = np.array([counts for counts, _ in requests], dtype=np.int64)
+    thesis = np.array([thesis for _, thesis in requests], dtype=np.int64)
+    totals = cgpa_batch.batch_totals(counts, thesis)
+    texts = cgpa_batch.format_cgpas(totals["tenths"], totals["credits"])
+    return [
+        {"courses": courses, "credits": credits, "cgpa": cgpa if credits else None, "cgpa_text": text or None}
+        for courses, credits, cgpa, text in zip(
+            totals["courses"].tolist(), totals["credits"].tolist(), totals["cgpa"].tolist(), texts
+        )
+    ]
+
+
+def compute_future(requests):
+    """Answer a batch of /predict requests; every plan is summed in one course_totals call"""
+    lengths = [len(codes) for _, codes, _ in requests]
+    students = np.repeat(np.arange(len(requests)), lengths)
+    codes = np.fromiter(itertools.chain.from_iterable(codes for _, codes, _ in requests), np.int64, sum(lengths))
+    credits = np.fromiter(itertools.chain.from_iterable(c for _, _, c in requests), np.int64, sum(lengths))
+    plans = cgpa_batch.course_totals(students, codes, credits, len(requests))
+
+    results = []
+    for (current, _, _), tenths, added, courses in zip(
+        requests, plans["tenths"].tolist(), plans["credits"].tolist(), plans["courses"].tolist()
+    ):
+        if not added:
+            results.append(HTTPError(400, "Add future courses to calculate"))
+            continue
+        # Standing tenths can be an exact Fraction, so the final sums stay in Python
+        future = {
+            "tenths": current["tenths"] + tenths,
+            "credits": current["credits"] + added,
+            "courses": current["courses"] + courses,
+        }
+        results.append({
+            "credits": future["credits"], "cgpa": cgpa_engine.cgpa(future),
+            "cgpa_text": cgpa_engine.format_cgpa(future),
+        })
+    return results
+
+
+class MicroBatcher:
+    """Bounded request queue drained in batches by a single worker task"""
+
+    def __init__(self, compute, window=0.002, max_batch=1024, max_queue=4096):
+        self.compute = compute
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue(max_queue)
+        self.batches = 0
+        self.requests = 0
+        self.largest = 0
+
+    async def submit(self, item, timeout):
+        """Queue one request and wait for its result; HTTPError 503 when the queue stays full"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self.queue.put((item, future)), timeout)
+        except asyncio.TimeoutError:
+            raise HTTPError(503, "Server busy, retry shortly") from None
+        result = await future
+        if isinstance(result, HTTPError):
+            raise result
+        return result
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [(item, future) for item, future in batch if not future.done()]  # Skip requests whose handler was cancelled
+            if not batch:
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            self.largest = max(self.largest, len(batch))
+            try:
+                results = self.compute([item for item, _ in batch])
+            except Exception:
+                # Answer one request at a time so a single bad one only fails itself
+                results = [self._compute_one(item) for item, _ in batch]
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _compute_one(self, item):
+        try:
+            return self.compute([item])[0]
+        except Exception as e:  # Never leave a waiting client hanging
+            return HTTPError(500, f"Internal error: {e}")
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest,
+            "queued": self.queue.qsize(),
+            "queue_limit": self.queue.maxsize,
+        }
+
+
+class LatencyStats:
+    """Request count, errors and p50/p99 over the most recent latencies of one endpoint"""
+
+    __slots__ = ("samples", "count", "errors")
+
+    def __init__(self, window=10000):
+        self.samples = collections.deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+
+    def record(self, seconds, ok=True):
+        self.samples.append(seconds)
+        self.count += 1
+        self.errors += not ok
+
+    def snapshot(self):
+        ordered = sorted(self.samples)
+
+        def percentile(p):
+            # Nearest rank
+            return ordered[max(int(-(-p * len(ordered) // 100)) - 1, 0)] * 1000 if ordered else None
+        return {
+            "requests": self.count, "errors": self.errors,
+            "p50_ms": percentile(50), "p99_ms": percentile(99), "max_ms": ordered[-1] * 1000 if ordered else None,
+        }
+
+
+# HTTP
+class Service:
+    """Routes, connection handling and counters of one server"""
+
+    def __init__(self, window=0.002, max_batch=1024, max_queue=4096, queue_timeout=1.0,
+                 max_connections=1024, idle_timeout=15.0):
+        self.batchers = {
+            "/cgpa": (parse_current, MicroBatcher(compute_current, window, max_batch, max_queue)),
+            "/predict": (parse_future, MicroBatcher(compute_future, window, max_batch, max_queue)),
+        }
+        self.queue_timeout = queue_timeout
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.latency = collections.defaultdict(LatencyStats)
+        self.connections = {"open": 0, "total": 0, "rejected": 0}
+        self.started = time.monotonic()
+        self._tasks = []
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self._tasks = [asyncio.create_task(batcher.run()) for _, batcher in self.batchers.values()]
+        return await asyncio.start_server(self.handle, host, port)
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+
+    def stats(self):
+        return {
+            "uptime_s": time.monotonic() - self.started,
+            "connections": dict(self.connections),
+            "endpoints": {path: stats.snapshot() for path, stats in sorted(self.latency.items())},
+            "batching": {path: batcher.stats() for path, (_, batcher) in self.batchers.items()},
+        }
+
+    async def handle(self, reader, writer):
+        self.connections["total"] += 1
+        if self.connections["open"] >= self.max_connections:
+            self.connections["rejected"] += 1
+            writer.write(_response(503, {"error": "Too many connections"}, keep_alive=False))
+            await _close(writer)
+            return
+        self.connections["open"] += 1
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HTTPError as e:
+                    writer.write(_response(e.status, {"error": str(e)}, keep_alive=False))
+                    break
+                except Exception as e:  # Never drop a client without an answer
+                    writer.write(_response(500, {"error": f"Internal error: {e}"}, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, path, keep_alive, body = request
+                start = time.perf_counter()
+                status, payload = await self.route(method, path, body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                self.latency[path if path in self.batchers else "other"].record(
+                    time.perf_counter() - start, status == 200
+                )
+        except ConnectionError:
+            pass
+        finally:
+            self.connections["open"] -= 1
+            await _close(writer)
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, self.stats()
+        if path not in self.batchers:
+            return 404, {"error": f"No endpoint {path}"}
+        if method != "POST":
+            return 405, {"error": f"{path} takes POST"}
+        parse, batcher = self.batchers[path]
+        try:
+            try:
+                payload = json.loads(body)
+            except (ValueError, UnicodeDecodeError):
+                raise HTTPError(400, "Body is not valid JSON") from None
+            if not isinstance(payload, dict):
+                raise HTTPError(400, "Body must be a JSON object")
+            return 200, await batcher.submit(parse(payload), self.queue_timeout)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:  # A parser bug answers 500 instead of dropping the connection
+            return 500, {"error": f"Internal error: {e}"}
+
+
+async def _read_request(reader):
+    """(method, path, keep_alive, body) of the next request, or None at end of stream"""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "transfer-encoding" in headers:
+        raise HTTPError(501, "Chunked request bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length") from None
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY:
+        raise HTTPError(413, f"Body larger than {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method.upper(), target.split("?", 1)[0], keep_alive, body
+
+
+def _response(status, payload, keep_alive=True):
+    body = json.dumps(payload).encode("utf-8")
+    head = [
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if status == 503:
+        head.append("Retry-After: 1")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def _close(writer):
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, **options):
+    """Run the service until cancelled"""
+    service = Service(**options)
+    server = await service.start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.stop()
@@ -0,0 +1,325 @@
+"""Compact memory-mapped binary store for grade histograms and transcripts.
+
+File layout (all integers little-endian):
+
+    b"CGTS" | version: u2 | header length: u4 | JSON header | columns...
+
+The JSON header records the grading scale (always the default one, see
+cgpa_scales), the program catalog and the byte offset, dtype and shape of
+every column. Columns start on 64-byte boundaries so they can be viewed in
+place:
+
+    counts          u2 (rows x 13)  course count per grade, GRADES order
+    thesis          u1 (rows)       thesis grade code, 255 = none
+    program         u1 (rows)       index into the header's program list, 255 = none
+    id_offsets      u8 (rows + 1)   byte ranges into id_data
+    id_data         u1              UTF-8 student ids, concatenated
+    course_student  u4 (courses)    row of the student a course belongs to, ascending
+    course_grade    u1 (courses)    grade code
+    course_credits  u1 (courses)    credits
+
+Stores packed from course-level transcripts fill the course section with
+the attempts that count; their totals come from it, so courses of any
+credit weight count properly. Stores packed from histograms leave it
+empty and assume regular courses.
+
+Readers map the file once and hand out zero-copy NumPy views, so only the
+pages a computation touches are ever read from disk.
+"""
+
+import json
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+import cgpa_batch
+from cgpa_engine import GRADES, PROGRAMS, SCALE
+
+MAGIC = b"CGTS"
+VERSION = 1
+ALIGN = 64
+NO_CODE = 255
+
+_PREAMBLE = struct.Struct("<4sHI")
+
+# Column name -> (dtype, values per row)
+COLUMNS = {
+    "counts": ("<u2", len(GRADES)),
+    "thesis": ("u1", 1),
+    "program": ("u1", 1),
+    "id_offsets": ("<u8", 1),
+    "id_data": ("u1", 1),
+    "course_student": ("<u4", 1),
+    "course_grade": ("u1", 1),
+    "course_credits": ("u1", 1),
+}
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+class StoreWriter:
+    """Append-only writer; memory use is independent of the row count
+
+    Columns are spooled to temporary files next to the target and stitched
+    together behind the header on close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.courses = 0
+        self._last_student = 0
+        self._id_bytes = 0
+        # Catalog programs first; names outside the catalog are appended as seen
+        self._program_codes = {name: code for code, name in enumerate(PROGRAMS)}
+        self._tmpdir = tempfile.mkdtemp(prefix=".cgts-", dir=os.path.dirname(os.path.abspath(path)))
+        self._files = {name: open(os.path.join(self._tmpdir, name), "wb") for name in COLUMNS}
+        self._write("id_offsets", np.zeros(1, dtype="<u8"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._cleanup()
+
+    def _write(self, name, array):
+        self._files[name].write(np.ascontiguousarray(array, dtype=COLUMNS[name][0]).tobytes())
+
+    def append(self, ids, counts, thesis_grades=None, programs=None):
+        """Append students: ids, an (n x 13) count matrix, thesis letters, program names"""
+        counts = np.asarray(counts)
+        n_rows = len(ids)
+        if counts.shape != (n_rows, len(GRADES)):
+            raise ValueError(f"Expected a ({n_rows} x {len(GRADES)}) count matrix, got {counts.shape}")
+        if counts.size and (counts.min() < 0 or counts.max() > 0xFFFF):
+            raise ValueError("Grade counts must be between 0 and 65535")
+
+        encoded = [str(student_id).encode("utf-8") for student_id in ids]
+        lengths = np.fromiter((len(b) for b in encoded), dtype=np.uint64, count=n_rows)
+        offsets = self._id_bytes + np.cumsum(lengths, dtype=np.uint64)
+        self._id_bytes = int(offsets[-1]) if n_rows else self._id_bytes
+
+        thesis = np.full(n_rows, NO_CODE, dtype=np.uint8)
+        if thesis_grades is not None:
+            for row, grade in enumerate(thesis_grades):
+                if grade:
+                    thesis[row] = cgpa_batch.GRADE_CODES[grade]
+        program = np.full(n_rows, NO_CODE, dtype=np.uint8)
+        if programs is not None:
+            program[:] = [self.program_code(name) for name in programs]
+
+        self._write("counts", counts)
+        self._write("thesis", thesis)
+        self._write("program", program)
+        self._write("id_offsets", offsets)
+        self._files["id_data"].write(b"".join(encoded))
+        self.rows += n_rows
+
+    def program_code(self, name):
+        """Program index for a name (NO_CODE for a blank one), adding new names"""
+        if not name:
+            return NO_CODE
+        code = self._program_codes.get(name)
+        if code is None:
+            code = len(self._program_codes)
+            if code >= NO_CODE:
+                raise ValueError(f"More than {NO_CODE} distinct program names")
+            self._program_codes[name] = code
+        return code
+
+    def append_courses(self, students, grades, credits):
+        """Append course attempts: student rows (ascending, from earlier appends), grade codes, credits"""
+        students = np.asarray(students)
+        grades = np.asarray(grades)
+        credits = np.asarray(credits)
+        if not (len(students) == len(grades) == len(credits)):
+            raise ValueError("Course columns must have the same length")
+        if len(students):
+            if np.any(np.diff(students) < 0) or students[0] < self._last_student or students[-1] >= self.rows:
+                raise ValueError("Course student rows must be ascending and already appended")
+            if grades.min() < 0 or grades.max() >= len(GRADES):
+                raise ValueError("Course grades must be grade codes")
+            if credits.min() < 0 or credits.max() > 0xFF:
+                raise ValueError("Course credits must be between 0 and 255")
+            self._last_student = int(students[-1])
+        self._write("course_student", students)
+        self._write("course_grade", grades)
+        self._write("course_credits", credits)
+        self.courses += len(students)
+
+    def close(self):
+        """Write the header and the spooled columns into the final file"""
+        for handle in self._files.values():
+            handle.close()
+
+        lengths = {
+            "counts": self.rows, "thesis": self.rows, "program": self.rows,
+            "id_offsets": self.rows + 1, "id_data": self._id_bytes,
+            "course_student": self.courses, "course_grade": self.courses, "course_credits": self.courses,
+        }
+        header = {
+            "scale_id": SCALE.key,
+            "scale": [[letter, points] for letter, points in GRADES.items()],
+            "programs": [
+                [name, PROGRAMS[name]["credits"] if name in PROGRAMS else None]
+                for name in self._program_codes
+            ],
+            "rows": self.rows,
+            "courses": self.courses,
+            "columns": {},
+        }
+        # Offsets depend on the header size, so lay columns out until it settles
+        header_size = 0
+        while True:
+            offset = _align(_PREAMBLE.size + header_size)
+            for name, (dtype, width) in COLUMNS.items():
+                shape = [lengths[name], width] if width > 1 else [lengths[name]]
+                header["columns"][name] = {"offset": offset, "dtype": dtype, "shape": shape}
+                offset = _align(offset + lengths[name] * width * np.dtype(dtype).itemsize)
+            encoded = json.dumps(header).encode("utf-8")
+            if len(encoded) == header_size:
+                break
+            header_size = len(encoded)
+
+        tmp_path = os.path.join(self._tmpdir, "store")
+        with open(tmp_path, "wb") as out:
+            out.write(_PREAMBLE.pack(MAGIC, VERSION, len(encoded)))
+            out.write(encoded)
+            for name in COLUMNS:
+                out.write(b"\0" * (header["columns"][name]["offset"] - out.tell()))
+                with open(os.path.join(self._tmpdir, name), "rb") as column:
+                    shutil.copyfileobj(column, out, 1 << 20)
+            out.write(b"\0" * (_align(out.tell()) - out.tell()))
+        os.replace(tmp_path, self.path)
+        self._cleanup()
+
+    def _cleanup(self):
+        for handle in self._files.values():
+            handle.close()
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+
+class TranscriptStore:
+    """Read-only, memory-mapped view of a store file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(self._map) < _PREAMBLE.size:
+            raise ValueError(f"{path}: not a transcript store")
+        magic, version, header_size = _PREAMBLE.unpack(bytes(self._map[:_PREAMBLE.size]))
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a transcript store")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported store version {version}")
+        self.header = json.loads(bytes(self._map[_PREAMBLE.size:_PREAMBLE.size + header_size]))
+
+        scale = self.header["scale"]
+        if [letter for letter, _ in scale] != list(GRADES):
+            raise ValueError(f"{path}: grading scale letters do not match {list(GRADES)}")
+        self.grade_tenths = np.array([round(points * 10) for _, points in scale], dtype=np.int64)
+        self.program_names = [name for name, _ in self.header["programs"]]
+        self.program_credits = [credits for _, credits in self.header["programs"]]
+        self.rows = self.header["rows"]
+        self.courses = self.header.get("courses", 0)
+
+        self.columns = {}
+        for name, column in self.header["columns"].items():
+            dtype = np.dtype(column["dtype"])
+            count = int(np.prod(column["shape"]))
+            view = np.frombuffer(self._map, dtype=dtype, count=count, offset=column["offset"])
+            self.columns[name] = view.reshape(column["shape"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.columns = {}
+        self._map = None
+
+    @property
+    def counts(self):
+        return self.columns["counts"]
+
+    def student_ids(self, start=0, stop=None):
+        """Decode the student ids of rows [start, stop)"""
+        stop = self.rows if stop is None else stop
+        offsets = self.columns["id_offsets"][start:stop + 1].tolist()
+        data = self.columns["id_data"][offsets[0]:offsets[-1]].tobytes() if offsets else b""
+        base = offsets[0] if offsets else 0
+        return [data[a - base:b - base].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def programs(self, start=0, stop=None):
+        """Program names of rows [start, stop) ('' where none was given)"""
+        codes = self.columns["program"][start:stop].tolist()
+        return [self.program_names[code] if code != NO_CODE else "" for code in codes]
+
+    def thesis_codes(self, start=0, stop=None):
+        """Thesis grade codes of rows [start, stop) in batch form (NO_THESIS = none)"""
+        thesis = self.columns["thesis"][start:stop]
+        return np.where(thesis == NO_CODE, cgpa_batch.NO_THESIS, thesis.astype(np.int16))
+
+    def _course_rows(self, start, stop):
+        """(student row - start, grade code, credits) views of the courses of rows [start, stop)"""
+        students = self.columns["course_student"]
+        first, last = np.searchsorted(students, [start, stop])
+        return (students[first:last].astype(np.int64) - start, self.columns["course_grade"][first:last],
+                self.columns["course_credits"][first:last])
+
+    def course_histograms(self, start=0, stop=None):
+        """(rows x 13) credits earned per grade by rows [start, stop), from the course section
+
+        Weighting by credits keeps a 4-credit course worth 4/3 of a
+        regular one, so the histogram's dot product with the grade points
+        gives the exact tenths.
+        """
+        stop = self.rows if stop is None else stop
+        students, grades, credits = self._course_rows(start, stop)
+        width = len(GRADES)
+        earned = np.bincount(students * width + grades, weights=credits, minlength=(stop - start) * width)
+        return earned.astype(np.int64).reshape(stop - start, width)
+
+    def totals(self, start=0, stop=None):
+        """batch_totals for rows [start, stop), read straight from the map
+
+        Histogram stores compute once per distinct histogram; transcript
+        stores sum their credit-weighted course histograms.
+        """
+        stop = self.rows if stop is None else stop
+        if not self.courses:
+            return cgpa_batch.deduplicated_totals(
+                self.counts[start:stop], self.thesis_codes(start, stop), grade_tenths=self.grade_tenths
+            )
+        totals = cgpa_batch.batch_totals(
+            self.course_histograms(start, stop), self.thesis_codes(start, stop), self.grade_tenths, course_credits=1
+        )
+        totals["courses"] = np.bincount(self._course_rows(start, stop)[0], minlength=stop - start).astype(np.int64)
+        return totals
+
+    def iter_totals(self, chunk_size=1 << 20):
+        """Yield (start, stop, totals) chunk by chunk over the whole store"""
+        for start in range(0, self.rows, chunk_size):
+            stop = min(start + chunk_size, self.rows)
+            yield start, stop, self.totals(start, stop)
+
+    def cohort_cgpa(self, chunk_size=1 << 20):
+        """CGPA of every row, computed in chunks so resident memory stays bounded"""
+        cgpa = np.empty(self.rows, dtype=np.float64)
+        for start, stop, totals in self.iter_totals(chunk_size):
+            cgpa[start:stop] = totals["cgpa"]
+        return cgpa
+
+
+def open_store(path):
+    return TranscriptStore(path)
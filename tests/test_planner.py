@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cgpa_planner  # noqa: E402
+
+MIXED_CREDITS = [[3, 3, 3, 3, 3], [3, 4, 3, 3, 1], [2, 3, 3, 3, 3], [3, 3, 3, 3, 4]]
+
+
+def test_mixed_credit_plans_come_lowest_top_grade_first():
+    plans = cgpa_planner.solve_target(0, 0, 3.4, MIXED_CREDITS, limit=3)
+    uniform = cgpa_planner.minimum_uniform_grade(0, 0, 3.4, MIXED_CREDITS)
+    assert uniform == "A-"
+    for plan in plans:
+        letters = [letter for semester in plan["grades"] for letter in semester]
+        assert "A" not in letters
+        assert plan["cgpa"] >= 3.4
+
+
+def test_assignments_are_ordered_by_top_grade():
+    credits = [3, 4, 3, 1, 2]
+    for required in range(0, cgpa_planner.LEVEL_TENTHS[0] * sum(credits) + 1, 37):
+        assignments = list(cgpa_planner.minimal_assignments(credits, required))
+        tops = [min(levels) for levels in assignments]
+        assert tops == sorted(tops, reverse=True)
+        assert list(cgpa_planner.minimal_assignments(credits, required, limit=3)) == assignments[:3]